@@ -4,18 +4,25 @@ import json
 import numpy as np
 import pandas as pd
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from typing import Dict, List, Any, Optional
-import mlflow
-import mlflow.sklearn
 import uvicorn
 from contextlib import asynccontextmanager
+from functools import partial
 
 from exception.exception import NetworkSecurityException
 import logging
-from utils.main_utils import load_object
+from utils.ml_utils.feature.text_featurizer import featurize_texts
+from utils.ml_utils.model.compiled_forest import COMPILED_MAX_ROWS, load_serving_model
+from utils.serving_utils import MicroBatcher, InferenceExecutor, PredictionCache, ModelManager
+from utils.serving_utils import ModelInfoCache, fetch_registry_model_info, read_local_model_info
+from utils.serving_utils import predict_with_model, build_prediction_response
+from utils.serving_utils import ServingMetrics, MetricsMiddleware, METRICS_CONTENT_TYPE
+from utils.serving_utils import ProfilingMiddleware, request_profile
+from utils.serving_utils import codecs
 
 # Define paths for model and preprocessor
 MODEL_PATH = os.path.join("artifact", "model_trainer", "model", "model.pkl")
@@ -48,19 +55,154 @@ def find_latest_model():
 # Use the latest model
 LATEST_MODEL_PATH = find_latest_model()
 
+# Micro-batching of concurrent prediction requests (configure via env vars)
+PREDICT_MAX_BATCH_SIZE = int(os.getenv("PREDICT_MAX_BATCH_SIZE", "256"))
+PREDICT_MAX_WAIT_US = int(os.getenv("PREDICT_MAX_WAIT_US", "2000"))
+
+# Inference runs on a worker pool so the event loop stays responsive
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")
+INFERENCE_MAX_WORKERS = int(os.getenv("INFERENCE_MAX_WORKERS", "0")) or None
+MODEL_N_JOBS = int(os.getenv("MODEL_N_JOBS")) if os.getenv("MODEL_N_JOBS") else None
+
+# Serve forests through the flattened NumPy evaluator instead of the sklearn pickle,
+# for batches of up to COMPILED_FOREST_MAX_ROWS rows (sklearn is faster on larger ones)
+COMPILED_FOREST = os.getenv("COMPILED_FOREST", "1").lower() not in ("0", "false", "no")
+COMPILED_FOREST_MAX_ROWS = int(os.getenv("COMPILED_FOREST_MAX_ROWS", str(COMPILED_MAX_ROWS)))
+
+# Memory-map the model arrays read-only so all workers on a host share one copy
+MODEL_MMAP = os.getenv("MODEL_MMAP", "1").lower() not in ("0", "false", "no")
+
+# Load the model at import time, e.g. in the gunicorn master with preload_app = True,
+# so forked workers inherit it copy-on-write instead of loading their own
+PRELOAD_MODEL = os.getenv("PRELOAD_MODEL", "0").lower() in ("1", "true", "yes")
+
+model_loader = partial(load_serving_model, compiled=COMPILED_FOREST, mmap_mode="r" if MODEL_MMAP else None,
+                       max_compiled_rows=COMPILED_FOREST_MAX_ROWS)
+
+_preloaded_models = {}
+if PRELOAD_MODEL and os.path.exists(LATEST_MODEL_PATH):
+    try:
+        _preloaded_models[LATEST_MODEL_PATH] = model_loader(LATEST_MODEL_PATH)
+        logging.info(f"Preloaded model from {LATEST_MODEL_PATH}")
+    except Exception as e:
+        logging.error(f"Error preloading model: {e}")
+
+def load_model(model_path: str):
+    """Hand out the preloaded model once, then load from disk."""
+    model = _preloaded_models.pop(model_path, None)
+    return model if model is not None else model_loader(model_path)
+
+# In-process cache of /predict/text results (PREDICTION_CACHE_SIZE=0 disables it)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL_S = float(os.getenv("PREDICTION_CACHE_TTL_S", "300"))
+
+# Hot model reload: poll the artifact tree every N seconds (0 disables the watcher),
+# or POST /admin/reload-model with the X-Admin-Token header set to ADMIN_TOKEN
+MODEL_RELOAD_INTERVAL_S = float(os.getenv("MODEL_RELOAD_INTERVAL_S", "0"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# /model-info is answered from memory; the registry is queried in the background
+MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "https://dagshub.com/austinLorenzMccoy/networkSecurity_project.mlflow")
+REGISTERED_MODEL_NAME = "NetworkSecurityModel"
+MODEL_INFO_REFRESH_S = float(os.getenv("MODEL_INFO_REFRESH_S", "300"))
+MODEL_INFO_TIMEOUT_S = float(os.getenv("MODEL_INFO_TIMEOUT_S", "5"))
+# Keep a slow registry from holding a worker thread for minutes of retries
+os.environ.setdefault("MLFLOW_HTTP_REQUEST_TIMEOUT", str(int(max(MODEL_INFO_TIMEOUT_S, 1))))
+os.environ.setdefault("MLFLOW_HTTP_REQUEST_MAX_RETRIES", "1")
+
+# Upper bound for a (decompressed) /predict request body
+PREDICT_MAX_BODY_BYTES = int(os.getenv("PREDICT_MAX_BODY_BYTES", str(256 * 1024 * 1024)))
+
+# Opt-in per-request profiling: only deployments with REQUEST_PROFILING=1 honour the
+# X-Profile header (which must carry PROFILE_TOKEN when set); reports go to PROFILE_DIR
+REQUEST_PROFILING = os.getenv("REQUEST_PROFILING", "0").lower() in ("1", "true", "yes")
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "1"))
+
+# Request, stage and batch metrics of this worker process, served on /metrics
+metrics = ServingMetrics()
+
+def _served_model_info():
+    manager = getattr(app.state, "model_manager", None)
+    if manager is None or manager.current is None:
+        return {}
+    return {(manager.current.version, manager.current.path): 1}
+
+async def run_inference(features: np.ndarray):
+    """Run the model off the event loop, through the micro-batcher when it is running."""
+    batcher = getattr(app.state, "batcher", None)
+    if batcher is not None and batcher.running:
+        return await batcher.submit(features)
+    executor = getattr(app.state, "executor", None)
+    if executor is not None:
+        return await executor.run(features)
+    return predict_with_model(app.state.model, features)
+
+async def install_model(loaded, warm_up_features):
+    """Switch the executor, the app state and the cache over to a newly loaded model."""
+    await app.state.executor.swap(loaded.model, loaded.path, warm_up_features)
+    # No await between these assignments: handlers see either the old or the new model
+    app.state.model = loaded.model
+    app.state.model_version = loaded.version
+    app.state.prediction_cache.clear()
+    # Metadata of the new model is resolved in the background
+    app.state.model_info.refresh_nowait()
+
 # Define lifespan to load model on startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Load model on startup
+    app.state.model = None
+    app.state.model_version = None
+    app.state.prediction_cache = PredictionCache(
+        max_entries=PREDICTION_CACHE_SIZE,
+        ttl_seconds=PREDICTION_CACHE_TTL_S
+    )
+    app.state.model_info = ModelInfoCache(
+        fetch_remote=partial(fetch_registry_model_info, MLFLOW_TRACKING_URI, REGISTERED_MODEL_NAME),
+        fetch_local=partial(read_local_model_info, os.path.join("reports", "metrics.json"), REGISTERED_MODEL_NAME),
+        refresh_interval=MODEL_INFO_REFRESH_S,
+        timeout=MODEL_INFO_TIMEOUT_S
+    )
+    app.state.executor = InferenceExecutor(
+        predict_with_model,
+        kind=INFERENCE_EXECUTOR,
+        max_workers=INFERENCE_MAX_WORKERS,
+        n_jobs=MODEL_N_JOBS,
+        loader=model_loader
+    )
+    app.state.model_manager = ModelManager(
+        loader=load_model,
+        resolve_path=find_latest_model,
+        install=install_model,
+        poll_interval=MODEL_RELOAD_INTERVAL_S
+    )
+    # Load and warm up the model on startup
     try:
-        app.state.model = load_object(LATEST_MODEL_PATH)
-        logging.info(f"Model loaded from {LATEST_MODEL_PATH}")
+        await app.state.model_manager.reload(LATEST_MODEL_PATH)
         logging.info("Model loaded successfully")
     except Exception as e:
         logging.error(f"Error loading model: {e}")
-        app.state.model = None
+    app.state.model_manager.start_watching()
+    app.state.model_info.start()
+    app.state.batcher = MicroBatcher(
+        app.state.executor.run,
+        max_batch_size=PREDICT_MAX_BATCH_SIZE,
+        max_wait_us=PREDICT_MAX_WAIT_US,
+        max_concurrency=app.state.executor.max_workers,
+        on_batch=metrics.observe_batch
+    )
+    app.state.batcher.start()
+    # Computed when /metrics is scraped, never on the request path
+    metrics.batcher_queued.set_function(lambda: {(): app.state.batcher.queued})
+    metrics.batches_in_flight.set_function(lambda: {(): app.state.batcher.batches_in_flight})
+    metrics.model_info.set_function(_served_model_info)
     yield
     # Cleanup on shutdown
+    await app.state.model_manager.stop()
+    await app.state.model_info.stop()
+    await app.state.batcher.stop()
+    app.state.executor.shutdown()
     app.state.model = None
 
 # Initialize FastAPI app
@@ -82,6 +224,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route request counts and latency
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+# Per-stage wall time, CPU time and peak memory of requests sent with X-Profile
+if REQUEST_PROFILING:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=PROFILE_TOKEN,
+        report_dir=PROFILE_DIR,
+        sample_interval=PROFILE_SAMPLE_INTERVAL_MS / 1e3 or None,
+    )
+
 # Define input schema for text-based classification
 class TextInput(BaseModel):
     text: str = Field(..., description="Text to classify for security threats")
@@ -113,135 +267,171 @@ async def health_check():
 
 # Text-based prediction endpoint
 @app.post("/predict/text", response_model=PredictionResponse)
-async def predict_text(request: TextInput):
+async def predict_text(request: TextInput, http_request: Request):
     if app.state.model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
+    timer = metrics.timer("/predict/text", request_profile(http_request))
+    
+    # Repeated advisories are answered from the cache without touching the model
+    cache = getattr(app.state, "prediction_cache", None)
+    cache_key = None
+    if cache is not None and cache.enabled:
+        cache_key = cache.make_key(app.state.model_version or "", request.text)
+        cached_body = cache.get(cache_key)
+        timer.lap("cache")
+        if cached_body is not None:
+            return Response(content=cached_body, media_type="application/json")
     
     try:
-        # Process the text to extract features
-        text = request.text.lower()
-        
         # Extract the same features we used during training
-        features = [
-            # Text length (normalized)
-            min(len(request.text) / 5000.0, 1.0),
-            
-            # Word count (normalized)
-            min(len(request.text.split()) / 500.0, 1.0),
-            
-            # Keyword-based features
-            0.7 if 'malware' in text else 0.0,
-            0.6 if 'trojan' in text else 0.0,
-            0.6 if 'virus' in text else 0.0,
-            0.8 if 'ransomware' in text else 0.0,
-            0.4 if 'attack' in text else 0.0,
-            0.3 if 'threat' in text else 0.0,
-            0.5 if 'vulnerability' in text else 0.0,
-            0.5 if 'exploit' in text else 0.0,
-            0.2 if 'security' in text else 0.0,
-        ]
-        
-        # Convert to numpy array and reshape for prediction
-        features_array = np.array([features])
-        
-        # Make predictions
-        predictions = app.state.model.predict(features_array)
-        
-        # Get prediction probabilities if available
-        prediction_probs = None
-        if hasattr(app.state.model, "predict_proba"):
-            probs = app.state.model.predict_proba(features_array)
-            prediction_probs = []
-            for prob in probs:
-                prob_dict = {str(i): float(p) for i, p in enumerate(prob)}
-                prediction_probs.append(prob_dict)
+        features_array = featurize_texts([request.text])
+        timer.lap("featurize")
         
-        # Return predictions with interpretation
-        result = {
-            "predictions": predictions.tolist(),
-            "prediction_probabilities": prediction_probs,
-            "interpretation": "Malware detected" if predictions[0] == 1 else "No malware detected"
-        }
+        # Make predictions (batched with concurrent requests)
+        predictions, probs = await run_inference(features_array)
+        timer.lap("inference")
         
-        return result
+        # The payload already matches PredictionResponse, skip re-validating it
+        body = JSONResponse(content=build_prediction_response(predictions, probs)).body
+        if cache_key is not None:
+            cache.put(cache_key, body)
+        response = Response(content=body, media_type="application/json")
+        timer.lap("serialize")
+        return response
     
     except Exception as e:
         logging.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
+def _validate_features_json(body: bytes) -> np.ndarray:
+    """Validate a JSON /predict body against the NetworkFeatures schema."""
+    try:
+        payload = json.loads(body) if body else None
+    except json.JSONDecodeError as e:
+        raise RequestValidationError([{
+            "type": "json_invalid", "loc": ("body", e.pos), "msg": "JSON decode error",
+            "input": {}, "ctx": {"error": e.msg}
+        }])
+    try:
+        validate = getattr(NetworkFeatures, "model_validate", None) or NetworkFeatures.parse_obj
+        request = validate(payload)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body",) + tuple(error["loc"])} for error in e.errors()]
+        )
+    return codecs.as_feature_matrix(request.features)
+
+async def read_features(request: Request) -> np.ndarray:
+    """Decode the /predict body: JSON, .npy, Arrow IPC or msgpack, optionally gzip/zstd compressed."""
+    try:
+        # Stop reading as soon as the body is too large instead of buffering all of it
+        body = await codecs.read_body(request.stream(), PREDICT_MAX_BODY_BYTES,
+                                      request.headers.get("content-length"))
+        body = codecs.decompress_body(body, request.headers.get("content-encoding"), PREDICT_MAX_BODY_BYTES)
+        media_type = codecs.parse_media_type(request.headers.get("content-type"))
+        if media_type == codecs.JSON:
+            return _validate_features_json(body)
+        return codecs.decode_features(body, media_type)
+    except codecs.PayloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+def encode_prediction_response(request: Request, predictions: np.ndarray, probs: Optional[np.ndarray]) -> Response:
+    """Serialize predictions in the media type and encoding negotiated with the client."""
+    media_type = codecs.negotiate_response_type(request.headers.get("accept"))
+    body = codecs.encode_predictions(predictions, probs, media_type)
+    body, encoding = codecs.compress_body(body, request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+_binary_body_schema = {"schema": {"type": "string", "format": "binary"}}
+
 # Original feature-based prediction endpoint (keeping for backward compatibility)
-@app.post("/predict", response_model=PredictionResponse)
-async def predict(request: NetworkFeatures):
+@app.post("/predict", response_model=PredictionResponse, openapi_extra={
+    "requestBody": {
+        "required": True,
+        "content": {
+            codecs.JSON: {"schema": getattr(NetworkFeatures, "model_json_schema", NetworkFeatures.schema)()},
+            codecs.NPY: _binary_body_schema,
+            codecs.ARROW_STREAM: _binary_body_schema,
+            codecs.ARROW_FILE: _binary_body_schema,
+            codecs.MSGPACK: _binary_body_schema,
+        }
+    }
+})
+async def predict(request: Request):
+    timer = metrics.timer("/predict", request_profile(request))
+    # Validate the body before checking the model, like the JSON-only schema did
+    features = await read_features(request)
+    timer.lap("parse")
+    
     if app.state.model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
+    metrics.request_rows.labels("/predict").observe(len(features))
     
     try:
-        # Convert input to numpy array
-        features = np.array(request.features)
-        
-        # Make predictions
-        predictions = app.state.model.predict(features)
+        # Make predictions (batched with concurrent requests)
+        predictions, probs = await run_inference(features)
+        timer.lap("inference")
         
-        # Get prediction probabilities if available
-        prediction_probs = None
-        if hasattr(app.state.model, "predict_proba"):
-            probs = app.state.model.predict_proba(features)
-            prediction_probs = []
-            for prob in probs:
-                prob_dict = {str(i): float(p) for i, p in enumerate(prob)}
-                prediction_probs.append(prob_dict)
-        
-        # Return predictions
-        return {
-            "predictions": predictions.tolist(),
-            "prediction_probabilities": prediction_probs
-        }
+        # Encode in the negotiated format (JSON unless the client asks otherwise)
+        response = encode_prediction_response(request, predictions, probs)
+        timer.lap("serialize")
+        return response
     
     except Exception as e:
         logging.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
-# MLflow integration endpoint
-@app.get("/model-info")
-async def model_info():
-    try:
-        # Try to get model info from MLflow if available
-        try:
-            mlflow.set_tracking_uri("https://dagshub.com/austinLorenzMccoy/networkSecurity_project.mlflow")
-            model_info = mlflow.search_registered_models(filter_string="name='NetworkSecurityModel'")
-            
-            if model_info and len(model_info) > 0:
-                latest_version = model_info[0].latest_versions[0]
-                return {
-                    "model_name": "NetworkSecurityModel",
-                    "version": latest_version.version,
-                    "status": latest_version.status,
-                    "creation_timestamp": latest_version.creation_timestamp,
-                    "last_updated_timestamp": latest_version.last_updated_timestamp,
-                    "metrics": {
-                        "accuracy": latest_version.run.data.metrics.get("test_accuracy", None),
-                        "f1_score": latest_version.run.data.metrics.get("test_f1", None)
-                    }
-                }
-        except Exception as mlflow_error:
-            logging.warning(f"MLflow connection error: {mlflow_error}")
-            # If MLflow connection fails, try to get metrics from local file
-            try:
-                with open("reports/metrics.json", "r") as f:
-                    metrics = json.load(f)
-                return {
-                    "model_name": "NetworkSecurityModel (Local)",
-                    "version": "1.0.0",
-                    "status": "READY",
-                    "metrics": metrics
-                }
-            except Exception as file_error:
-                logging.warning(f"Local metrics file error: {file_error}")
-                return {"message": "No model information available from MLflow or local files"}
+class ReloadRequest(BaseModel):
+    model_path: Optional[str] = Field(None, description="Model file under artifact/ to load, defaults to the newest one")
+
+# Admin endpoint: load a new model in the background and swap it in atomically
+@app.post("/admin/reload-model")
+async def reload_model(request: Request, body: Optional[ReloadRequest] = None):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Model reload endpoint is disabled")
+    if request.headers.get("x-admin-token") != ADMIN_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    
+    model_path = body.model_path if body is not None else None
+    if model_path is not None:
+        artifact_dir = os.path.abspath("artifact")
+        if os.path.commonpath([artifact_dir, os.path.abspath(model_path)]) != artifact_dir:
+            raise HTTPException(status_code=400, detail="model_path must be inside the artifact directory")
+        if not os.path.exists(model_path):
+            raise HTTPException(status_code=404, detail=f"Model not found: {model_path}")
     
+    try:
+        reloaded = await app.state.model_manager.reload(model_path, force=True)
     except Exception as e:
-        logging.error(f"Error getting model info: {e}")
-        return {"message": f"Error getting model info: {str(e)}"}
+        logging.error(f"Model reload failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Model reload failed, keeping the current model: {str(e)}")
+    
+    current = app.state.model_manager.current
+    return {"reloaded": reloaded, "model_path": current.path, "model_version": current.version}
+
+# Prediction cache statistics
+@app.get("/cache/stats")
+async def cache_stats():
+    cache = getattr(app.state, "prediction_cache", None)
+    if cache is None:
+        return {"enabled": False}
+    return {**cache.stats(), "model_version": app.state.model_version}
+
+# Prometheus metrics of this worker process
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+# MLflow integration endpoint (served from memory, refreshed in the background)
+@app.get("/model-info")
+async def model_info():
+    model_info_cache = getattr(app.state, "model_info", None)
+    if model_info_cache is None:
+        return {"message": "No model information available from MLflow or local files"}
+    return model_info_cache.get()
 
 # Run the app
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+## NETWORKSECURITY/benchmarks/benchmark_compiled_forest.py
+"""
+Compare CompiledForest against scikit-learn's predict_proba.
+
+Usage (from backend/):
+    python benchmarks/benchmark_compiled_forest.py
+    python benchmarks/benchmark_compiled_forest.py --model artifact/<timestamp>/model_trainer/trained_model/model.pkl
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.main_utils import load_object
+from utils.ml_utils.model.compiled_forest import CompiledForest
+
+BATCH_SIZES = (1, 64, 10_000)
+
+
+def train_reference_model(n_features: int, n_samples: int = 5000) -> RandomForestClassifier:
+    """Forest with the same hyperparameters as ModelTrainer.train_model, fitted on synthetic data."""
+    rng = np.random.default_rng(42)
+    x = rng.random((n_samples, n_features))
+    y = (x[:, 0] + x[:, 1] * rng.random(n_samples) > 0.8).astype(np.float64)
+    return RandomForestClassifier(n_estimators=100, random_state=42).fit(x, y)
+
+
+def time_call(fn, x: np.ndarray, min_seconds: float) -> float:
+    """Median wall time of fn(x) in milliseconds."""
+    fn(x)
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < 5 or time.perf_counter() - started < min_seconds:
+        t0 = time.perf_counter()
+        fn(x)
+        timings.append(time.perf_counter() - t0)
+    return float(np.median(timings)) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="pickled forest to benchmark, defaults to a freshly trained one")
+    parser.add_argument("--n-features", type=int, default=11, help="features of the reference model")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=list(BATCH_SIZES))
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="minimum time spent per measurement")
+    args = parser.parse_args()
+
+    model = load_object(args.model) if args.model else train_reference_model(args.n_features)
+    compiled = CompiledForest.from_estimator(model)
+    print(f"{type(model).__name__}: {compiled.n_estimators} trees, {len(compiled.feature)} nodes, "
+          f"max depth {compiled.max_depth}")
+    print(f"{'batch':>8} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>8}  identical")
+
+    rng = np.random.default_rng(0)
+    for batch_size in args.batch_sizes:
+        x = rng.random((batch_size, compiled.n_features_in_))
+        identical = np.array_equal(model.predict_proba(x), compiled.predict_proba(x))
+        sklearn_ms = time_call(model.predict_proba, x, args.min_seconds)
+        compiled_ms = time_call(compiled.predict_proba, x, args.min_seconds)
+        print(f"{batch_size:>8} {sklearn_ms:>12.3f} {compiled_ms:>12.3f} {sklearn_ms / compiled_ms:>7.2f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
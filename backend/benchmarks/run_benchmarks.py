@@ -0,0 +1,293 @@
+## NETWORKSECURITY/benchmarks/run_benchmarks.py
+"""
+Micro-benchmarks of the serving and training hot paths, checked against stored baselines.
+
+Every benchmark runs on synthetic data of the size given on the command line:
+the text featurizer, /predict at several batch sizes and /predict/text (through
+the FastAPI app, micro-batcher included), load_object of the served forest,
+DataTransformation.initiate_data_transformation, DataValidation.detect_data_drift
+and ModelTrainer.initiate_model_trainer.
+
+Usage (from backend/):
+    python benchmarks/run_benchmarks.py                     # compare with benchmarks/baselines.json
+    python benchmarks/run_benchmarks.py --only predict drift --rows 50000
+    python benchmarks/run_benchmarks.py --update-baseline   # record the current timings
+
+Exits with status 1 when the median time of a benchmark exceeds its baseline by
+more than --threshold. Baselines are only compared when they were recorded with
+the same sizes; timings from another machine are compared with a warning.
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+import yaml
+from sklearn.ensemble import RandomForestClassifier
+
+from networksecurity.utils.main_utils import load_object, save_object
+from networksecurity.utils.ml_utils.feature.text_featurizer import TEXT_FEATURE_NAMES, featurize_texts
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+SCHEMA_FILE_PATH = os.path.join(BACKEND_DIR, "data_schema", "schema.yaml")
+BATCH_SIZES = (1, 64, 1024)
+# Median slowdown over the baseline tolerated before a benchmark counts as a regression
+DEFAULT_THRESHOLD = 0.25
+# Served model location under the work directory, where app.find_latest_model looks
+SERVED_MODEL_PATH = os.path.join("artifact", "01_01_2000_00_00_00", "model_trainer", "trained_model", "model.pkl")
+
+PIPELINE_BENCHMARKS = ("data_transformation", "detect_data_drift", "model_trainer")
+
+_WORDS = ("the", "network", "server", "user", "update", "patch", "report", "traffic", "login", "service",
+          "malware", "trojan", "ransomware", "attack", "threat", "vulnerability", "exploit", "security")
+
+
+@dataclass
+class Benchmark:
+    """A timed call; heavy calls skip the warm-up run and need fewer rounds."""
+    name: str
+    func: Callable[[], Any]
+    rounds: int = 5
+    warm_up: bool = True
+
+
+def measure(benchmark: Benchmark, min_seconds: float) -> Dict[str, float]:
+    """
+    Time `benchmark.func` for at least `benchmark.rounds` calls and `min_seconds`.
+
+    :return: {"median_ms", "min_ms", "rounds"}
+    """
+    if benchmark.warm_up:
+        benchmark.func()
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < benchmark.rounds or time.perf_counter() - started < min_seconds:
+        t0 = time.perf_counter()
+        benchmark.func()
+        timings.append(time.perf_counter() - t0)
+    return {"median_ms": float(np.median(timings)) * 1e3, "min_ms": min(timings) * 1e3, "rounds": len(timings)}
+
+
+def machine_info() -> Dict[str, Any]:
+    return {"platform": platform.platform(), "processor": platform.machine(),
+            "cpu_count": os.cpu_count(), "python": platform.python_version()}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Any]],
+            params: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """
+    Relative change of every median against the baseline.
+
+    :param results: {benchmark name: measure() result}
+    :param baseline: parsed baselines file, or None
+    :param params: sizes the results were measured with
+    :return: {benchmark name: (median / baseline median) - 1}, None without a comparable baseline
+    """
+    if baseline is None or baseline.get("params") != params:
+        return {name: None for name in results}
+    recorded = baseline.get("results", {})
+    return {name: (result["median_ms"] / recorded[name]["median_ms"] - 1 if name in recorded else None)
+            for name, result in results.items()}
+
+
+def make_texts(n_texts: int, rng: np.random.Generator) -> List[str]:
+    """Advisory-like documents of 20 to 400 words, each distinct."""
+    lengths = rng.integers(20, 400, size=n_texts)
+    return [f"advisory {i}: " + " ".join(rng.choice(_WORDS, size=length)) for i, length in enumerate(lengths)]
+
+
+def make_tables(rows: int, rng: np.random.Generator) -> Dict[str, pd.DataFrame]:
+    """Train and test tables following data_schema/schema.yaml, with a learnable Result."""
+    with open(SCHEMA_FILE_PATH) as f:
+        features = [name for name in yaml.safe_load(f)["columns"] if name != "Result"]
+
+    def table(n: int) -> pd.DataFrame:
+        df = pd.DataFrame(rng.integers(-1, 2, size=(n, len(features))), columns=features)
+        score = df.iloc[:, :4].sum(axis=1) + rng.normal(0, 0.5, size=n)
+        df["Result"] = np.where(score > 0, 1, -1)
+        return df
+
+    return {"train": table(rows - rows // 5), "test": table(rows // 5)}
+
+
+def selected(args, names: Sequence[str]) -> bool:
+    """Whether --only selects any of the benchmarks `names`."""
+    return not args.only or any(pattern in name for name in names for pattern in args.only)
+
+
+def serving_benchmarks(args, rng: np.random.Generator, stack: contextlib.ExitStack) -> List[Benchmark]:
+    predict_names = [f"predict[batch={batch_size}]" for batch_size in args.batch_sizes] + ["predict_text"]
+    if not selected(args, ["featurize_texts", "load_object"] + predict_names):
+        return []
+    texts = make_texts(args.texts, rng)
+    x = featurize_texts(texts)
+    y = (x[:, 2:].sum(axis=1) + rng.normal(0, 0.3, size=len(x)) > 1.5).astype(np.float64)
+    # Served forest with the hyperparameters of ModelTrainer.train_model
+    model = RandomForestClassifier(n_estimators=100, random_state=42).fit(x, y)
+    save_object(SERVED_MODEL_PATH, model)
+
+    benchmarks = [
+        Benchmark("featurize_texts", lambda: featurize_texts(texts)),
+        Benchmark("load_object", lambda: load_object(SERVED_MODEL_PATH)),
+    ]
+
+    if not selected(args, predict_names):
+        return benchmarks
+
+    # app.py lives in backend/ and resolves its model relative to the working directory when imported
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+    os.environ.setdefault("MLFLOW_TRACKING_URI", "file:" + os.path.abspath("mlruns"))
+    from fastapi.testclient import TestClient
+    import app
+
+    client = stack.enter_context(TestClient(app.app))
+
+    def post(path, payload):
+        response = client.post(path, json=payload)
+        response.raise_for_status()
+
+    for batch_size in args.batch_sizes:
+        payload = {"features": rng.random((batch_size, len(TEXT_FEATURE_NAMES))).tolist()}
+        benchmarks.append(Benchmark(f"predict[batch={batch_size}]", lambda payload=payload: post("/predict", payload)))
+    text_payloads = itertools.cycle([{"text": text} for text in texts])
+    benchmarks.append(Benchmark("predict_text", lambda: post("/predict/text", next(text_payloads))))
+    return benchmarks
+
+
+def pipeline_benchmarks(args, rng: np.random.Generator) -> List[Benchmark]:
+    if not selected(args, PIPELINE_BENCHMARKS):
+        return []
+    from networksecurity.components.data_transformation import DataTransformation
+    from networksecurity.components.data_validation import DataValidation
+    from networksecurity.components.model_trainer import ModelTrainer
+    from networksecurity.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
+    from networksecurity.entity.config_entity import (
+        DataTransformationConfig, DataValidationConfig, ModelTrainerConfig, TrainingPipelineConfig
+    )
+
+    config = TrainingPipelineConfig()
+    config.artifact_dir = os.path.abspath("pipeline")
+    config.incremental = False
+    tables = make_tables(args.rows, rng)
+    paths = {}
+    for split, df in tables.items():
+        paths[split] = os.path.join(config.artifact_dir, "data_ingestion", f"{split}.parquet")
+        os.makedirs(os.path.dirname(paths[split]), exist_ok=True)
+        df.to_parquet(paths[split], index=False)
+
+    validation_config = DataValidationConfig(config)
+    validation_config.schema_file_path = SCHEMA_FILE_PATH
+    validation = DataValidation(
+        DataIngestionArtifact(feature_store_file_path="", train_file_path=paths["train"], test_file_path=paths["test"]),
+        validation_config
+    )
+    transformation = DataTransformation(DataValidationArtifact(
+        validation_status=True,
+        valid_train_file_path=paths["train"],
+        valid_test_file_path=paths["test"],
+        invalid_train_file_path="",
+        invalid_test_file_path="",
+        drift_report_file_path=""
+    ), DataTransformationConfig(config))
+    transformation_artifact = transformation.initiate_data_transformation()
+    trainer_config = ModelTrainerConfig(config)
+    if args.no_model_search:
+        trainer_config.model_search = False
+    trainer = ModelTrainer(trainer_config, transformation_artifact)
+
+    return [
+        Benchmark("data_transformation", transformation.initiate_data_transformation),
+        Benchmark("detect_data_drift", lambda: validation.detect_data_drift(tables["train"], tables["test"])),
+        Benchmark("model_trainer", trainer.initiate_model_trainer, rounds=3, warm_up=False),
+    ]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="rows of the synthetic train + test tables")
+    parser.add_argument("--texts", type=int, default=1_000, help="documents featurized and served")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=list(BATCH_SIZES), help="/predict batch sizes")
+    parser.add_argument("--no-model-search", action="store_true",
+                        help="time ModelTrainer on the single default forest instead of the configured model search")
+    parser.add_argument("--only", nargs="+", help="run the benchmarks whose name contains one of these")
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="minimum time spent per benchmark")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="tolerated slowdown of the median, 0.25 = 25%%")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="baselines file")
+    parser.add_argument("--update-baseline", action="store_true", help="record the timings as the new baselines")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    params = {"rows": args.rows, "texts": args.texts, "batch_sizes": args.batch_sizes,
+              "model_search": not args.no_model_search}
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    rng = np.random.default_rng(0)
+    cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="networksecurity-bench-")
+    results = {}
+    try:
+        os.chdir(work_dir)
+        with contextlib.ExitStack() as stack:
+            benchmarks = serving_benchmarks(args, rng, stack) + pipeline_benchmarks(args, rng)
+            for benchmark in benchmarks:
+                if not selected(args, [benchmark.name]):
+                    continue
+                results[benchmark.name] = measure(benchmark, args.min_seconds)
+                print(f"{benchmark.name:>24} {results[benchmark.name]['median_ms']:>12.3f} ms", flush=True)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if baseline is not None and baseline.get("params") != params:
+        print(f"\nBaselines were recorded with {baseline.get('params')}, not compared")
+    elif baseline is not None and baseline.get("machine") != machine_info():
+        print(f"\nBaselines were recorded on another machine: {baseline.get('machine')}")
+
+    changes = compare(results, baseline, params)
+    regressions = [name for name, change in changes.items() if change is not None and change > args.threshold]
+    print(f"\n{'benchmark':>24} {'median ms':>12} {'baseline ms':>12} {'change':>8}")
+    for name, result in results.items():
+        change = changes[name]
+        recorded = "-" if change is None else f"{baseline['results'][name]['median_ms']:.3f}"
+        status = "" if change is None else f"{change:+8.1%}" + ("  REGRESSION" if name in regressions else "")
+        print(f"{name:>24} {result['median_ms']:>12.3f} {recorded:>12} {status}")
+
+    report = {"params": params, "machine": machine_info(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        if baseline is not None and baseline.get("params") == params:
+            # A partial run (--only) keeps the other recorded benchmarks
+            report["results"] = {**baseline.get("results", {}), **results}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaselines written to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}: "
+              f"{', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,25 @@
 import os
 import sys
 import numpy as np
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pymongo
-from sklearn.model_selection import train_test_split
+from bson import ObjectId
+from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 from networksecurity.entity.config_entity import DataIngestionConfig
 from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.utils.main_utils import read_yaml_file
+from networksecurity.utils.ml_utils.model.incremental import read_training_state
+from networksecurity.utils.main_utils.feature_store import (
+    ParquetShardWriter,
+    arrow_schema,
+    documents_to_table,
+    iter_parquet_tables,
+    parquet_num_rows
+)
 
 load_dotenv()
 uri = os.getenv('MONGODB_URI')
@@ -16,43 +27,120 @@ uri = os.getenv('MONGODB_URI')
 class DataIngestion:
     def __init__(self, data_ingestion_config: DataIngestionConfig):
         self.data_ingestion_config = data_ingestion_config
+        self.schema_config = read_yaml_file(self.data_ingestion_config.schema_file_path)
+        self.watermark: Optional[str] = None
 
-    def export_collection_as_dataframe(self) -> pd.DataFrame:
+    def previous_watermark(self) -> Optional[str]:
+        """_id of the newest document the saved model was trained on, None outside incremental mode."""
+        if not getattr(self.data_ingestion_config, "incremental", False):
+            return None
+        state = read_training_state(self.data_ingestion_config.training_state_file_path)
+        return state.get("watermark") if state else None
+
+    def export_collection_to_feature_store(self) -> int:
         """
-        Export MongoDB collection to a DataFrame.
+        Stream the MongoDB collection into the Parquet feature store.
+
+        The cursor is read `batch_size` documents at a time with a projection
+        on the schema columns, and every batch becomes one row group, so memory
+        stays bounded by one batch whatever the collection size. In incremental
+        mode only documents newer than the saved model's watermark are read.
+        The newest exported _id is kept in `self.watermark`.
+
+        :return: number of rows written
         """
         try:
             database_name = self.data_ingestion_config.database_name
             collection_name = self.data_ingestion_config.collection_name
+            batch_size = self.data_ingestion_config.batch_size
             logging.info(f"Connecting to MongoDB: {database_name}.{collection_name}")
-            
+
+            schema = arrow_schema(self.schema_config["columns"])
+            # _id is read for the watermark; documents_to_table keeps only the schema columns
+            projection = {"_id": 1, **{name: 1 for name in schema.names}}
+            previous_watermark = self.previous_watermark()
+            query = {"_id": {"$gt": ObjectId(previous_watermark)}} if previous_watermark else {}
+            if previous_watermark:
+                logging.info(f"Incremental ingestion of documents newer than {previous_watermark}")
+
             client = pymongo.MongoClient(uri)
             collection = client[database_name][collection_name]
-            cursor = collection.find({})
-            
-            df = pd.DataFrame(list(cursor))
-            if "_id" in df.columns:
-                df.drop(columns=["_id"], axis=1, inplace=True)
-            
-            df.replace("", np.nan, inplace=True)
-            logging.info(f"DataFrame shape: {df.shape}")
-            return df
+            cursor = collection.find(query, projection=projection, batch_size=batch_size)
+
+            feature_store_file_path = self.data_ingestion_config.feature_store_file_path
+            os.makedirs(os.path.dirname(feature_store_file_path), exist_ok=True)
+            newest_id = None
+            with ParquetShardWriter(feature_store_file_path, schema) as writer:
+                batch = []
+                for document in cursor:
+                    if newest_id is None or document["_id"] > newest_id:
+                        newest_id = document["_id"]
+                    batch.append(document)
+                    if len(batch) == batch_size:
+                        writer.write(documents_to_table(batch, schema))
+                        batch = []
+                if batch or writer.num_rows == 0:
+                    writer.write(documents_to_table(batch, schema))
+
+            logging.info(f"Feature store rows: {writer.num_rows}, columns: {len(schema.names)}")
+            if previous_watermark and writer.num_rows == 0:
+                raise ValueError(f"No documents newer than the saved model's watermark {previous_watermark}")
+            self.watermark = str(newest_id) if newest_id is not None else None
+            return writer.num_rows
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
-    def split_data_as_train_test(self, df: pd.DataFrame) -> None:
+    def source_fingerprint(self) -> Optional[Dict[str, Any]]:
         """
-        Split data into train and test sets.
+        Cheap version stamp of the source collection: document count and newest _id.
+
+        Inserted and deleted documents change it, in-place updates do not.
+        Returns None when the collection cannot be reached, so the stage runs.
         """
         try:
-            train_set, test_set = train_test_split(
-                df, test_size=self.data_ingestion_config.train_test_split_ratio, random_state=42
-            )
-            logging.info(f"Train set shape: {train_set.shape}, Test set shape: {test_set.shape}")
-            
-            os.makedirs(os.path.dirname(self.data_ingestion_config.training_file_path), exist_ok=True)
-            train_set.to_csv(self.data_ingestion_config.training_file_path, index=False, header=True)
-            test_set.to_csv(self.data_ingestion_config.test_file_path, index=False, header=True)
+            client = pymongo.MongoClient(uri)
+            collection = client[self.data_ingestion_config.database_name][self.data_ingestion_config.collection_name]
+            newest = collection.find_one({}, projection={"_id": 1}, sort=[("_id", pymongo.DESCENDING)])
+            return {
+                "count": collection.count_documents({}),
+                "newest_id": str(newest["_id"]) if newest else None
+            }
+        except Exception as e:
+            logging.warning(f"Could not fingerprint {self.data_ingestion_config.collection_name}: {e}")
+            return None
+
+    def split_data_as_train_test(self) -> None:
+        """
+        Split the feature store into train and test Parquet files, one row group at a time.
+
+        The test rows are drawn up front from the row count in the Parquet
+        footer, so the split has the same sizes as train_test_split and only
+        a boolean mask of the full length is held in memory.
+        """
+        try:
+            feature_store_file_path = self.data_ingestion_config.feature_store_file_path
+            num_rows = parquet_num_rows(feature_store_file_path)
+            num_test = int(np.ceil(num_rows * self.data_ingestion_config.train_test_split_ratio))
+
+            rng = np.random.default_rng(42)
+            is_test = np.zeros(num_rows, dtype=bool)
+            is_test[rng.choice(num_rows, size=num_test, replace=False)] = True
+
+            training_file_path = self.data_ingestion_config.training_file_path
+            test_file_path = self.data_ingestion_config.test_file_path
+            os.makedirs(os.path.dirname(training_file_path), exist_ok=True)
+
+            feature_store = pq.ParquetFile(feature_store_file_path)
+            offset = 0
+            with ParquetShardWriter(training_file_path, feature_store.schema_arrow) as train_writer, \
+                    ParquetShardWriter(test_file_path, feature_store.schema_arrow) as test_writer:
+                for table in iter_parquet_tables(feature_store_file_path):
+                    mask = is_test[offset:offset + table.num_rows]
+                    offset += table.num_rows
+                    train_writer.write(table.filter(pa.array(~mask)))
+                    test_writer.write(table.filter(pa.array(mask)))
+
+            logging.info(f"Train set rows: {num_rows - num_test}, Test set rows: {num_test}")
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
@@ -62,15 +150,16 @@ class DataIngestion:
         """
         try:
             logging.info("Starting data ingestion")
-            df = self.export_collection_as_dataframe()
-            self.split_data_as_train_test(df)
+            self.export_collection_to_feature_store()
+            self.split_data_as_train_test()
             
             artifact = DataIngestionArtifact(
                 feature_store_file_path=self.data_ingestion_config.feature_store_file_path,
                 train_file_path=self.data_ingestion_config.training_file_path,
-                test_file_path=self.data_ingestion_config.test_file_path
+                test_file_path=self.data_ingestion_config.test_file_path,
+                watermark=self.watermark
             )
             logging.info("Data ingestion completed successfully")
             return artifact
         except Exception as e:
-            raise NetworkSecurityException(e, sys)
\ No newline at end of file
+            raise NetworkSecurityException(e, sys)
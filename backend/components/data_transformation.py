@@ -1,15 +1,18 @@
 #networksecurity/components/data_transformation.py
 
+import os
 import sys
 import numpy as np
-import pandas as pd
+from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 from networksecurity.entity.artifact_entity import DataValidationArtifact, DataTransformationArtifact
 from networksecurity.entity.config_entity import DataTransformationConfig
-from networksecurity.utils.main_utils import save_numpy_array_data, save_object
+from networksecurity.utils.main_utils import load_object, save_numpy_array_data, save_object
+from networksecurity.utils.main_utils.dag_executor import DagExecutor
+from networksecurity.utils.main_utils.feature_store import read_table
 
 class DataTransformation:
     def __init__(self, data_validation_artifact: DataValidationArtifact, 
@@ -19,7 +22,9 @@ class DataTransformation:
 
     def get_transformation_pipeline(self):
         try:
+            # Validation lets through up to max_null_ratio missing feature values
             pipeline = Pipeline([
+                ('imputer', SimpleImputer(strategy='most_frequent')),
                 ('scaler', StandardScaler())
             ])
             return pipeline
@@ -30,26 +35,35 @@ class DataTransformation:
         try:
             logging.info("Starting data transformation")
             
-            train_df = pd.read_csv(self.data_validation_artifact.valid_train_file_path)
-            test_df = pd.read_csv(self.data_validation_artifact.valid_test_file_path)
-            
+            config = self.data_transformation_config
             target_column = "Result"
-            input_feature_train_df = train_df.drop(columns=[target_column], axis=1)
-            input_feature_test_df = test_df.drop(columns=[target_column], axis=1)
-            
-            target_feature_train_df = train_df[target_column]
-            target_feature_test_df = test_df[target_column]
-            
-            preprocessor = self.get_transformation_pipeline()
-            input_feature_train_arr = preprocessor.fit_transform(input_feature_train_df)
-            input_feature_test_arr = preprocessor.transform(input_feature_test_df)
-            
-            train_arr = np.c_[input_feature_train_arr, target_feature_train_df]
-            test_arr = np.c_[input_feature_test_arr, target_feature_test_df]
-            
-            save_numpy_array_data(self.data_transformation_config.transformed_train_file_path, train_arr)
-            save_numpy_array_data(self.data_transformation_config.transformed_test_file_path, test_arr)
-            save_object(self.data_transformation_config.transformed_object_file_path, preprocessor)
+
+            def fit_preprocessor(train_df):
+                if getattr(config, "incremental", False) and os.path.exists(config.saved_preprocessor_file_path):
+                    # Trees added to the saved model must see features scaled like its existing trees
+                    logging.info(f"Reusing the saved preprocessor {config.saved_preprocessor_file_path}")
+                    return load_object(config.saved_preprocessor_file_path)
+                return self.get_transformation_pipeline().fit(train_df.drop(columns=[target_column]))
+
+            def transform(file_path):
+                def task(preprocessor, df):
+                    features = preprocessor.transform(df.drop(columns=[target_column]))
+                    save_numpy_array_data(file_path, np.c_[features, df[target_column]])
+                return task
+
+            # Reading, transforming and saving the train and test tables are independent
+            # once the preprocessor is fitted on train, so both halves run concurrently
+            (
+                DagExecutor(config.max_workers)
+                .add("train_df", lambda: read_table(self.data_validation_artifact.valid_train_file_path))
+                .add("test_df", lambda: read_table(self.data_validation_artifact.valid_test_file_path))
+                .add("preprocessor", fit_preprocessor, deps=["train_df"])
+                .add("train_arr", transform(config.transformed_train_file_path), deps=["preprocessor", "train_df"])
+                .add("test_arr", transform(config.transformed_test_file_path), deps=["preprocessor", "test_df"])
+                .add("save_preprocessor", lambda preprocessor: save_object(config.transformed_object_file_path,
+                                                                           preprocessor), deps=["preprocessor"])
+                .run()
+            )
             
             return DataTransformationArtifact(
                 transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
@@ -1,16 +1,19 @@
 # networksecurity.components.data_validation.py
 
 import os
+import shutil
 import sys
 import pandas as pd
-import numpy as np
 from typing import Dict, Any
-from scipy.stats import ks_2samp
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 from networksecurity.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
 from networksecurity.entity.config_entity import DataValidationConfig
 from networksecurity.utils.main_utils import read_yaml_file, write_yaml_file
+from networksecurity.utils.main_utils.dag_executor import DagExecutor
+from networksecurity.utils.main_utils.data_quality import DataQualityValidator, validate_table
+from networksecurity.utils.main_utils.feature_store import sample_table
+from networksecurity.utils.ml_utils.metric.drift_metric import detect_drift
 
 class DataValidation:
     def __init__(self, data_ingestion_artifact: DataIngestionArtifact, data_validation_config: DataValidationConfig):
@@ -19,89 +22,98 @@ class DataValidation:
         self.schema_config = read_yaml_file(self.data_validation_config.schema_file_path)
 
     def validate_schema(self, df: pd.DataFrame) -> Dict[str, Any]:
-        try:
-            validation_report = {
-                "columns_match": True,
-                "missing_columns": [],
-                "extra_columns": [],
-                "dtype_match": True
-            }
+        """
+        Check an in-memory DataFrame against the schema and its quality rules.
 
-            # Validate column presence
-            expected_columns = set(self.schema_config["columns"].keys())
-            actual_columns = set(df.columns)
-            
-            validation_report["missing_columns"] = list(expected_columns - actual_columns)
-            validation_report["extra_columns"] = list(actual_columns - expected_columns)
-            
-            if validation_report["missing_columns"] or validation_report["extra_columns"]:
-                validation_report["columns_match"] = False
-                return validation_report
+        :param df: table to check
+        :return: report of `DataQualityValidator.report`
+        """
+        try:
+            validator = DataQualityValidator(self.schema_config,
+                                             failure_samples=self.data_validation_config.failure_samples)
+            validator.update(df)
+            return validator.report()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
 
-            # Validate data types
-            for column, dtype in self.schema_config["columns"].items():
-                if str(df[column].dtype) != dtype:
-                    validation_report["dtype_match"] = False
-                    break
+    def validate_file(self, file_path: str) -> Dict[str, Any]:
+        """
+        Check a train or test file chunk by chunk, in memory independent of its size.
 
-            return validation_report
+        :param file_path: Parquet, Feather or CSV table
+        :return: report of `DataQualityValidator.report`
+        """
+        try:
+            return validate_table(file_path, self.schema_config,
+                                  chunk_size=self.data_validation_config.chunk_size,
+                                  failure_samples=self.data_validation_config.failure_samples)
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
     def detect_data_drift(self, base_df: pd.DataFrame, current_df: pd.DataFrame, threshold: float = 0.05) -> Dict[str, Any]:
         try:
-            drift_report = {}
-            for column in base_df.columns:
-                if base_df[column].dtype in [np.float64, np.int64]:
-                    statistic, p_value = ks_2samp(base_df[column], current_df[column])
-                    drift_report[column] = {
-                        "drift_detected": p_value < threshold,
-                        "p_value": float(p_value)
-                    }
-            return drift_report
+            return detect_drift(
+                base_df, current_df, threshold=threshold,
+                psi_bins=self.data_validation_config.drift_psi_bins,
+                max_rows=self.data_validation_config.drift_max_rows,
+                n_jobs=self.data_validation_config.drift_n_jobs
+            )
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
     def initiate_data_validation(self) -> DataValidationArtifact:
         try:
             logging.info("Starting data validation")
-            train_df = pd.read_csv(self.data_ingestion_artifact.train_file_path)
-            test_df = pd.read_csv(self.data_ingestion_artifact.test_file_path)
 
-            # Validate schema
-            train_schema_report = self.validate_schema(train_df)
-            test_schema_report = self.validate_schema(test_df)
+            # Validate schema and data quality of both tables concurrently, without loading them
+            train_file_path = self.data_ingestion_artifact.train_file_path
+            test_file_path = self.data_ingestion_artifact.test_file_path
+            reports = (
+                DagExecutor(self.data_validation_config.max_workers)
+                .add("train", lambda: self.validate_file(train_file_path))
+                .add("test", lambda: self.validate_file(test_file_path))
+                .run()
+            )
+            # Results arrive in completion order; the report always lists train first
+            quality_report = {"train": reports["train"], "test": reports["test"]}
+            write_yaml_file(self.data_validation_config.quality_report_file_path, quality_report, replace=True)
 
-            logging.info(f"Train schema validation report: {train_schema_report}")
-            logging.info(f"Test schema validation report: {test_schema_report}")
+            logging.info(f"Train validation passed: {quality_report['train']['valid']}")
+            logging.info(f"Test validation passed: {quality_report['test']['valid']}")
 
-            if not (train_schema_report["columns_match"] and train_schema_report["dtype_match"] and
-                   test_schema_report["columns_match"] and test_schema_report["dtype_match"]):
-                logging.error("Schema validation failed")
+            if not (quality_report["train"]["valid"] and quality_report["test"]["valid"]):
+                logging.error(f"Schema validation failed, see {self.data_validation_config.quality_report_file_path}")
                 
-                # Save invalid datasets
+                # Keep byte copies of the invalid datasets for inspection
                 os.makedirs(os.path.dirname(self.data_validation_config.invalid_train_file_path), exist_ok=True)
-                train_df.to_csv(self.data_validation_config.invalid_train_file_path, index=False)
-                test_df.to_csv(self.data_validation_config.invalid_test_file_path, index=False)
+                shutil.copyfile(self.data_ingestion_artifact.train_file_path,
+                                self.data_validation_config.invalid_train_file_path)
+                shutil.copyfile(self.data_ingestion_artifact.test_file_path,
+                                self.data_validation_config.invalid_test_file_path)
                 
                 raise ValueError("Schema validation failed")
 
-            # Detect data drift
-            drift_report = self.detect_data_drift(train_df, test_df)
+            # Detect data drift on bounded samples, streamed so neither table is loaded whole
+            max_rows = self.data_validation_config.drift_max_rows
+            chunk_size = self.data_validation_config.chunk_size
+            tables = (
+                DagExecutor(self.data_validation_config.max_workers)
+                .add("train", lambda: sample_table(train_file_path, max_rows, chunk_size))
+                .add("test", lambda: sample_table(test_file_path, max_rows, chunk_size))
+                .run()
+            )
+            drift_report = self.detect_data_drift(tables["train"], tables["test"])
             write_yaml_file(self.data_validation_config.drift_report_file_path, drift_report)
 
-            # Save valid datasets
-            os.makedirs(os.path.dirname(self.data_validation_config.valid_train_file_path), exist_ok=True)
-            train_df.to_csv(self.data_validation_config.valid_train_file_path, index=False)
-            test_df.to_csv(self.data_validation_config.valid_test_file_path, index=False)
-
+            # Valid datasets are passed on by reference instead of being rewritten
             artifact = DataValidationArtifact(
                 validation_status=True,
-                valid_train_file_path=self.data_validation_config.valid_train_file_path,
-                valid_test_file_path=self.data_validation_config.valid_test_file_path,
+                valid_train_file_path=self.data_ingestion_artifact.train_file_path,
+                valid_test_file_path=self.data_ingestion_artifact.test_file_path,
                 invalid_train_file_path=self.data_validation_config.invalid_train_file_path,
                 invalid_test_file_path=self.data_validation_config.invalid_test_file_path,
-                drift_report_file_path=self.data_validation_config.drift_report_file_path
+                drift_report_file_path=self.data_validation_config.drift_report_file_path,
+                quality_report_file_path=self.data_validation_config.quality_report_file_path
             )
             logging.info("Data validation completed successfully")
             return artifact
@@ -10,8 +10,12 @@ from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 from networksecurity.entity.artifact_entity import DataTransformationArtifact, ModelTrainerArtifact, ClassificationMetricArtifact
 from networksecurity.entity.config_entity import ModelTrainerConfig
-from networksecurity.utils.main_utils import load_numpy_array_data, save_object
+from networksecurity.utils.main_utils import load_numpy_array_data, load_object, save_object, write_yaml_file
+from networksecurity.utils.main_utils.dag_executor import DagExecutor
 from networksecurity.utils.ml_utils.metric.classification_metric import get_classification_score
+from networksecurity.utils.ml_utils.model.compiled_forest import export_compiled_forest
+from networksecurity.utils.ml_utils.model.incremental import extend_forest
+from networksecurity.utils.ml_utils.model.model_selection import default_search_space, search_models
 
 class ModelTrainer:
     def __init__(self, model_trainer_config: ModelTrainerConfig, 
@@ -19,8 +23,24 @@ class ModelTrainer:
         self.model_trainer_config = model_trainer_config
         self.data_transformation_artifact = data_transformation_artifact
 
-    def train_model(self, x_train: np.ndarray, y_train: np.ndarray) -> RandomForestClassifier:
+    def load_saved_model(self):
+        """Saved model that incremental training extends, None outside incremental mode or before the first publish."""
+        config = self.model_trainer_config
+        if not getattr(config, "incremental", False) or not os.path.exists(config.saved_model_file_path):
+            return None
+        logging.info(f"Extending the saved model {config.saved_model_file_path}")
+        return load_object(config.saved_model_file_path)
+
+    def train_model(self, x_train: np.ndarray, y_train: np.ndarray, base_model=None):
         try:
+            if base_model is not None:
+                return extend_forest(
+                    base_model, x_train, y_train,
+                    n_new_estimators=self.model_trainer_config.incremental_estimators,
+                    max_estimators=self.model_trainer_config.max_estimators
+                )
+            if getattr(self.model_trainer_config, "model_search", False):
+                return self.search_model(x_train, y_train)
             rf_clf = RandomForestClassifier(
                 n_estimators=100,
                 random_state=42
@@ -30,25 +50,64 @@ class ModelTrainer:
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
+    def search_model(self, x_train: np.ndarray, y_train: np.ndarray):
+        """
+        Pick the model with a parallel successive-halving search and return it
+        refitted on all training rows. The ranked report is saved next to the model.
+        """
+        config = self.model_trainer_config
+        space = default_search_space()
+        result = search_models(
+            x_train, y_train,
+            models=space["models"],
+            params=space["params"],
+            scoring=config.search_scoring,
+            cv=config.search_cv,
+            factor=config.search_factor,
+            n_jobs=config.search_n_jobs
+        )
+        logging.info(
+            f"Model search picked {result.best_model_name} {result.best_params} "
+            f"({config.search_scoring}={result.best_score:.4f})"
+        )
+        write_yaml_file(config.search_report_file_path, {
+            "best_model": result.best_model_name,
+            "best_params": result.best_params,
+            "best_score": result.best_score,
+            "scoring": config.search_scoring,
+            "ranking": result.report
+        }, replace=True)
+        return result.best_estimator
+
     def initiate_model_trainer(self) -> ModelTrainerArtifact:
         try:
+            # .npy arrays are memory-mapped: slicing reads from the page cache
+            # and worker processes reopen the file instead of receiving copies
             train_arr = load_numpy_array_data(
-                self.data_transformation_artifact.transformed_train_file_path
+                self.data_transformation_artifact.transformed_train_file_path, mmap_mode="r"
             )
             test_arr = load_numpy_array_data(
-                self.data_transformation_artifact.transformed_test_file_path
+                self.data_transformation_artifact.transformed_test_file_path, mmap_mode="r"
             )
 
             x_train, y_train = train_arr[:, :-1], train_arr[:, -1]
             x_test, y_test = test_arr[:, :-1], test_arr[:, -1]
 
-            model = self.train_model(x_train, y_train)
-            
-            y_train_pred = model.predict(x_train)
-            y_test_pred = model.predict(x_test)
+            base_model = self.load_saved_model()
+            if base_model is not None:
+                base_metric = get_classification_score(y_test, base_model.predict(x_test))
+                logging.info(f"Saved model on the new test rows: f1={base_metric.f1Score:.4f}")
 
-            train_metric = get_classification_score(y_train, y_train_pred)
-            test_metric = get_classification_score(y_test, y_test_pred)
+            model = self.train_model(x_train, y_train, base_model)
+            
+            # Predicting and scoring the train and test rows are independent
+            metrics = (
+                DagExecutor(self.model_trainer_config.max_workers)
+                .add("train", lambda: get_classification_score(y_train, model.predict(x_train)))
+                .add("test", lambda: get_classification_score(y_test, model.predict(x_test)))
+                .run()
+            )
+            train_metric, test_metric = metrics["train"], metrics["test"]
 
             if test_metric.f1Score < self.model_trainer_config.expected_accuracy:
                 raise Exception("Model performance below expected accuracy")
@@ -58,6 +117,10 @@ class ModelTrainer:
                 model
             )
 
+            # Flattened copy of the forest that the API serves instead of the pickle
+            compiled_model_path = export_compiled_forest(model, self.model_trainer_config.trained_model_file_path)
+            logging.info(f"Compiled forest saved to {compiled_model_path}")
+
             return ModelTrainerArtifact(
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                 train_metric_artifact=train_metric,
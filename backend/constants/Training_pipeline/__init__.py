@@ -18,8 +18,36 @@ TEST_FILE_NAME: str = "test.csv"
 
 SCHEMA_FILE_PATH = os.path.join("data_schema", "schema.yaml")
 
+# Stage manifests shared by all runs, see utils/main_utils/stage_cache.py
+STAGE_CACHE_DIR_NAME: str = "stage_cache"
+# Artifact of the latest run of every stage, loaded by stages run on their own (--stage)
+STAGE_MANIFEST_DIR_NAME: str = "manifests"
+# Worker threads running independent stages and the train/test halves of a stage; None uses the pool default
+PIPELINE_MAX_WORKERS = None
+# Wall time, CPU time and peak memory of every stage, written into the run's artifact dir with --profile
+PROFILE_REPORT_FILE_NAME: str = "profile_report.yaml"
+# Seconds between stack samples of a profiled stage
+PROFILE_SAMPLE_INTERVAL: float = 0.005
+
+# Experiment tracking: runs are spooled under the artifact dir and uploaded in the background.
+# Credentials come from MLFLOW_TRACKING_USERNAME / MLFLOW_TRACKING_PASSWORD in the environment.
+MLFLOW_TRACKING_URI: str = os.getenv(
+    "MLFLOW_TRACKING_URI", "https://dagshub.com/austinLorenzMccoy/networkSecurity_project.mlflow"
+)
+MLFLOW_EXPERIMENT_NAME: str = "network_security_classification"
+MLFLOW_REGISTERED_MODEL_NAME: str = "NetworkSecurityModel"
+TRACKING_SPOOL_DIR_NAME: str = "mlflow_spool"
+# Seconds a finished run waits for its upload before leaving it to the next run
+TRACKING_UPLOAD_TIMEOUT: float = 10.0
+
 SAVED_MODEL_DIR = os.path.join("saved_models")
 MODEL_FILE_NAME = "model.pkl"
+# Production preprocessor and training watermark published next to the saved model
+PREPROCESSOR_FILE_NAME = "preprocessor.pkl"
+TRAINING_STATE_FILE_NAME = "training_state.yaml"
+# Retrain only on documents newer than the saved model's watermark, adding
+# trees to the saved forest instead of refitting it on the whole history
+INCREMENTAL_TRAINING: bool = False
 
 """
 Data Ingestion related constant start with DATA_INGESTION VAR NAME
@@ -28,7 +56,12 @@ DATA_INGESTION_COLLECTION_NAME: str = "network_data"
 DATA_INGESTION_DATABASE_NAME: str = "AUSTINAI"
 DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
+DATA_INGESTION_FEATURE_STORE_FILE_NAME: str = "network_data.parquet"
+# Documents fetched per cursor batch and written per Parquet row group
+DATA_INGESTION_BATCH_SIZE: int = 10000
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
+DATA_INGESTION_TRAIN_FILE_NAME: str = "train.parquet"
+DATA_INGESTION_TEST_FILE_NAME: str = "test.parquet"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.2
 
 """
@@ -39,10 +72,19 @@ DATA_VALIDATION_VALID_DIR: str = "validated"
 DATA_VALIDATION_INVALID_DIR: str = "invalid"
 DATA_VALIDATION_DRIFT_REPORT_DIR: str = "drift_report"
 DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "report.yaml"
+DATA_VALIDATION_DRIFT_PSI_BINS: int = 10
+# Compare uniform samples of at most this many rows per split, streamed from the files so memory
+# stays bounded; None loads and compares every row
+DATA_VALIDATION_DRIFT_MAX_ROWS = 500000
+DATA_VALIDATION_DRIFT_N_JOBS: int = -1
+DATA_VALIDATION_QUALITY_REPORT_FILE_NAME: str = "quality_report.yaml"
+# Rows checked at a time against the schema, and failing rows kept per column
+DATA_VALIDATION_CHUNK_SIZE: int = 50000
+DATA_VALIDATION_FAILURE_SAMPLES: int = 5
 
 # Adding the missing constants
-DATA_VALIDATION_TRAIN_FILE_NAME: str = "train.csv"
-DATA_VALIDATION_TEST_FILE_NAME: str = "test.csv"
+DATA_VALIDATION_TRAIN_FILE_NAME: str = "train.parquet"
+DATA_VALIDATION_TEST_FILE_NAME: str = "test.parquet"
 
 """
 Data Transformation related constant start with DATA_TRANSFORMATION VAR NAME
@@ -70,6 +112,15 @@ MODEL_TRAINER_TRAINED_MODEL_DIR: str = "trained_model"
 MODEL_TRAINER_TRAINED_MODEL_NAME: str = "model.pkl"
 MODEL_TRAINER_EXPECTED_SCORE: float = 0.6
 MODEL_TRAINER_OVERFITTING_UNDERFITTING_THRESHOLD: float = 0.05
+MODEL_TRAINER_MODEL_SEARCH: bool = True
+MODEL_TRAINER_SEARCH_SCORING: str = "f1"
+MODEL_TRAINER_SEARCH_CV: int = 3
+MODEL_TRAINER_SEARCH_FACTOR: int = 3
+MODEL_TRAINER_SEARCH_N_JOBS: int = -1
+MODEL_TRAINER_SEARCH_REPORT_FILE_NAME: str = "model_search_report.yaml"
+# Trees added per incremental retrain, and trees kept once the oldest are retired (None keeps all)
+MODEL_TRAINER_INCREMENTAL_ESTIMATORS: int = 20
+MODEL_TRAINER_MAX_ESTIMATORS = None
 
 """
 Model Evaluation related constant start with MODEL_EVALUATION VAR NAME
@@ -13,6 +13,7 @@ from networksecurity.entity.artifact_entity import DataTransformationArtifact, M
 from networksecurity.entity.config_entity import ModelTrainerConfig
 from networksecurity.utils.main_utils import load_numpy_array_data, save_object
 from networksecurity.utils.ml_utils.metric.classification_metric import get_classification_score
+from networksecurity.utils.ml_utils.model.compiled_forest import export_compiled_forest
 
 class CustomModelTrainer:
     def __init__(self, model_trainer_config: ModelTrainerConfig, 
@@ -33,11 +34,13 @@ class CustomModelTrainer:
 
     def initiate_model_trainer(self) -> ModelTrainerArtifact:
         try:
+            # .npy arrays are memory-mapped: slicing reads from the page cache
+            # and worker processes reopen the file instead of receiving copies
             train_arr = load_numpy_array_data(
-                self.data_transformation_artifact.transformed_train_file_path
+                self.data_transformation_artifact.transformed_train_file_path, mmap_mode="r"
             )
             test_arr = load_numpy_array_data(
-                self.data_transformation_artifact.transformed_test_file_path
+                self.data_transformation_artifact.transformed_test_file_path, mmap_mode="r"
             )
 
             x_train, y_train = train_arr[:, :-1], train_arr[:, -1]
@@ -67,6 +70,10 @@ class CustomModelTrainer:
                 model
             )
 
+            # Flattened copy of the forest that the API serves instead of the pickle
+            compiled_model_path = export_compiled_forest(model, self.model_trainer_config.trained_model_file_path)
+            logging.info(f"Compiled forest saved to {compiled_model_path}")
+
             return ModelTrainerArtifact(
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
                 train_metric_artifact=train_metric,
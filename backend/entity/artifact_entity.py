@@ -1,12 +1,15 @@
 ### NETWORKSECURITY/networksecurity/entity/artifact_entity.py
 
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class DataIngestionArtifact:
     feature_store_file_path: str
     train_file_path: str
     test_file_path: str
+    # Newest MongoDB _id in the feature store, None when it is empty
+    watermark: Optional[str] = None
 
 @dataclass
 class DataValidationArtifact:
@@ -16,6 +19,7 @@ class DataValidationArtifact:
     invalid_train_file_path: str
     invalid_test_file_path: str
     drift_report_file_path: str
+    quality_report_file_path: Optional[str] = None
 
 @dataclass
 class DataTransformationArtifact:
@@ -13,6 +13,18 @@ class TrainingPipelineConfig:
         timestamp = datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
         self.pipeline_name = Training_pipeline.PIPELINE_NAME
         self.artifact_dir = os.path.join(Training_pipeline.ARTIFACT_DIR, timestamp)
+        self.stage_cache_dir = os.path.join(Training_pipeline.ARTIFACT_DIR, Training_pipeline.STAGE_CACHE_DIR_NAME)
+        self.manifest_dir = os.path.join(Training_pipeline.ARTIFACT_DIR, Training_pipeline.STAGE_MANIFEST_DIR_NAME)
+        self.max_workers = Training_pipeline.PIPELINE_MAX_WORKERS
+        self.profile_report_file_path = os.path.join(self.artifact_dir, Training_pipeline.PROFILE_REPORT_FILE_NAME)
+        self.profile_sample_interval = Training_pipeline.PROFILE_SAMPLE_INTERVAL
+        self.saved_model_dir = Training_pipeline.SAVED_MODEL_DIR
+        self.training_state_file_path = os.path.join(self.saved_model_dir, Training_pipeline.TRAINING_STATE_FILE_NAME)
+        self.incremental = Training_pipeline.INCREMENTAL_TRAINING
+        self.tracking_uri = Training_pipeline.MLFLOW_TRACKING_URI
+        self.experiment_name = Training_pipeline.MLFLOW_EXPERIMENT_NAME
+        self.tracking_spool_dir = os.path.join(Training_pipeline.ARTIFACT_DIR, Training_pipeline.TRACKING_SPOOL_DIR_NAME)
+        self.tracking_upload_timeout = Training_pipeline.TRACKING_UPLOAD_TIMEOUT
 
 class DataIngestionConfig:
     def __init__(self, training_pipeline_config: TrainingPipelineConfig):
@@ -23,17 +35,22 @@ class DataIngestionConfig:
             training_pipeline_config.artifact_dir, Training_pipeline.DATA_INGESTION_DIR_NAME
         )
         self.feature_store_file_path = os.path.join(
-            self.data_ingestion_dir, Training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR, Training_pipeline.FILE_NAME
+            self.data_ingestion_dir, Training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR,
+            Training_pipeline.DATA_INGESTION_FEATURE_STORE_FILE_NAME
         )
         self.training_file_path = os.path.join(
-            self.data_ingestion_dir, Training_pipeline.DATA_INGESTION_INGESTED_DIR, Training_pipeline.TRAIN_FILE_NAME
+            self.data_ingestion_dir, Training_pipeline.DATA_INGESTION_INGESTED_DIR, Training_pipeline.DATA_INGESTION_TRAIN_FILE_NAME
         )
         self.test_file_path = os.path.join(
-            self.data_ingestion_dir, Training_pipeline.DATA_INGESTION_INGESTED_DIR, Training_pipeline.TEST_FILE_NAME
+            self.data_ingestion_dir, Training_pipeline.DATA_INGESTION_INGESTED_DIR, Training_pipeline.DATA_INGESTION_TEST_FILE_NAME
         )
         self.train_test_split_ratio = Training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
         self.collection_name = Training_pipeline.DATA_INGESTION_COLLECTION_NAME
         self.database_name = Training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.batch_size = Training_pipeline.DATA_INGESTION_BATCH_SIZE
+        self.schema_file_path = Training_pipeline.SCHEMA_FILE_PATH
+        self.incremental = training_pipeline_config.incremental
+        self.training_state_file_path = training_pipeline_config.training_state_file_path
 
 
 class DataValidationConfig:
@@ -51,8 +68,17 @@ class DataValidationConfig:
             self.data_validation_dir, Training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
             Training_pipeline.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME
         )
+        self.quality_report_file_path = os.path.join(
+            self.data_validation_dir, Training_pipeline.DATA_VALIDATION_QUALITY_REPORT_FILE_NAME
+        )
         # Updated schema path
         self.schema_file_path = os.path.join("data_schema", "schema.yaml")
+        self.drift_psi_bins = Training_pipeline.DATA_VALIDATION_DRIFT_PSI_BINS
+        self.drift_max_rows = Training_pipeline.DATA_VALIDATION_DRIFT_MAX_ROWS
+        self.drift_n_jobs = Training_pipeline.DATA_VALIDATION_DRIFT_N_JOBS
+        self.chunk_size = Training_pipeline.DATA_VALIDATION_CHUNK_SIZE
+        self.failure_samples = Training_pipeline.DATA_VALIDATION_FAILURE_SAMPLES
+        self.max_workers = training_pipeline_config.max_workers
         
 class DataTransformationConfig:
     def __init__(self, training_pipeline_config: TrainingPipelineConfig):
@@ -64,16 +90,21 @@ class DataTransformationConfig:
         )
         self.transformed_train_file_path = os.path.join(
             self.data_transformation_dir, Training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            Training_pipeline.TRAIN_FILE_NAME.replace("csv", "npz")
+            Training_pipeline.TRAIN_FILE_NAME.replace("csv", "npy")
         )
         self.transformed_test_file_path = os.path.join(
             self.data_transformation_dir, Training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-            Training_pipeline.TEST_FILE_NAME.replace("csv", "npz")
+            Training_pipeline.TEST_FILE_NAME.replace("csv", "npy")
         )
         self.transformed_object_file_path = os.path.join(
             self.data_transformation_dir, Training_pipeline.PREPROCSSING_OBJECT_DIR_NAME,
             Training_pipeline.PREPROCESSING_TRANSFORMED_OBJECT_FILE_NAME
         )
+        self.incremental = training_pipeline_config.incremental
+        self.saved_preprocessor_file_path = os.path.join(
+            training_pipeline_config.saved_model_dir, Training_pipeline.PREPROCESSOR_FILE_NAME
+        )
+        self.max_workers = training_pipeline_config.max_workers
 
 class ModelTrainerConfig:
     def __init__(self, training_pipeline_config: TrainingPipelineConfig):
@@ -87,4 +118,17 @@ class ModelTrainerConfig:
             self.model_trainer_dir, Training_pipeline.MODEL_TRAINER_TRAINED_MODEL_DIR, Training_pipeline.MODEL_FILE_NAME
         )
         self.expected_accuracy = Training_pipeline.MODEL_TRAINER_EXPECTED_SCORE
-        self.overfitting_underfitting_threshold = Training_pipeline.MODEL_TRAINER_OVERFITTING_UNDERFITTING_THRESHOLD
\ No newline at end of file
+        self.overfitting_underfitting_threshold = Training_pipeline.MODEL_TRAINER_OVERFITTING_UNDERFITTING_THRESHOLD
+        self.model_search = Training_pipeline.MODEL_TRAINER_MODEL_SEARCH
+        self.search_scoring = Training_pipeline.MODEL_TRAINER_SEARCH_SCORING
+        self.search_cv = Training_pipeline.MODEL_TRAINER_SEARCH_CV
+        self.search_factor = Training_pipeline.MODEL_TRAINER_SEARCH_FACTOR
+        self.search_n_jobs = Training_pipeline.MODEL_TRAINER_SEARCH_N_JOBS
+        self.search_report_file_path = os.path.join(
+            self.model_trainer_dir, Training_pipeline.MODEL_TRAINER_SEARCH_REPORT_FILE_NAME
+        )
+        self.incremental = training_pipeline_config.incremental
+        self.saved_model_file_path = os.path.join(training_pipeline_config.saved_model_dir, Training_pipeline.MODEL_FILE_NAME)
+        self.incremental_estimators = Training_pipeline.MODEL_TRAINER_INCREMENTAL_ESTIMATORS
+        self.max_estimators = Training_pipeline.MODEL_TRAINER_MAX_ESTIMATORS
+        self.max_workers = training_pipeline_config.max_workers
@@ -0,0 +1,25 @@
+## NETWORKSECURITY/gunicorn.conf.py
+#
+# Multi-worker serving with one shared model per host:
+#   PRELOAD_MODEL=1 gunicorn -c gunicorn.conf.py app:app
+#
+# The master imports app.py (and, with PRELOAD_MODEL=1, loads the model) before
+# forking, so workers inherit the model copy-on-write. The compiled forest is
+# memory-mapped read-only (MODEL_MMAP=1), so its arrays live once in the page
+# cache however many workers run.
+
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far out of the collector's reach, so garbage
+    # collection in the workers does not write to (and un-share) those pages
+    gc.freeze()
@@ -2,14 +2,21 @@ import os
 import sys
 import argparse
 import json
-import mlflow
-import mlflow.sklearn
-from dagshub import dagshub_logger
+from functools import partial
+import sklearn
+import xgboost
 
 from networksecurity.components.data_ingestion import DataIngestion
 from networksecurity.components.data_validation import DataValidation
 from networksecurity.components.data_transformation import DataTransformation
 from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.entity.artifact_entity import (
+    DataIngestionArtifact,
+    DataValidationArtifact,
+    DataTransformationArtifact,
+    ModelTrainerArtifact
+)
+from networksecurity.constants.Training_pipeline import MLFLOW_REGISTERED_MODEL_NAME
 from networksecurity.entity.config_entity import (
     DataIngestionConfig, 
     DataValidationConfig, 
@@ -19,67 +26,134 @@ from networksecurity.entity.config_entity import (
 )
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils import data_quality, feature_store, write_yaml_file
+from networksecurity.utils.main_utils.dag_executor import DagExecutor
+from networksecurity.utils.main_utils.profiling import Profile
+from networksecurity.utils.main_utils.stage_cache import StageCache, artifact_files, read_manifest, write_manifest
+from networksecurity.utils.ml_utils.metric import classification_metric, drift_metric
+from networksecurity.utils.ml_utils.model import compiled_forest, incremental, model_selection
+from networksecurity.utils.ml_utils.model.incremental import publish_model
+from networksecurity.utils.ml_utils.tracking import ExperimentTracker
+
+# Artifact type of every stage, in pipeline order
+STAGE_ARTIFACTS = {
+    "data_ingestion": DataIngestionArtifact,
+    "data_validation": DataValidationArtifact,
+    "data_transformation": DataTransformationArtifact,
+    "model_trainer": ModelTrainerArtifact
+}
+
+def emit_stage_manifest(stage, artifact, config=TrainingPipelineConfig()):
+    """Record the artifact of a stage's latest run, for stages run later in another process."""
+    write_manifest(os.path.join(config.manifest_dir, f"{stage}.json"), artifact, stage=stage)
+    return artifact
+
+def load_stage_manifest(stage, config=TrainingPipelineConfig()):
+    """Artifact of the latest run of `stage`, None when it never ran or its outputs changed since."""
+    return read_manifest(os.path.join(config.manifest_dir, f"{stage}.json"), STAGE_ARTIFACTS[stage])
 
-def start_data_ingestion(config=TrainingPipelineConfig()):
+# Without a StageCache the start_* functions always run their stage.
+# Every stage records its artifact with emit_stage_manifest.
+def start_data_ingestion(config=TrainingPipelineConfig(), cache=None):
     try:
         data_ingestion_config = DataIngestionConfig(config)
         data_ingestion = DataIngestion(data_ingestion_config)
-        return data_ingestion.initiate_data_ingestion()
+        if cache is None:
+            return emit_stage_manifest("data_ingestion", data_ingestion.initiate_data_ingestion(), config)
+
+        # The collection is not a file: its count and newest _id stand in for its content
+        source = data_ingestion.source_fingerprint()
+        fingerprint = None if source is None else cache.fingerprint(
+            data_ingestion_config,
+            inputs=[data_ingestion_config.schema_file_path]
+                   + ([data_ingestion_config.training_state_file_path] if config.incremental else []),
+            code=[DataIngestion, feature_store, incremental],
+            extra={"source": source},
+            root=config.artifact_dir
+        )
+        artifact = cache.run("data_ingestion", fingerprint, data_ingestion.initiate_data_ingestion,
+                             DataIngestionArtifact)
+        return emit_stage_manifest("data_ingestion", artifact, config)
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
-def start_data_validation(data_ingestion_artifact, config=TrainingPipelineConfig()):
+def start_data_validation(data_ingestion_artifact, config=TrainingPipelineConfig(), cache=None):
     try:
         data_validation_config = DataValidationConfig(config)
         data_validation = DataValidation(data_ingestion_artifact, data_validation_config)
-        return data_validation.initiate_data_validation()
+        if cache is None:
+            return emit_stage_manifest("data_validation", data_validation.initiate_data_validation(), config)
+
+        fingerprint = cache.fingerprint(
+            data_validation_config,
+            inputs=artifact_files(data_ingestion_artifact) + [data_validation_config.schema_file_path],
+            code=[DataValidation, data_quality, drift_metric],
+            root=config.artifact_dir
+        )
+        artifact = cache.run("data_validation", fingerprint, data_validation.initiate_data_validation,
+                             DataValidationArtifact)
+        return emit_stage_manifest("data_validation", artifact, config)
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
-def start_data_transformation(data_validation_artifact, config=TrainingPipelineConfig()):
+def start_data_transformation(data_validation_artifact, config=TrainingPipelineConfig(), cache=None):
     try:
         data_transformation_config = DataTransformationConfig(config)
         data_transformation = DataTransformation(data_validation_artifact, data_transformation_config)
-        return data_transformation.initiate_data_transformation()
+        if cache is None:
+            return emit_stage_manifest("data_transformation", data_transformation.initiate_data_transformation(),
+                                       config)
+
+        fingerprint = cache.fingerprint(
+            data_transformation_config,
+            inputs=artifact_files(data_validation_artifact)
+                   + ([data_transformation_config.saved_preprocessor_file_path] if config.incremental else []),
+            code=[DataTransformation],
+            extra={"sklearn": sklearn.__version__},
+            root=config.artifact_dir
+        )
+        artifact = cache.run("data_transformation", fingerprint, data_transformation.initiate_data_transformation,
+                             DataTransformationArtifact)
+        return emit_stage_manifest("data_transformation", artifact, config)
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
-def start_model_trainer(data_transformation_artifact, config=TrainingPipelineConfig()):
+def start_model_trainer(data_transformation_artifact, config=TrainingPipelineConfig(), cache=None, tracker=None):
     try:
         model_trainer_config = ModelTrainerConfig(config)
         model_trainer = ModelTrainer(model_trainer_config, data_transformation_artifact)
-        model_trainer_artifact = model_trainer.initiate_model_trainer()
-        
-        # Log metrics to MLflow
-        mlflow.log_metric("train_accuracy", model_trainer_artifact.train_metric_artifact.accuracy)
-        mlflow.log_metric("test_accuracy", model_trainer_artifact.test_metric_artifact.accuracy)
-        mlflow.log_metric("train_f1", model_trainer_artifact.train_metric_artifact.f1Score)
-        mlflow.log_metric("test_f1", model_trainer_artifact.test_metric_artifact.f1Score)
-        mlflow.log_metric("train_precision", model_trainer_artifact.train_metric_artifact.precision)
-        mlflow.log_metric("test_precision", model_trainer_artifact.test_metric_artifact.precision)
-        mlflow.log_metric("train_recall", model_trainer_artifact.train_metric_artifact.recall)
-        mlflow.log_metric("test_recall", model_trainer_artifact.test_metric_artifact.recall)
-        
-        # Log model
-        mlflow.sklearn.log_model(
-            model_trainer_artifact.model, 
-            "model",
-            registered_model_name="NetworkSecurityModel"
-        )
+        if cache is None:
+            model_trainer_artifact = model_trainer.initiate_model_trainer()
+        else:
+            fingerprint = cache.fingerprint(
+                model_trainer_config,
+                inputs=artifact_files(data_transformation_artifact)
+                       + ([model_trainer_config.saved_model_file_path] if config.incremental else []),
+                code=[ModelTrainer, model_selection, compiled_forest, incremental, classification_metric],
+                extra={"sklearn": sklearn.__version__, "xgboost": xgboost.__version__},
+                root=config.artifact_dir
+            )
+            model_trainer_artifact = cache.run("model_trainer", fingerprint, model_trainer.initiate_model_trainer,
+                                               ModelTrainerArtifact)
+        emit_stage_manifest("model_trainer", model_trainer_artifact, config)
         
-        # Save metrics to JSON for DVC
-        os.makedirs("reports", exist_ok=True)
         metrics = {
-            "train_accuracy": float(model_trainer_artifact.train_metric_artifact.accuracy),
-            "test_accuracy": float(model_trainer_artifact.test_metric_artifact.accuracy),
             "train_f1": float(model_trainer_artifact.train_metric_artifact.f1Score),
             "test_f1": float(model_trainer_artifact.test_metric_artifact.f1Score),
-            "train_precision": float(model_trainer_artifact.train_metric_artifact.precision),
-            "test_precision": float(model_trainer_artifact.test_metric_artifact.precision),
-            "train_recall": float(model_trainer_artifact.train_metric_artifact.recall),
-            "test_recall": float(model_trainer_artifact.test_metric_artifact.recall)
+            "train_precision": float(model_trainer_artifact.train_metric_artifact.precisionScore),
+            "test_precision": float(model_trainer_artifact.test_metric_artifact.precisionScore),
+            "train_recall": float(model_trainer_artifact.train_metric_artifact.recallScore),
+            "test_recall": float(model_trainer_artifact.test_metric_artifact.recallScore)
         }
+
+        # Queue metrics and the saved model for the background tracker
+        if tracker is not None:
+            tracker.log_metrics(metrics)
+            tracker.log_model(model_trainer_artifact.trained_model_file_path,
+                              registered_model_name=MLFLOW_REGISTERED_MODEL_NAME)
         
+        # Save metrics to JSON for DVC
+        os.makedirs("reports", exist_ok=True)
         with open("reports/metrics.json", "w") as f:
             json.dump(metrics, f, indent=4)
             
@@ -87,47 +161,125 @@ def start_model_trainer(data_transformation_artifact, config=TrainingPipelineCon
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
-def run_pipeline(stage=None):
+def start_model_publish(data_ingestion_artifact, data_transformation_artifact, model_trainer_artifact,
+                        config=TrainingPipelineConfig()):
+    """
+    Publish the trained model and its preprocessor to the saved model directory,
+    with the watermark that the next incremental run starts after.
+    """
     try:
-        # Initialize MLflow
-        mlflow.set_tracking_uri("https://dagshub.com/austinLorenzMccoy/networkSecurity_project.mlflow")
-        mlflow.set_experiment("network_security_classification")
-        
-        # Initialize DAGsHub logger
-        dagshub_logger(
-            metrics_path="reports/metrics.json",
-            hparams_path="reports/params.json"
+        publish_model(
+            model_trainer_artifact.trained_model_file_path,
+            data_transformation_artifact.transformed_object_file_path,
+            config.saved_model_dir,
+            watermark=data_ingestion_artifact.watermark
         )
-        
-        with mlflow.start_run():
-            # Create pipeline config
-            config = TrainingPipelineConfig()
-            
-            if stage is None or stage == "data_ingestion":
-                data_ingestion_artifact = start_data_ingestion(config)
-                if stage == "data_ingestion":
-                    return
-                
-            if stage is None or stage == "data_validation":
-                data_validation_artifact = start_data_validation(data_ingestion_artifact, config)
-                if stage == "data_validation":
-                    return
-                
-            if stage is None or stage == "data_transformation":
-                data_transformation_artifact = start_data_transformation(data_validation_artifact, config)
-                if stage == "data_transformation":
-                    return
-                
-            if stage is None or stage == "model_trainer":
-                model_trainer_artifact = start_model_trainer(data_transformation_artifact, config)
-                
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)
+
+def profile_stage(stage, func, config=TrainingPipelineConfig()):
+    """
+    Wrap a stage task to record its wall time, CPU time, peak traced memory
+    and hottest functions under `stage` in the run's profile report, also
+    when the stage fails. Stages are profiled one at a time, which holds as
+    long as the pipeline stays a chain.
+    """
+    def run(*artifacts):
+        profile = Profile(config.profile_sample_interval).start()
+        try:
+            return func(*artifacts)
+        finally:
+            profile.lap(stage)
+            report = profile.stop()
+            write_yaml_file(config.profile_report_file_path, {stage: report})
+            total = report["total"]
+            logging.info(f"Profiled {stage}: {total['wall_ms'] / 1e3:.2f} s wall, {total['cpu_ms'] / 1e3:.2f} s CPU, "
+                         f"{total['peak_memory_kb'] / 1024:.1f} MiB peak")
+    return run
+
+def build_pipeline_dag(config=TrainingPipelineConfig(), cache=None, tracker=None, profile=False):
+    """
+    The pipeline as a task graph: every stage is a task that receives the
+    artifacts of the stages it depends on.
+
+    :param profile: profile every stage that runs, see profile_stage
+    """
+    stage = partial(profile_stage, config=config) if profile else lambda name, func: func
+    return (
+        DagExecutor(config.max_workers)
+        .add("data_ingestion", stage("data_ingestion", lambda: start_data_ingestion(config, cache)))
+        .add("data_validation", stage("data_validation",
+                                      lambda ingestion: start_data_validation(ingestion, config, cache)),
+             deps=["data_ingestion"])
+        .add("data_transformation", stage("data_transformation",
+                                          lambda validation: start_data_transformation(validation, config, cache)),
+             deps=["data_validation"])
+        .add("model_trainer", stage("model_trainer",
+                                    lambda transformation: start_model_trainer(transformation, config, cache, tracker)),
+             deps=["data_transformation"])
+        .add("model_publish", stage("model_publish", lambda ingestion, transformation, trainer: start_model_publish(
+                 ingestion, transformation, trainer, config)),
+             deps=["data_ingestion", "data_transformation", "model_trainer"])
+    )
+
+def run_pipeline(stage=None, use_cache=True, incremental=None, profile=False):
+    """
+    Run the whole training pipeline, or a single stage.
+
+    A single stage takes the artifacts of the stages before it from the
+    manifests of their latest run, as when DVC runs each stage in its own
+    process; only upstream stages without a usable manifest run again.
+    Every stage goes through the stage cache, so stages whose inputs,
+    configuration and code are unchanged since an earlier run reuse that
+    run's output.
+
+    :param stage: the only stage to run, all stages by default; model_trainer
+        also publishes the model
+    :param use_cache: False reruns every stage
+    :param incremental: extend the saved model with documents newer than its
+        watermark instead of training on the whole collection; None uses
+        INCREMENTAL_TRAINING
+    :param profile: save the wall time, CPU time and peak memory of every
+        stage that runs to profile_report.yaml in the run's artifact dir
+    """
+    try:
+        config = TrainingPipelineConfig()
+        if incremental is not None:
+            config.incremental = incremental
+        cache = StageCache(config.stage_cache_dir, enabled=use_cache)
+
+        targets = ["model_publish"] if stage in (None, "model_trainer") else [stage]
+        upstream = list(STAGE_ARTIFACTS)[:list(STAGE_ARTIFACTS).index(stage)] if stage is not None else []
+        manifests = {name: load_stage_manifest(name, config) for name in upstream}
+        manifests = {name: artifact for name, artifact in manifests.items() if artifact is not None}
+        if manifests:
+            logging.info(f"Loaded the artifacts of {sorted(manifests)} from {config.manifest_dir}")
+
+        tracker = ExperimentTracker(config.tracking_uri, config.experiment_name, config.tracking_spool_dir)
+        try:
+            with tracker.start_run():
+                tracker.log_params({"stage": stage or "all", "use_cache": use_cache,
+                                    "incremental": config.incremental})
+                build_pipeline_dag(config, cache, tracker, profile).run(targets, results=manifests)
+            if profile:
+                logging.info(f"Stage profiles saved to {config.profile_report_file_path}")
+        finally:
+            # Bounded wait for the upload; what is not sent stays spooled for the next run
+            if not tracker.close(timeout=config.tracking_upload_timeout):
+                logging.info(f"MLflow upload pending in {config.tracking_spool_dir}")
     except Exception as e:
         raise NetworkSecurityException(e, sys)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--stage", type=str, help="Stage of the pipeline to run", 
-                        choices=["data_ingestion", "data_validation", "data_transformation", "model_trainer"])
+    parser.add_argument("--stage", type=str, choices=list(STAGE_ARTIFACTS),
+                        help="Run only this stage, on the artifacts recorded by the latest run of the earlier stages")
+    parser.add_argument("--no-cache", action="store_true", help="Rerun every stage instead of reusing cached outputs")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Add trees trained on documents newer than the saved model instead of retraining")
+    parser.add_argument("--profile", action="store_true",
+                        help="Save per-stage wall time, CPU time and peak memory next to the run's artifacts")
     args = parser.parse_args()
     
-    run_pipeline(args.stage)
+    run_pipeline(args.stage, use_cache=not args.no_cache, incremental=True if args.incremental else None,
+                 profile=args.profile)
@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 
 from dotenv import load_dotenv
 # Load environment variables
@@ -14,57 +13,171 @@ print("MongoDB URI:", uri)
 import certifi #root certificate for http connection and store in ca(certificate authority)
 ca=certifi.where()
 
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
 import pandas as pd
 import numpy as np
 import pymongo
+from pymongo.errors import BulkWriteError
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
 
+# Rows parsed from the CSV at a time
+DEFAULT_CHUNK_SIZE = 50000
+# Documents per unordered insert_many
+DEFAULT_BATCH_SIZE = 1000
+# Concurrent bulk writes over the shared client
+DEFAULT_WORKERS = 4
+
+
+@dataclass
+class LoadStats:
+    inserted: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.inserted + self.failed) / self.seconds if self.seconds else 0.0
+
+
+def dataframe_to_records(df: pd.DataFrame) -> List[Dict]:
+    """Convert rows to BSON-ready documents: native Python values, NaN as None."""
+    columns = [str(column) for column in df.columns]
+    values = []
+    for column in df.columns:
+        series = df[column]
+        if series.hasnans:
+            series = series.astype(object).where(series.notna(), None)
+        # tolist() yields native ints/floats/strings, which BSON can encode
+        values.append(series.tolist())
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
 class NetworkDataExtract():
-    def __init__(self):
+    def __init__(self, max_pool_size: int = DEFAULT_WORKERS):
         try:
-            self.client = pymongo.MongoClient(uri, tlsCAFile=ca)
+            # One pooled client shared by every write
+            self.client = pymongo.MongoClient(uri, tlsCAFile=ca, maxPoolSize=max_pool_size)
             self.db = self.client['network_security']
             self.collection = self.db['network_data']
             logging.info("MongoDB connection established successfully")
         except Exception as e:
             logging.error("Error while connecting to MongoDB")
             raise NetworkSecurityException(e, sys) from e
+
+    def iter_csv_records(self, file_path, chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+        """
+        Stream a CSV as lists of documents, `chunksize` rows at a time.
+        """
+        try:
+            empty = True
+            for chunk in pd.read_csv(file_path, chunksize=chunksize):
+                if chunk.empty:
+                    continue
+                empty = False
+                yield dataframe_to_records(chunk)
+            if empty:
+                raise ValueError("CSV file is empty.")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
         
     def csv_to_json_converter(self, file_path):
         try:
-            df = pd.read_csv(file_path)
-            if df.empty:
-                raise ValueError("CSV file is empty.")
-            df.reset_index(drop=True, inplace=True)
-            records = list(json.loads(df.T.to_json()).values())
-            return records
+            return [record for records in self.iter_csv_records(file_path) for record in records]
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
+    def _insert_batch(self, collection, records) -> LoadStats:
+        try:
+            result = collection.insert_many(records, ordered=False)
+            return LoadStats(inserted=len(result.inserted_ids))
+        except BulkWriteError as e:
+            # Unordered writes keep going past failed documents
+            inserted = e.details.get("nInserted", 0)
+            logging.warning(f"{len(e.details.get('writeErrors', []))} documents failed to insert")
+            return LoadStats(inserted=inserted, failed=len(records) - inserted)
         
     def insert_data_mongodb(self, records, database, collection):
         try:
-            # Initialize MongoDB client and access specified database and collection
-            mongo_client = pymongo.MongoClient(uri, tlsCAFile=ca)
-            db = mongo_client[database]
-            collection = db[collection]
-            
-            # Insert records into the collection
-            collection.insert_many(records)
-            return len(records)
+            stats = self._insert_batch(self.client[database][collection], records)
+            return stats.inserted
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)
+
+    def load_csv(self, file_path, database, collection, chunksize: int = DEFAULT_CHUNK_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE, workers: int = DEFAULT_WORKERS,
+                 progress_every: Optional[float] = 5.0) -> LoadStats:
+        """
+        Stream a CSV into MongoDB with concurrent unordered bulk writes.
+
+        The CSV is parsed `chunksize` rows at a time and split into batches of
+        `batch_size` documents, written by `workers` threads over the shared
+        client. At most two batches per worker are pending, so memory stays
+        bounded by the chunk being parsed plus those batches.
+
+        :param file_path: CSV file
+        :param database: target database
+        :param collection: target collection
+        :param chunksize: rows parsed from the CSV at a time
+        :param batch_size: documents per bulk write
+        :param workers: concurrent bulk writes
+        :param progress_every: seconds between progress log lines, None disables them
+        :return: LoadStats with inserted and failed counts and the elapsed time
+        """
+        try:
+            target = self.client[database][collection]
+            stats = LoadStats()
+            start = last_report = time.perf_counter()
+            pending = set()
+
+            def collect(done):
+                for future in done:
+                    result = future.result()
+                    stats.inserted += result.inserted
+                    stats.failed += result.failed
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for records in self.iter_csv_records(file_path, chunksize):
+                    for i in range(0, len(records), batch_size):
+                        if len(pending) >= 2 * workers:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            collect(done)
+                        pending.add(executor.submit(self._insert_batch, target, records[i:i + batch_size]))
+
+                    now = time.perf_counter()
+                    if progress_every is not None and now - last_report >= progress_every:
+                        stats.seconds = now - start
+                        logging.info(f"Loaded {stats.inserted} documents ({stats.rows_per_second:,.0f} rows/s)")
+                        last_report = now
+
+                done, pending = wait(pending)
+                collect(done)
+
+            stats.seconds = time.perf_counter() - start
+            logging.info(f"Loaded {stats.inserted} documents into {database}.{collection} in "
+                         f"{stats.seconds:.1f}s ({stats.rows_per_second:,.0f} rows/s), {stats.failed} failed")
+            return stats
         except Exception as e:
             raise NetworkSecurityException(e, sys)
 
         
 if __name__ == "__main__":
-    file_path = "Network_Data/cyber_threat_intelligence_train.csv"
-    database = "AUSTINAI"
-    collection = "network_data"
-
-    network_data_extract = NetworkDataExtract()
-    records = network_data_extract.csv_to_json_converter(file_path)
-    num_records = network_data_extract.insert_data_mongodb(records, database, collection)
-    print(f"Inserted {num_records} records into MongoDB")
+    parser = argparse.ArgumentParser(description="Load a CSV file into MongoDB")
+    parser.add_argument("--file", default="Network_Data/cyber_threat_intelligence_train.csv")
+    parser.add_argument("--database", default="AUSTINAI")
+    parser.add_argument("--collection", default="network_data")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
 
-        
\ No newline at end of file
+    network_data_extract = NetworkDataExtract(max_pool_size=args.workers)
+    stats = network_data_extract.load_csv(args.file, args.database, args.collection, chunksize=args.chunksize,
+                                          batch_size=args.batch_size, workers=args.workers)
+    print(f"Inserted {stats.inserted} records into MongoDB in {stats.seconds:.1f}s "
+          f"({stats.rows_per_second:,.0f} rows/s, {stats.failed} failed)")
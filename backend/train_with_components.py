@@ -9,8 +9,6 @@ import json
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
-import mlflow
-import mlflow.sklearn
 from dotenv import load_dotenv
 
 # Add compatibility patch for Python 3.12
@@ -35,7 +33,11 @@ from networksecurity.components.data_transformation import DataTransformation
 from custom_model_trainer import CustomModelTrainer
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
-from networksecurity.utils.main_utils import save_numpy_array_data, save_object
+from networksecurity.constants.Training_pipeline import MLFLOW_REGISTERED_MODEL_NAME
+from networksecurity.utils.main_utils import load_object, save_numpy_array_data, save_object
+from networksecurity.utils.ml_utils.tracking import ExperimentTracker
+from networksecurity.utils.ml_utils.feature.text_featurizer import featurize_texts, TEXT_FEATURE_NAMES
+from networksecurity.utils.ml_utils.feature.cti_corpus import iter_corpus_chunks, sample_balanced_corpus
 
 # Load environment variables
 load_dotenv()
@@ -53,77 +55,24 @@ def preprocess_cyber_threat_data():
         os.makedirs("artifact/direct_training/model", exist_ok=True)
         os.makedirs("reports", exist_ok=True)
         
-        # Load the dataset
-        data_path = "Network_Data/cyber_threat_intelligence_train.csv"
-        df = pd.read_csv(data_path)
-        
-        print(f"Dataset loaded with {len(df)} rows")
-        
-        # Create a more balanced dataset with simpler features
-        processed_data = []
-        malware_count = 0
-        non_malware_count = 0
+        # Stream the corpus in bounded-memory chunks and keep a class-balanced sample
+        data_paths = os.path.join("Network_Data", "*.csv")
         max_per_class = 1000  # Limit to balance classes
+        corpus = sample_balanced_corpus(
+            iter_corpus_chunks(data_paths),
+            max_per_class=max_per_class,
+            positive_label="malware"
+        )
+        selected_texts = corpus["text"].tolist()
+        selected_labels = corpus["label"].to_numpy()
+        
+        print(f"Selected {int(selected_labels.sum())} malware and {int((selected_labels == 0).sum())} other rows")
         
-        # Process rows and create features
-        for _, row in df.iterrows():
-            text = row['text']
-            entities_str = row['entities']
-            
-            # Check if entities contain 'malware' label
-            has_malware = False
-            try:
-                if isinstance(entities_str, str):
-                    entities = eval(entities_str)
-                    for entity in entities:
-                        if entity.get('label') == 'malware':
-                            has_malware = True
-                            break
-            except:
-                # Skip rows with parsing errors
-                continue
-            
-            # Balance the dataset
-            if has_malware and malware_count >= max_per_class:
-                continue
-            if not has_malware and non_malware_count >= max_per_class:
-                continue
-            
-            if has_malware:
-                malware_count += 1
-            else:
-                non_malware_count += 1
-            
-            # Create simple, predictive features
-            text_lower = text.lower()
-            
-            # Create a balanced feature set
-            features = {
-                # Text length (normalized)
-                'text_length': min(len(text) / 5000.0, 1.0),
-                
-                # Word count (normalized)
-                'word_count': min(len(text.split()) / 500.0, 1.0),
-                
-                # Keyword-based features (with correlation to malware but not perfect)
-                'contains_malware_word': 0.7 if 'malware' in text_lower else 0.0,
-                'contains_trojan': 0.6 if 'trojan' in text_lower else 0.0,
-                'contains_virus': 0.6 if 'virus' in text_lower else 0.0,
-                'contains_ransomware': 0.8 if 'ransomware' in text_lower else 0.0,
-                'contains_attack': 0.4 if 'attack' in text_lower else 0.0,
-                'contains_threat': 0.3 if 'threat' in text_lower else 0.0,
-                'contains_vulnerability': 0.5 if 'vulnerability' in text_lower else 0.0,
-                'contains_exploit': 0.5 if 'exploit' in text_lower else 0.0,
-                'contains_security': 0.2 if 'security' in text_lower else 0.0,
-                
-                # Target variable (binary classification)
-                'Result': 1 if has_malware else 0
-            }
-            
-            processed_data.append(features)
+        # Featurize all selected rows in one batch with the featurizer shared with the API
+        processed_df = pd.DataFrame(featurize_texts(selected_texts), columns=TEXT_FEATURE_NAMES)
         
-        # Convert to DataFrame
-        processed_df = pd.DataFrame(processed_data)
+        # Target variable (binary classification)
+        processed_df['Result'] = selected_labels
         print(f"Processed {len(processed_df)} valid rows")
         
         # Split into train and test sets
@@ -175,8 +124,8 @@ def train_model():
         data_transformation_config = DataTransformationConfig(training_pipeline_config)
         
         # Override paths to use direct_training directory
-        data_transformation_config.transformed_train_file_path = os.path.join("artifact", "direct_training", "transformation", "train.npz")
-        data_transformation_config.transformed_test_file_path = os.path.join("artifact", "direct_training", "transformation", "test.npz")
+        data_transformation_config.transformed_train_file_path = os.path.join("artifact", "direct_training", "transformation", "train.npy")
+        data_transformation_config.transformed_test_file_path = os.path.join("artifact", "direct_training", "transformation", "test.npy")
         data_transformation_config.transformed_object_file_path = os.path.join("artifact", "direct_training", "transformation", "preprocessor.pkl")
         
         data_transformation = DataTransformation(
@@ -205,74 +154,47 @@ def train_model():
         model_trainer_artifact = model_trainer.initiate_model_trainer()
         print("Model training completed successfully!")
         
-        # Step 5: Log metrics and model
-        # Try to use MLflow if available
-        use_mlflow = True
-        try:
-            # Set DAGsHub credentials directly
-            os.environ["MLFLOW_TRACKING_USERNAME"] = "austinLorenzMccoy"
-            os.environ["MLFLOW_TRACKING_PASSWORD"] = "1d06b3f1dc94bb2bb3ed0960c7d406847b9d362d"
-            
-            # Set MLflow tracking URI
-            mlflow_tracking_uri = "https://dagshub.com/austinLorenzMccoy/networkSecurity_project.mlflow"
-                
-            print(f"Setting MLflow tracking URI: {mlflow_tracking_uri}")
-            mlflow.set_tracking_uri(mlflow_tracking_uri)
-            mlflow.set_experiment("network-security-classification")
-            
-            # Import the load_numpy_array_data function in this scope
-            from networksecurity.utils.main_utils import load_numpy_array_data
-            
-            # Start a new MLflow run
-            with mlflow.start_run():
-                # Log parameters
-                mlflow.log_param("model_type", "RandomForest")
-                mlflow.log_param("n_estimators", 100)
-                mlflow.log_param("data_source", "cyber_threat_intelligence_train.csv")
-                
-                # Log metrics
-                mlflow.log_metric("train_f1", model_trainer_artifact.train_metric_artifact.f1Score)
-                mlflow.log_metric("test_f1", model_trainer_artifact.test_metric_artifact.f1Score)
-                mlflow.log_metric("train_precision", model_trainer_artifact.train_metric_artifact.precisionScore)
-                mlflow.log_metric("test_precision", model_trainer_artifact.test_metric_artifact.precisionScore)
-                mlflow.log_metric("train_recall", model_trainer_artifact.train_metric_artifact.recallScore)
-                mlflow.log_metric("test_recall", model_trainer_artifact.test_metric_artifact.recallScore)
-                
-                # Log model
-                # Get the training data
-                train_arr = load_numpy_array_data(
-                    data_transformation_artifact.transformed_train_file_path
-                )
-                x_train, y_train = train_arr[:, :-1], train_arr[:, -1]
-                
-                # Train a new model for MLflow logging
-                trained_model = model_trainer.train_model(x_train, y_train)
-                
-                mlflow.sklearn.log_model(
-                    sk_model=trained_model,
-                    artifact_path="model",
-                    registered_model_name="NetworkSecurityModel"
-                )
-                
-                # Log feature importance if available
-                if hasattr(trained_model, 'feature_importances_'):
-                    feature_importance = pd.DataFrame({
-                        'feature': ['text_length', 'word_count', 'contains_malware_word', 'contains_trojan',
-                                    'contains_virus', 'contains_ransomware', 'contains_attack',
-                                    'contains_threat', 'contains_vulnerability', 'contains_exploit', 'contains_security'],
-                        'importance': trained_model.feature_importances_
-                    })
-                    
-                    # Save feature importance to CSV and log as artifact
-                    feature_importance.to_csv("feature_importance.csv", index=False)
-                    mlflow.log_artifact("feature_importance.csv")
-                
-                print("Model and metrics logged to MLflow successfully!")
-        
-        except Exception as mlflow_error:
-            use_mlflow = False
-            print(f"Warning: MLflow initialization failed: {mlflow_error}")
-            print("Continuing without MLflow tracking...")
+        # Step 5: Log metrics and the trained model in the background. The run is
+        # spooled locally, so training never waits on the tracking server and the
+        # model already saved by the trainer is logged instead of being refitted.
+        tracker = ExperimentTracker(
+            tracking_uri=training_pipeline_config.tracking_uri,
+            experiment_name="network-security-classification",
+            spool_dir=training_pipeline_config.tracking_spool_dir
+        )
+        with tracker.start_run():
+            tracker.log_params({
+                "model_type": "RandomForest",
+                "n_estimators": 100,
+                "data_source": "Network_Data/*.csv"
+            })
+            tracker.log_metrics({
+                "train_f1": model_trainer_artifact.train_metric_artifact.f1Score,
+                "test_f1": model_trainer_artifact.test_metric_artifact.f1Score,
+                "train_precision": model_trainer_artifact.train_metric_artifact.precisionScore,
+                "test_precision": model_trainer_artifact.test_metric_artifact.precisionScore,
+                "train_recall": model_trainer_artifact.train_metric_artifact.recallScore,
+                "test_recall": model_trainer_artifact.test_metric_artifact.recallScore
+            })
+            tracker.log_model(
+                model_trainer_artifact.trained_model_file_path,
+                registered_model_name=MLFLOW_REGISTERED_MODEL_NAME
+            )
+
+            # Log feature importance if available
+            trained_model = load_object(model_trainer_artifact.trained_model_file_path)
+            if hasattr(trained_model, 'feature_importances_'):
+                feature_importance = pd.DataFrame({
+                    'feature': TEXT_FEATURE_NAMES,
+                    'importance': trained_model.feature_importances_
+                })
+                feature_importance.to_csv("feature_importance.csv", index=False)
+                tracker.log_artifact("feature_importance.csv")
+
+        if tracker.close(timeout=training_pipeline_config.tracking_upload_timeout):
+            print("Model and metrics logged to MLflow successfully!")
+        else:
+            print(f"MLflow upload pending, the run stays in {tracker.spool_dir} until the next training run")
         
         # Save metrics to JSON for DVC
         metrics = {
@@ -9,6 +9,9 @@ from .utils import (
     load_object,
     evaluate_models
 )
+from .stage_cache import StageCache, read_manifest, write_manifest
+from .dag_executor import DagExecutor
+from .profiling import Profile, SamplingProfiler
 
 __all__ = [
     "read_yaml_file",
@@ -17,5 +20,11 @@ __all__ = [
     "load_numpy_array_data",
     "save_object",
     "load_object",
-    "evaluate_models"
+    "evaluate_models",
+    "StageCache",
+    "read_manifest",
+    "write_manifest",
+    "DagExecutor",
+    "Profile",
+    "SamplingProfiler"
 ]
\ No newline at end of file
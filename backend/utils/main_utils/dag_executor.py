@@ -0,0 +1,92 @@
+## NETWORKSECURITY/networksecurity/utils/main_utils/dag_executor.py
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+
+class DagExecutor:
+    """
+    Run named tasks on a thread pool as soon as the tasks they depend on are done.
+
+    Each task is called with the results of its dependencies, in the order
+    they were declared, so independent tasks (e.g. the train and the test
+    half of a stage) run concurrently while dependent ones wait. NumPy,
+    pandas, Arrow and scikit-learn release the GIL in their heavy loops, so
+    threads overlap real work, not just I/O.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        :param max_workers: worker threads, None for the ThreadPoolExecutor default
+        """
+        self.max_workers = max_workers
+        self._tasks: Dict[str, Tuple[Callable[..., Any], Tuple[str, ...]]] = {}
+
+    def add(self, name: str, func: Callable[..., Any], deps: Sequence[str] = ()) -> "DagExecutor":
+        """
+        Declare a task.
+
+        :param name: unique task name
+        :param func: called as func(*results of deps)
+        :param deps: names of the tasks whose results `func` receives
+        """
+        if name in self._tasks:
+            raise ValueError(f"Task {name} is declared twice")
+        self._tasks[name] = (func, tuple(deps))
+        return self
+
+    def _required(self, targets: Iterable[str], done: Set[str]) -> Set[str]:
+        # Tasks the targets need, stopping at results that are already known
+        required: Set[str] = set()
+        visiting: Set[str] = set()
+
+        def visit(name: str):
+            if name in required or name in done:
+                return
+            if name not in self._tasks:
+                raise ValueError(f"Unknown task {name}")
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through {name}")
+            visiting.add(name)
+            for dep in self._tasks[name][1]:
+                visit(dep)
+            visiting.discard(name)
+            required.add(name)
+
+        for target in targets:
+            visit(target)
+        return required
+
+    def run(self, targets: Optional[Iterable[str]] = None,
+            results: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run the targets and everything they depend on.
+
+        :param targets: tasks to run, all declared tasks by default
+        :param results: results known in advance, e.g. loaded from a manifest;
+            these tasks are not run and their dependencies are not required
+        :return: results of every task that ran or was given
+        :raises: the exception of the first failing task; tasks not yet started are cancelled
+        """
+        results = dict(results or {})
+        pending = self._required(self._tasks if targets is None else targets, set(results))
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name in sorted(pending):
+                    func, deps = self._tasks[name]
+                    if all(dep in results for dep in deps):
+                        pending.discard(name)
+                        running[pool.submit(func, *(results[dep] for dep in deps))] = name
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        for other in running:
+                            other.cancel()
+                        raise error
+                    results[name] = future.result()
+        return results
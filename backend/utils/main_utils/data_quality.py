@@ -0,0 +1,230 @@
+## NETWORKSECURITY/networksecurity/utils/main_utils/data_quality.py
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from networksecurity.utils.main_utils.feature_store import iter_table_chunks
+
+# Rows read per chunk when validating a file
+DEFAULT_CHUNK_SIZE = 50000
+# Failing rows kept per column in the report
+DEFAULT_FAILURE_SAMPLES = 5
+# Schema dtypes matched by any pandas string column
+_STRING_DTYPES = ("object", "string", "str")
+
+
+@dataclass
+class ColumnRule:
+    """Checks declared for one column of data_schema/schema.yaml."""
+    dtype: str
+    min: Optional[float] = None
+    max: Optional[float] = None
+    allowed: Optional[List[Any]] = None
+    max_null_ratio: Optional[float] = None
+
+
+def schema_rules(schema_config: Mapping[str, Any]) -> Dict[str, ColumnRule]:
+    """
+    Column rules from a parsed schema.yaml.
+
+    `columns` gives the dtypes. The optional `quality` section adds
+    `ranges` ({column: [min, max]}), `allowed_values` ({column: [values]}) and
+    `max_null_ratio`, either one number for every column or {column: ratio}.
+    `column_max_null_ratio` ({column: ratio}) overrides a single number for
+    some columns, e.g. 0 for the target.
+
+    :param schema_config: parsed schema.yaml
+    :return: {column name: ColumnRule}, in schema order
+    """
+    quality = schema_config.get("quality") or {}
+    ranges = quality.get("ranges") or {}
+    allowed = quality.get("allowed_values") or {}
+    null_ratios = quality.get("max_null_ratio")
+    null_overrides = quality.get("column_max_null_ratio") or {}
+
+    columns = schema_config["columns"]
+    unknown = (set(ranges) | set(allowed) | set(null_overrides)
+               | set(null_ratios if isinstance(null_ratios, Mapping) else ())) - set(columns)
+    if unknown:
+        raise ValueError(f"Quality rules for columns missing from the schema: {sorted(unknown)}")
+
+    rules = {}
+    for name, dtype in columns.items():
+        low, high = ranges.get(name, (None, None))
+        rules[name] = ColumnRule(
+            dtype=str(dtype),
+            min=low,
+            max=high,
+            allowed=allowed.get(name),
+            max_null_ratio=null_overrides.get(
+                name, null_ratios.get(name) if isinstance(null_ratios, Mapping) else null_ratios)
+        )
+    return rules
+
+
+@dataclass
+class _ColumnState:
+    # Running totals of one column across chunks
+    dtypes: Set[str] = field(default_factory=set)
+    dtype_match: bool = True
+    null_count: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    range_violations: int = 0
+    category_violations: int = 0
+    failures: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _python_value(value: Any) -> Any:
+    # numpy scalars -> plain values the YAML report can hold
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class DataQualityValidator:
+    """
+    Validate a table one chunk at a time against the schema rules.
+
+    Every chunk is checked with column-wise array operations and only running
+    totals and a bounded sample of failing rows are kept, so memory does not
+    grow with the table. `report()` returns the checks merged over all chunks.
+    """
+
+    def __init__(self, schema_config: Mapping[str, Any], failure_samples: int = DEFAULT_FAILURE_SAMPLES):
+        self.rules = schema_rules(schema_config)
+        self.failure_samples = failure_samples
+        self.rows = 0
+        self.missing_columns: Set[str] = set()
+        self.extra_columns: Set[str] = set()
+        self._state = {name: _ColumnState() for name in self.rules}
+
+    def update(self, chunk: pd.DataFrame):
+        """
+        Check the next chunk of the table.
+
+        :param chunk: rows following those of the previous chunks
+        """
+        offset = self.rows
+        self.rows += len(chunk)
+        present = set(chunk.columns)
+        self.missing_columns |= set(self.rules) - present
+        self.extra_columns |= present - set(self.rules)
+        for name, rule in self.rules.items():
+            if name in present:
+                self._check_column(chunk[name], rule, self._state[name], offset)
+
+    def _record(self, state: _ColumnState, mask: np.ndarray, values: np.ndarray, offset: int, check: str):
+        # Keep the first failing rows of the column, up to failure_samples
+        room = self.failure_samples - len(state.failures)
+        if room <= 0:
+            return
+        for i in np.flatnonzero(mask)[:room]:
+            state.failures.append({"row": offset + int(i), "check": check, "value": _python_value(values[i])})
+
+    def _check_column(self, column: pd.Series, rule: ColumnRule, state: _ColumnState, offset: int):
+        raw = column.to_numpy()
+        null = column.isna().to_numpy()
+        state.null_count += int(null.sum())
+        state.dtypes.add(str(column.dtype))
+
+        integer_rule = rule.dtype.startswith(("int", "uint"))
+        numeric = column
+        string_match = rule.dtype in _STRING_DTYPES and pd.api.types.is_string_dtype(column.dtype)
+        if str(column.dtype) != rule.dtype and not string_match:
+            if integer_rule or rule.dtype.startswith("float"):
+                numeric = pd.to_numeric(column, errors="coerce") if column.dtype.kind not in "iuf" else column
+                values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+                bad = ~null & np.isnan(values)
+                if integer_rule:
+                    # Integer columns with nulls are read back as floats
+                    with np.errstate(invalid="ignore"):
+                        bad |= ~null & ~np.isnan(values) & (np.mod(values, 1) != 0)
+                if bad.any() or column.dtype.kind not in "iuf":
+                    state.dtype_match = False
+                    self._record(state, bad, raw, offset, "dtype")
+            else:
+                state.dtype_match = False
+
+        if numeric.dtype.kind in "iuf":
+            values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+            finite = ~np.isnan(values)
+            if finite.any():
+                low, high = values[finite].min(), values[finite].max()
+                state.min = float(low) if state.min is None else min(state.min, float(low))
+                state.max = float(high) if state.max is None else max(state.max, float(high))
+            if rule.min is not None or rule.max is not None:
+                outside = np.zeros(len(values), dtype=bool)
+                if rule.min is not None:
+                    outside |= finite & (values < rule.min)
+                if rule.max is not None:
+                    outside |= finite & (values > rule.max)
+                state.range_violations += int(outside.sum())
+                self._record(state, outside, raw, offset, "range")
+
+        if rule.allowed is not None:
+            unexpected = ~null & ~column.isin(rule.allowed).to_numpy()
+            state.category_violations += int(unexpected.sum())
+            self._record(state, unexpected, raw, offset, "allowed_values")
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Merged report of every chunk seen so far.
+
+        The top-level `columns_match`, `missing_columns`, `extra_columns` and
+        `dtype_match` keys keep the layout of the former schema report.
+        """
+        columns = {}
+        for name, rule in self.rules.items():
+            if name in self.missing_columns:
+                continue
+            state = self._state[name]
+            null_ratio = state.null_count / self.rows if self.rows else 0.0
+            entry = {
+                "dtype": rule.dtype,
+                "observed_dtypes": sorted(state.dtypes),
+                "dtype_match": state.dtype_match,
+                "null_count": state.null_count,
+                "null_ratio": null_ratio,
+            }
+            valid = state.dtype_match
+            if rule.max_null_ratio is not None:
+                valid &= null_ratio <= rule.max_null_ratio
+            if state.min is not None:
+                entry["min"], entry["max"] = state.min, state.max
+            if rule.min is not None or rule.max is not None:
+                entry["range_violations"] = state.range_violations
+                valid &= state.range_violations == 0
+            if rule.allowed is not None:
+                entry["category_violations"] = state.category_violations
+                valid &= state.category_violations == 0
+            entry["valid"] = bool(valid)
+            if state.failures:
+                entry["failures"] = list(state.failures)
+            columns[name] = entry
+
+        columns_match = not (self.missing_columns or self.extra_columns)
+        return {
+            "valid": columns_match and all(entry["valid"] for entry in columns.values()),
+            "rows": self.rows,
+            "columns_match": columns_match,
+            "missing_columns": sorted(self.missing_columns),
+            "extra_columns": sorted(self.extra_columns),
+            "dtype_match": all(entry["dtype_match"] for entry in columns.values()),
+            "columns": columns,
+        }
+
+
+def validate_table(file_path: str, schema_config: Mapping[str, Any], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   failure_samples: int = DEFAULT_FAILURE_SAMPLES) -> Dict[str, Any]:
+    """
+    Validate a Parquet, Feather or CSV file in chunks of `chunk_size` rows.
+
+    :param file_path: table to validate
+    :param schema_config: parsed schema.yaml
+    :return: report of `DataQualityValidator.report`
+    """
+    validator = DataQualityValidator(schema_config, failure_samples=failure_samples)
+    for chunk in iter_table_chunks(file_path, chunk_size):
+        validator.update(chunk)
+    return validator.report()
@@ -0,0 +1,187 @@
+## NETWORKSECURITY/networksecurity/utils/main_utils/feature_store.py
+
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+# schema.yaml dtype names -> Arrow types; Arrow integer columns keep nulls
+_ARROW_TYPES = {
+    "int64": pa.int64(),
+    "int32": pa.int32(),
+    "float64": pa.float64(),
+    "float32": pa.float32(),
+    "bool": pa.bool_(),
+    "object": pa.string(),
+    "string": pa.string(),
+}
+
+
+def arrow_schema(columns: Mapping[str, str]) -> pa.Schema:
+    """
+    Arrow schema for the `columns` mapping of data_schema/schema.yaml.
+
+    :param columns: {column name: pandas dtype name}
+    """
+    try:
+        return pa.schema([(name, _ARROW_TYPES[str(dtype)]) for name, dtype in columns.items()])
+    except KeyError as e:
+        raise ValueError(f"Unsupported schema dtype {e}") from None
+
+
+def documents_to_table(documents: List[Dict[str, Any]], schema: pa.Schema) -> pa.Table:
+    """
+    Convert a batch of MongoDB documents to an Arrow table with a fixed schema.
+
+    Empty strings become nulls, and columns missing from every document are
+    all-null, so every batch of a collection yields the same schema.
+    """
+    df = pd.DataFrame.from_records(documents, columns=schema.names)
+    df = df.replace("", np.nan)
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+class ParquetShardWriter:
+    """
+    Append Arrow tables to one Parquet file, one row group per table.
+
+    The file is written under a temporary name and renamed on `close()`, so
+    readers never see a partial feature store.
+    """
+
+    def __init__(self, file_path: str, schema: pa.Schema, compression: str = "snappy"):
+        self.file_path = file_path
+        self._tmp_path = f"{file_path}.tmp"
+        self._writer = pq.ParquetWriter(self._tmp_path, schema, compression=compression)
+        self.num_rows = 0
+
+    def write(self, table: pa.Table):
+        self._writer.write_table(table, row_group_size=max(table.num_rows, 1))
+        self.num_rows += table.num_rows
+
+    def close(self):
+        self._writer.close()
+        os.replace(self._tmp_path, self.file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._writer.close()
+            os.remove(self._tmp_path)
+
+
+def iter_parquet_tables(file_path: str, columns: Optional[Sequence[str]] = None) -> Iterator[pa.Table]:
+    """Read a Parquet file one row group at a time, as Arrow tables."""
+    parquet_file = pq.ParquetFile(file_path)
+    for i in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(i, columns=columns)
+
+
+def iter_parquet_batches(file_path: str, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read a Parquet file one row group at a time.
+
+    :param file_path: Parquet file
+    :param columns: subset of columns to read
+    :return: iterator of DataFrames, one per row group
+    """
+    for table in iter_parquet_tables(file_path, columns):
+        yield table.to_pandas()
+
+
+def parquet_num_rows(file_path: str) -> int:
+    """Row count from the Parquet footer, without reading any data."""
+    return pq.ParquetFile(file_path).metadata.num_rows
+
+
+def read_table(file_path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read an intermediate table, choosing the reader from the file extension.
+
+    Parquet and Feather files keep the types they were written with; any
+    other extension is parsed as CSV.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".parquet":
+        return pd.read_parquet(file_path, columns=columns)
+    if extension == ".feather":
+        return pd.read_feather(file_path, columns=columns)
+    return pd.read_csv(file_path, usecols=columns)
+
+
+def iter_table_chunks(file_path: str, chunk_size: int, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read an intermediate table at most `chunk_size` rows at a time.
+
+    The reader is chosen from the extension like `read_table`. Feather files
+    are memory-mapped. An empty table still yields one empty chunk, so its
+    columns can be checked.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".parquet":
+        parquet_file = pq.ParquetFile(file_path)
+        if parquet_file.metadata.num_rows == 0:
+            table = parquet_file.schema_arrow.empty_table()
+            yield (table.select(columns) if columns is not None else table).to_pandas()
+            return
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    elif extension == ".feather":
+        with pa.memory_map(file_path) as source:
+            reader = pa.ipc.open_file(source)
+            empty = True
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for offset in range(0, batch.num_rows, chunk_size):
+                    empty = False
+                    yield batch.slice(offset, chunk_size).to_pandas()
+            if empty:
+                table = reader.schema.empty_table()
+                yield (table.select(columns) if columns is not None else table).to_pandas()
+    else:
+        empty = True
+        for chunk in pd.read_csv(file_path, usecols=columns, chunksize=chunk_size):
+            empty = False
+            yield chunk
+        if empty:
+            yield pd.read_csv(file_path, usecols=columns, nrows=0)
+
+
+def sample_table(file_path: str, max_rows: Optional[int], chunk_size: int,
+                 columns: Optional[Sequence[str]] = None, random_state: int = 42) -> pd.DataFrame:
+    """
+    Uniform random sample of at most `max_rows` rows of a table, read in chunks.
+
+    Every row gets a random key and the rows with the `max_rows` smallest
+    keys are kept (bottom-k sampling), so memory is bounded by
+    `max_rows + chunk_size` rows whatever the table's size. Sampled rows keep
+    their file order.
+
+    :param max_rows: rows to keep, None reads the whole table
+    :param chunk_size: rows read at a time
+    """
+    if max_rows is None:
+        return read_table(file_path, columns)
+    rng = np.random.default_rng(random_state)
+    sample, keys = None, None
+    offset = 0
+    for chunk in iter_table_chunks(file_path, chunk_size, columns):
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        chunk_keys = rng.random(len(chunk))
+        if sample is None:
+            sample, keys = chunk, chunk_keys
+        else:
+            sample, keys = pd.concat([sample, chunk]), np.concatenate([keys, chunk_keys])
+        if len(sample) > max_rows:
+            keep = np.sort(np.argpartition(keys, max_rows - 1)[:max_rows])
+            sample, keys = sample.iloc[keep], keys[keep]
+    return sample.reset_index(drop=True)
@@ -0,0 +1,149 @@
+## NETWORKSECURITY/networksecurity/utils/main_utils/profiling.py
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Functions a thread sits in while it waits for work; their samples are dropped
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the Python stacks of every thread.
+
+    A background thread records the stack of each busy thread every
+    `interval` seconds; threads waiting for work are skipped. The cost is
+    paid by the sampler thread only, so profiled code runs at close to full
+    speed, and the counts approximate where time went across all threads.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples = 0
+        self._self: Counter = Counter()
+        self._cumulative: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                    continue
+                self.samples += 1
+                seen = set()
+                leaf = True
+                while frame is not None:
+                    code = frame.f_code
+                    key = (code.co_filename, code.co_firstlineno, code.co_name)
+                    if leaf:
+                        self._self[key] += 1
+                        leaf = False
+                    if key not in seen:
+                        seen.add(key)
+                        self._cumulative[key] += 1
+                    frame = frame.f_back
+
+    def top(self, limit: int = 25) -> List[Dict[str, Any]]:
+        """
+        Functions with the most samples anywhere on the stack.
+
+        :return: [{"function", "self", "cumulative"}], "self" counting samples
+            where the function itself was running
+        """
+        return [{
+            "function": f"{name} ({filename}:{line})",
+            "self": self._self[(filename, line, name)],
+            "cumulative": count
+        } for (filename, line, name), count in self._cumulative.most_common(limit)]
+
+
+class Profile:
+    """
+    Wall time, CPU time and peak traced memory of consecutive stages.
+
+    `lap(stage)` closes the stage that ran since the previous lap. CPU time
+    is the process CPU time, so it includes work done by worker threads.
+    Peak memory is the highest memory traced by tracemalloc during the
+    stage, which starts tracing when the profile starts unless it is
+    already running. Tracing is process-wide: profile one thing at a time.
+    """
+
+    def __init__(self, sample_interval: Optional[float] = 0.001, top_functions: int = 25):
+        """
+        :param sample_interval: seconds between stack samples, None disables sampling
+        :param top_functions: functions listed in the report
+        """
+        self.sample_interval = sample_interval
+        self.top_functions = top_functions
+        self.stages: List[Dict[str, Any]] = []
+        self._sampler = SamplingProfiler(sample_interval) if sample_interval else None
+        self._started_tracing = False
+        self._start: Optional[Tuple[float, float]] = None
+        self._last: Optional[Tuple[float, float]] = None
+
+    def start(self) -> "Profile":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        if self._sampler is not None:
+            self._sampler.start()
+        self._start = self._last = (time.perf_counter(), time.process_time())
+        return self
+
+    def lap(self, stage: str):
+        wall, cpu = time.perf_counter(), time.process_time()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.stages.append({
+            "stage": stage,
+            "wall_ms": (wall - self._last[0]) * 1e3,
+            "cpu_ms": (cpu - self._last[1]) * 1e3,
+            "peak_memory_kb": peak / 1024
+        })
+        self._last = (wall, cpu)
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop sampling and tracing and return the report."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self._started_tracing:
+            tracemalloc.stop()
+        report = {
+            "stages": self.stages,
+            "total": {
+                "wall_ms": (wall - self._start[0]) * 1e3,
+                "cpu_ms": (cpu - self._start[1]) * 1e3,
+                "peak_memory_kb": max((stage["peak_memory_kb"] for stage in self.stages), default=0.0)
+            }
+        }
+        if self._sampler is not None:
+            report["sample_interval_ms"] = self.sample_interval * 1e3
+            report["samples"] = self._sampler.samples
+            report["top_functions"] = self._sampler.top(self.top_functions)
+        return report
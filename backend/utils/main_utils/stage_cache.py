@@ -0,0 +1,206 @@
+## NETWORKSECURITY/networksecurity/utils/main_utils/stage_cache.py
+
+import dataclasses
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+import typing
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, TypeVar
+
+logger = logging.getLogger("networksecurity")
+
+T = TypeVar("T")
+
+# Bytes read at a time when hashing files
+_READ_BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path: str) -> str:
+    """
+    SHA-256 of a file's content, or of every file below a directory.
+
+    :param path: file or directory
+    :return: hex digest, "missing" when the path does not exist
+    """
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                digest.update(file_digest(file_path).encode())
+        return digest.hexdigest()
+    if not os.path.exists(path):
+        return "missing"
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_READ_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def artifact_files(artifact: Any) -> List[str]:
+    """Existing files and directories referenced by the string fields of an artifact dataclass."""
+    paths = []
+    for field in dataclasses.fields(artifact):
+        value = getattr(artifact, field.name)
+        if dataclasses.is_dataclass(value):
+            paths.extend(artifact_files(value))
+        elif isinstance(value, str) and os.path.exists(value):
+            paths.append(value)
+    return paths
+
+
+def _config_values(config: Any, root: Optional[str]) -> Dict[str, Any]:
+    # Paths inside the timestamped artifact directory change on every run;
+    # only their location relative to it is part of the configuration
+    values = {}
+    for key, value in sorted(vars(config).items()):
+        if isinstance(value, str) and root and value.startswith(root):
+            value = os.path.relpath(value, root)
+        values[key] = value
+    return values
+
+
+def _from_dict(artifact_type: Type[T], data: Dict[str, Any]) -> T:
+    hints = typing.get_type_hints(artifact_type)
+    kwargs = {}
+    for field in dataclasses.fields(artifact_type):
+        value = data[field.name]
+        if dataclasses.is_dataclass(hints.get(field.name)) and isinstance(value, dict):
+            value = _from_dict(hints[field.name], value)
+        kwargs[field.name] = value
+    return artifact_type(**kwargs)
+
+
+def write_manifest(path: str, artifact: Any, **fields: Any):
+    """
+    Serialize an artifact dataclass to a JSON manifest, atomically.
+
+    The manifest records the size of every file the artifact points to, so
+    `read_manifest` can tell when those outputs were removed or rewritten.
+
+    :param path: manifest file
+    :param artifact: artifact dataclass
+    :param fields: extra JSON-serializable values stored with it
+    """
+    outputs = {output: (None if os.path.isdir(output) else os.path.getsize(output))
+               for output in artifact_files(artifact)}
+    manifest = {
+        **fields,
+        "created_at": time.time(),
+        "artifact": dataclasses.asdict(artifact),
+        "outputs": outputs,
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path: str, artifact_type: Type[T]) -> Optional[T]:
+    """
+    Artifact stored by `write_manifest`, or None.
+
+    Missing or unreadable manifests and manifests whose output files were
+    deleted or changed size return None.
+    """
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    for output, size in manifest["outputs"].items():
+        if not os.path.exists(output) or (size is not None and os.path.getsize(output) != size):
+            logger.info(f"Manifest {path} is stale: {output} changed")
+            return None
+    return _from_dict(artifact_type, manifest["artifact"])
+
+
+class StageCache:
+    """
+    Reuse of pipeline stage outputs keyed by a fingerprint of the stage.
+
+    A fingerprint hashes everything a stage's output depends on: the content
+    of its input files, its configuration values and the source of the code
+    that runs it. After a stage runs, its artifact is recorded in
+    `<cache_dir>/<stage>/<fingerprint>.json`; a later run with the same
+    fingerprint returns that artifact instead of recomputing it, as long as
+    the files it points to are still in place. Because the next stage hashes
+    those same files, an unchanged stage keeps every downstream stage cached
+    too.
+    """
+
+    def __init__(self, cache_dir: str, enabled: bool = True):
+        """
+        :param cache_dir: directory holding the stage manifests
+        :param enabled: False always runs the stages, but still records them
+        """
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+
+    @staticmethod
+    def fingerprint(config: Any = None, inputs: Iterable[str] = (), code: Iterable[Any] = (),
+                    extra: Optional[Dict[str, Any]] = None, root: Optional[str] = None) -> str:
+        """
+        Hash the inputs, configuration and code version of a stage.
+
+        :param config: stage config object, hashed through its attributes
+        :param inputs: files or directories the stage reads
+        :param code: modules, classes or functions whose source defines the stage
+        :param extra: any other JSON-serializable values the output depends on
+        :param root: artifact directory of the current run, stripped from config paths
+        :return: hex digest
+        """
+        payload = {
+            "config": _config_values(config, root) if config is not None else None,
+            "inputs": {os.path.basename(path) + f"#{i}": file_digest(path) for i, path in enumerate(inputs)},
+            "code": sorted(file_digest(inspect.getsourcefile(obj)) for obj in code),
+            "extra": extra,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=repr).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def manifest_path(self, stage: str, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, stage, f"{fingerprint}.json")
+
+    def load(self, stage: str, fingerprint: str, artifact_type: Type[T]) -> Optional[T]:
+        """
+        Artifact recorded for this fingerprint, or None.
+
+        Manifests whose output files were deleted or changed size are ignored.
+        """
+        return read_manifest(self.manifest_path(stage, fingerprint), artifact_type)
+
+    def save(self, stage: str, fingerprint: str, artifact: Any):
+        """Record the artifact of a completed stage run."""
+        write_manifest(self.manifest_path(stage, fingerprint), artifact, stage=stage, fingerprint=fingerprint)
+
+    def run(self, stage: str, fingerprint: Optional[str], compute: Callable[[], T],
+            artifact_type: Type[T]) -> T:
+        """
+        Return the cached artifact of a stage, or run it and record the result.
+
+        :param stage: stage name
+        :param fingerprint: stage fingerprint, None disables caching for this run
+        :param compute: function running the stage and returning its artifact
+        :param artifact_type: artifact dataclass returned by `compute`
+        """
+        if fingerprint is None:
+            return compute()
+        if self.enabled:
+            artifact = self.load(stage, fingerprint, artifact_type)
+            if artifact is not None:
+                logger.info(f"Reusing cached {stage} output ({fingerprint[:12]})")
+                return artifact
+
+        artifact = compute()
+        self.save(stage, fingerprint, artifact)
+        return artifact
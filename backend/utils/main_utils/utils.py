@@ -4,8 +4,9 @@ import os
 import sys
 import numpy as np
 import joblib
+from sklearn.base import clone
 import yaml
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 def read_yaml_file(file_path: str) -> Dict:
     """Read a YAML configuration file."""
@@ -33,10 +34,21 @@ def write_yaml_file(file_path: str, content: Dict, replace: bool = False):
         raise ValueError(f"Error writing YAML file: {e}")
 
 def save_numpy_array_data(file_path: str, array: np.ndarray):
-    """Save NumPy array to a file."""
+    """
+    Save NumPy array to a file.
+
+    A `.npy` path is written raw and uncompressed, so it can be memory-mapped
+    by `load_numpy_array_data(..., mmap_mode="r")`. Any other path is saved
+    compressed as `.npz`.
+    """
     try:
         # Ensure the directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        if file_path.endswith('.npy'):
+            # No pickled objects, so the file maps straight onto an array
+            np.save(file_path, np.ascontiguousarray(array), allow_pickle=False)
+            return
         
         # Ensure the file has .npz extension
         if not file_path.endswith('.npz'):
@@ -47,9 +59,19 @@ def save_numpy_array_data(file_path: str, array: np.ndarray):
     except Exception as e:
         raise ValueError(f"Error saving NumPy array: {e}")
 
-def load_numpy_array_data(file_path: str) -> np.ndarray:
-    """Load NumPy array from a file."""
+def load_numpy_array_data(file_path: str, mmap_mode: Optional[str] = None) -> np.ndarray:
+    """
+    Load NumPy array from a file.
+
+    :param file_path: `.npy` or `.npz` file
+    :param mmap_mode: with a `.npy` file, e.g. "r" maps the array instead of
+        reading it, so slices are paged in from the page cache on access;
+        ignored for compressed `.npz` files
+    """
     try:
+        if file_path.endswith('.npy'):
+            return np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+
         # Ensure the file has .npz extension
         if not file_path.endswith('.npz'):
             file_path = file_path + '.npz'
@@ -72,21 +94,42 @@ def save_object(file_path: str, obj: Any):
     except Exception as e:
         raise ValueError(f"Error saving object: {e}")
 
-def load_object(file_path: str) -> Any:
-    """Load Python object using joblib."""
+def load_object(file_path: str, mmap_mode: Optional[str] = None) -> Any:
+    """
+    Load Python object using joblib.
+
+    With `mmap_mode` (e.g. "r"), large NumPy arrays stored in the file are
+    memory-mapped instead of read into private memory.
+    """
     try:
-        return joblib.load(file_path)
+        return joblib.load(file_path, mmap_mode=mmap_mode)
     except Exception as e:
         raise ValueError(f"Error loading object: {e}")
 
-def evaluate_models(x_train, y_train, x_test, y_test, models, params):
-    """Evaluate multiple machine learning models."""
+def evaluate_models(x_train, y_train, x_test, y_test, models, params, n_jobs=-1):
+    """
+    Evaluate multiple machine learning models.
+
+    Every model's parameter grid in `params` is searched with a parallel
+    successive-halving search; each model is then refitted with its best
+    parameters and scored on the test set.
+
+    :return: {model name: test accuracy of its best configuration}
+    """
     try:
+        from ..ml_utils.model.model_selection import search_models
+
+        result = search_models(x_train, y_train, models, params, scoring="accuracy", n_jobs=n_jobs)
         model_report = {}
         for name, model in models.items():
-            model.fit(x_train, y_train)
-            y_pred = model.predict(x_test)
+            # The report lists the latest (largest budget) round first
+            best_row = next(row for row in result.report if row["model"] == name)
+            if name == result.best_model_name:
+                fitted = result.best_estimator
+            else:
+                fitted = clone(model).set_params(**best_row["params"]).fit(x_train, y_train)
+            y_pred = fitted.predict(x_test)
             model_report[name] = np.mean(y_pred == y_test)
         return model_report
     except Exception as e:
-        raise ValueError(f"Error evaluating models: {e}")
\ No newline at end of file
+        raise ValueError(f"Error evaluating models: {e}")
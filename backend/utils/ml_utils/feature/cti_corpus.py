@@ -0,0 +1,101 @@
+## NETWORKSECURITY/networksecurity/utils/ml_utils/feature/cti_corpus.py
+
+import glob
+import re
+import numpy as np
+import pandas as pd
+from typing import Iterable, Iterator, List, Sequence, Union
+
+# Columns of the cyber threat intelligence CSVs used for training
+TEXT_COLUMN = "text"
+ENTITIES_COLUMN = "entities"
+
+# Rows read from a CSV at a time
+DEFAULT_CHUNK_SIZE = 5000
+
+# The entities column holds repr()-style lists of dicts whose elements are
+# separated by newlines rather than commas, e.g.
+#   "[{'id': 1, 'label': 'malware', 'start_offset': 2, 'end_offset': 9}\n {...}]"
+# Only the label values are needed, so they are matched instead of evaluated.
+
+
+def has_entity_label(entities: pd.Series, label: str) -> np.ndarray:
+    """
+    Vectorized check whether any entity of a row carries `label`.
+
+    :param entities: column of entity list strings
+    :param label: entity label, e.g. "malware"
+    :return: boolean array, False for missing values
+    """
+    pattern = r"'label':\s*'" + re.escape(label) + "'"
+    return entities.astype("string").str.contains(pattern, regex=True).fillna(False).to_numpy(dtype=bool)
+
+
+def resolve_corpus_paths(paths: Union[str, Sequence[str]]) -> List[str]:
+    """Expand a glob pattern or a list of paths into a sorted list of CSV files."""
+    if isinstance(paths, str):
+        paths = [paths]
+    resolved = sorted({match for path in paths for match in glob.glob(path)})
+    if not resolved:
+        raise FileNotFoundError(f"No CSV files match {list(paths)}")
+    return resolved
+
+
+def iter_corpus_chunks(paths: Union[str, Sequence[str]],
+                       chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream the text and entities columns of the corpus in bounded-memory chunks.
+
+    Files without both columns are skipped.
+
+    :param paths: CSV path(s) or glob pattern(s), e.g. "Network_Data/*.csv"
+    :param chunksize: rows per chunk
+    """
+    columns = (TEXT_COLUMN, ENTITIES_COLUMN)
+    for path in resolve_corpus_paths(paths):
+        header = pd.read_csv(path, nrows=0).columns
+        if not all(column in header for column in columns):
+            continue
+        yield from pd.read_csv(path, usecols=list(columns), chunksize=chunksize,
+                               dtype={TEXT_COLUMN: "string", ENTITIES_COLUMN: "string"})
+
+
+def label_chunk(chunk: pd.DataFrame, positive_label: str = "malware") -> pd.DataFrame:
+    """Return the texts of a chunk with a binary label: 1 when any entity has `positive_label`."""
+    return pd.DataFrame({
+        TEXT_COLUMN: chunk[TEXT_COLUMN].fillna("").to_numpy(dtype=object),
+        "label": has_entity_label(chunk[ENTITIES_COLUMN], positive_label).astype(np.int64)
+    })
+
+
+def sample_balanced_corpus(chunks: Iterable[pd.DataFrame], max_per_class: int = 1000,
+                           positive_label: str = "malware", random_state: int = 42) -> pd.DataFrame:
+    """
+    Draw a class-balanced random sample from a stream of corpus chunks.
+
+    Every row gets a random key and each class keeps the `max_per_class` rows
+    with the smallest keys seen so far (bottom-k sampling), so the result is a
+    uniform sample of each class while memory stays bounded by one chunk plus
+    the kept rows.
+
+    :param chunks: DataFrames with text and entities columns
+    :param max_per_class: maximum rows kept per class
+    :param positive_label: entity label that makes a row positive
+    :param random_state: seed of the sampling keys
+    :return: DataFrame with "text" and "label" columns, in corpus order
+    """
+    rng = np.random.default_rng(random_state)
+    kept = None
+    offset = 0
+    for chunk in chunks:
+        labelled = label_chunk(chunk, positive_label)
+        labelled["order"] = np.arange(offset, offset + len(labelled))
+        labelled["key"] = rng.random(len(labelled))
+        offset += len(labelled)
+
+        pool = labelled if kept is None else pd.concat([kept, labelled], ignore_index=True)
+        kept = pool.sort_values("key", kind="stable").groupby("label", sort=False).head(max_per_class)
+
+    if kept is None:
+        return pd.DataFrame({TEXT_COLUMN: pd.Series(dtype=object), "label": pd.Series(dtype=np.int64)})
+    return kept.sort_values("order")[[TEXT_COLUMN, "label"]].reset_index(drop=True)
@@ -0,0 +1,73 @@
+## NETWORKSECURITY/networksecurity/utils/ml_utils/feature/text_featurizer.py
+
+import numpy as np
+from typing import Iterable, List
+
+# Keyword features in model column order, with the weight emitted when the
+# keyword occurs anywhere in the lower-cased text.
+KEYWORD_WEIGHTS = (
+    ("malware", 0.7),
+    ("trojan", 0.6),
+    ("virus", 0.6),
+    ("ransomware", 0.8),
+    ("attack", 0.4),
+    ("threat", 0.3),
+    ("vulnerability", 0.5),
+    ("exploit", 0.5),
+    ("security", 0.2),
+)
+
+TEXT_FEATURE_NAMES: List[str] = [
+    "text_length",
+    "word_count",
+    "contains_malware_word",
+    "contains_trojan",
+    "contains_virus",
+    "contains_ransomware",
+    "contains_attack",
+    "contains_threat",
+    "contains_vulnerability",
+    "contains_exploit",
+    "contains_security",
+]
+
+TEXT_LENGTH_SCALE: float = 5000.0
+WORD_COUNT_SCALE: float = 500.0
+
+_KEYWORD_OFFSET = 2
+
+
+def featurize_texts(texts: Iterable[str]) -> np.ndarray:
+    """
+    Build the text feature matrix used for training and serving.
+
+    Every text is lower-cased once; each keyword column is then filled from a
+    single C-level substring scan over the whole batch.
+
+    :param texts: list, array or Series of raw documents
+    :return: float64 array of shape (n_texts, len(TEXT_FEATURE_NAMES))
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    texts = [t if isinstance(t, str) else "" for t in texts]
+    n_texts = len(texts)
+
+    features = np.zeros((n_texts, len(TEXT_FEATURE_NAMES)), dtype=np.float64)
+    if n_texts == 0:
+        return features
+
+    lengths = np.fromiter(map(len, texts), dtype=np.float64, count=n_texts)
+    word_counts = np.fromiter(
+        (len(t.split()) for t in texts), dtype=np.float64, count=n_texts
+    )
+    features[:, 0] = np.minimum(lengths / TEXT_LENGTH_SCALE, 1.0)
+    features[:, 1] = np.minimum(word_counts / WORD_COUNT_SCALE, 1.0)
+
+    lowered = [t.lower() for t in texts]
+    for column, (keyword, weight) in enumerate(KEYWORD_WEIGHTS, start=_KEYWORD_OFFSET):
+        present = np.fromiter(
+            (keyword in t for t in lowered), dtype=np.bool_, count=n_texts
+        )
+        features[present, column] = weight
+
+    return features
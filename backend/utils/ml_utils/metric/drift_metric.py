@@ -0,0 +1,264 @@
+## NETWORKSECURITY/networksecurity/utils/ml_utils/metric/drift_metric.py
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy.stats import chi2_contingency, kstwo, kstwobign
+from typing import Any, Dict, List, Optional, Tuple
+
+# Columns per block of the vectorized numeric pass
+DEFAULT_BLOCK_SIZE = 64
+# Integer-valued columns spanning at most this many values are compared
+# through exact per-value counts instead of sorting
+DEFAULT_MAX_INTEGER_RANGE = 4096
+# Above this effective sample size n*m/(n+m), KS p-values come from the
+# limiting Kolmogorov distribution instead of the exact finite-n one
+KS_ASYMPTOTIC_SIZE = 10000
+# Added to empty PSI bins so the log ratio stays finite
+_PSI_EPSILON = 1e-4
+
+
+def ks_p_values(statistics: np.ndarray, n: np.ndarray, m: np.ndarray) -> np.ndarray:
+    """
+    p-values of two-sample KS statistics.
+
+    Like `ks_2samp(..., method="asymp")` this uses the one-sample distribution
+    at the effective size n*m/(n+m). Past `KS_ASYMPTOTIC_SIZE` its limit is
+    used: the exact distribution costs milliseconds per column there and
+    differs from the limit by well under 1e-2.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        size = n * m / (n + m)
+        p_values = np.where(size > KS_ASYMPTOTIC_SIZE, kstwobign.sf(statistics * np.sqrt(size)), np.nan)
+        small = size <= KS_ASYMPTOTIC_SIZE
+        if small.any():
+            p_values[small] = kstwo.sf(statistics[small], np.round(size[small]))
+    return np.clip(p_values, 0.0, 1.0)
+
+
+def ks_2samp_columns(base: np.ndarray, current: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Two-sample Kolmogorov-Smirnov test of every column at once.
+
+    Both samples of a column are sorted together and the difference of their
+    empirical CDFs is accumulated along the sorted order, so all columns are
+    handled by a few array operations instead of one `ks_2samp` call each.
+    NaNs are ignored per column. p-values come from `ks_p_values`.
+
+    :param base: reference sample, shape (n_rows, n_columns)
+    :param current: compared sample, shape (m_rows, n_columns)
+    :return: (statistics, p_values), NaN for columns without data on a side
+    """
+    statistics, p_values, _, _ = _ks_sorted(base, current)
+    return statistics, p_values
+
+
+def _ks_sorted(base: np.ndarray, current: np.ndarray):
+    # KS statistics and p-values, plus each sample sorted per column with shape
+    # (n_columns, n_rows), which the PSI reuses instead of sorting again
+    data = np.ascontiguousarray(np.concatenate([base, current]).T)
+    n = (~np.isnan(base)).sum(axis=0)
+    m = (~np.isnan(current)).sum(axis=0)
+
+    # One contiguous row per column: sorting along the last axis is much faster
+    order = np.argsort(data, axis=1)
+    sorted_data = np.take_along_axis(data, order, axis=1)
+    is_current = order >= len(base)
+    del order
+
+    # With b base and c current values seen up to a sorted position, the CDF
+    # difference is b/n - c/m, and b = position + 1 - c (NaNs sort last).
+    # Scaled by n*m it stays an exact integer: (position + 1) * m - c * (n + m)
+    current_seen = np.cumsum(is_current, axis=1, dtype=np.int64)
+    scaled_diff = np.arange(1, data.shape[1] + 1) * m[:, None] - current_seen * (n + m)[:, None]
+    np.abs(scaled_diff, out=scaled_diff)
+
+    # Both CDFs are only compared after the last of a run of equal values,
+    # which also makes the order within a run irrelevant
+    end_of_run = np.empty(sorted_data.shape, dtype=bool)
+    end_of_run[:, -1] = True
+    np.not_equal(sorted_data[:, :-1], sorted_data[:, 1:], out=end_of_run[:, :-1])
+    if (n < len(base)).any() or (m < len(current)).any():
+        end_of_run &= ~np.isnan(sorted_data)
+    scaled_diff[~end_of_run] = 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        statistics = scaled_diff.max(axis=1, initial=0) / (n * m)
+    empty = (n == 0) | (m == 0)
+    statistics[empty] = np.nan
+
+    # Every row holds exactly len(base) base values, so the split keeps its shape
+    sorted_base = sorted_data[~is_current].reshape(data.shape[0], len(base))
+    sorted_current = sorted_data[is_current].reshape(data.shape[0], len(current))
+    p_values = ks_p_values(statistics, n, m)
+    p_values[empty] = np.nan
+    return statistics, p_values, sorted_base, sorted_current
+
+
+def ks_2samp_counts(base_counts: np.ndarray, current_counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact KS test of discrete columns from their per-value counts.
+
+    :param base_counts: shape (n_columns, n_values), counts of each value in ascending order
+    :param current_counts: same layout for the compared sample
+    :return: (statistics, p_values), NaN for columns without data on a side
+    """
+    n = base_counts.sum(axis=1)
+    m = current_counts.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cdf_diff = np.cumsum(base_counts, axis=1) / n[:, None] - np.cumsum(current_counts, axis=1) / m[:, None]
+        statistics = np.abs(cdf_diff).max(axis=1, initial=0.0)
+
+    empty = (n == 0) | (m == 0)
+    statistics[empty] = np.nan
+    p_values = ks_p_values(statistics, n, m)
+    p_values[empty] = np.nan
+    return statistics, p_values
+
+
+def _psi(base_counts: np.ndarray, current_counts: np.ndarray) -> float:
+    base_share = np.maximum(base_counts / base_counts.sum(), _PSI_EPSILON)
+    current_share = np.maximum(current_counts / current_counts.sum(), _PSI_EPSILON)
+    return float(np.sum((current_share - base_share) * np.log(current_share / base_share)))
+
+
+def population_stability_index(sorted_base: np.ndarray, sorted_current: np.ndarray, bins: int = 10) -> float:
+    """
+    PSI of one column from its sorted, NaN-free samples.
+
+    Bin edges are base values at evenly spaced quantiles (merged where values
+    repeat), and bin counts are found by binary search in the sorted samples.
+    """
+    if len(sorted_base) == 0 or len(sorted_current) == 0:
+        return float("nan")
+    levels = np.linspace(0, 1, bins + 1)[1:-1]
+    edges = np.unique(np.quantile(sorted_base, levels, method="inverted_cdf"))
+
+    def counts(sorted_values):
+        cuts = np.searchsorted(sorted_values, edges, side="right")
+        return np.diff(np.concatenate([[0], cuts, [len(sorted_values)]]))
+
+    return _psi(counts(sorted_base), counts(sorted_current))
+
+
+def _psi_from_counts(base_counts: np.ndarray, current_counts: np.ndarray, bins: int = 10) -> float:
+    # Same bins as population_stability_index, found on the cumulative counts
+    n, m = base_counts.sum(), current_counts.sum()
+    if n == 0 or m == 0:
+        return float("nan")
+    base_cdf = np.cumsum(base_counts)
+    current_cdf = np.cumsum(current_counts)
+    levels = np.linspace(0, 1, bins + 1)[1:-1]
+    edges = np.unique(np.searchsorted(base_cdf, levels * n, side="left"))
+    return _psi(np.diff(np.concatenate([[0], base_cdf[edges], [n]])),
+                np.diff(np.concatenate([[0], current_cdf[edges], [m]])))
+
+
+def chi2_column(base: pd.Series, current: pd.Series) -> Tuple[float, float]:
+    """Chi-square test of the category frequencies of one column (NaN excluded)."""
+    table = pd.concat([base.value_counts(), current.value_counts()], axis=1).fillna(0).to_numpy().T
+    table = table[:, table.sum(axis=0) > 0]
+    if table.shape[1] < 2 or (table.sum(axis=1) == 0).any():
+        return 0.0, 1.0
+    statistic, p_value, _, _ = chi2_contingency(table)
+    return float(statistic), float(p_value)
+
+
+def _value_counts(values: np.ndarray, low: np.ndarray, span: int) -> np.ndarray:
+    # One bincount for all columns: column j's values land in [j * span, (j + 1) * span)
+    # and NaNs in an extra trailing bin that is dropped
+    n_bins = values.shape[1] * span
+    codes = values - (low - np.arange(values.shape[1]) * span)
+    codes[np.isnan(codes)] = n_bins
+    return np.bincount(codes.astype(np.int64).ravel(), minlength=n_bins + 1)[:n_bins].reshape(values.shape[1], span)
+
+
+def _numeric_block(base: np.ndarray, current: np.ndarray, psi_bins: int,
+                   max_integer_range: int) -> List[Dict[str, float]]:
+    results: List[Dict[str, float]] = [{} for _ in range(base.shape[1])]
+
+    with np.errstate(invalid="ignore"):
+        low = np.fmin(np.nanmin(base, axis=0, initial=np.inf), np.nanmin(current, axis=0, initial=np.inf))
+        high = np.fmax(np.nanmax(base, axis=0, initial=-np.inf), np.nanmax(current, axis=0, initial=-np.inf))
+    integral = (np.all(np.isnan(base) | (base == np.round(base)), axis=0)
+                & np.all(np.isnan(current) | (current == np.round(current)), axis=0)
+                & np.isfinite(low) & (high - low < max_integer_range))
+
+    discrete = np.flatnonzero(integral)
+    if len(discrete):
+        span = int(np.max(high[discrete] - low[discrete])) + 1
+        base_counts = _value_counts(base[:, discrete], low[discrete], span)
+        current_counts = _value_counts(current[:, discrete], low[discrete], span)
+        statistics, p_values = ks_2samp_counts(base_counts, current_counts)
+        for i, j in enumerate(discrete):
+            psi = _psi_from_counts(base_counts[i], current_counts[i], psi_bins)
+            results[j] = {"statistic": float(statistics[i]), "p_value": float(p_values[i]), "psi": psi}
+
+    continuous = np.flatnonzero(~integral)
+    if len(continuous):
+        statistics, p_values, sorted_base, sorted_current = _ks_sorted(base[:, continuous], current[:, continuous])
+        n = (~np.isnan(sorted_base)).sum(axis=1)
+        m = (~np.isnan(sorted_current)).sum(axis=1)
+        for i, j in enumerate(continuous):
+            # NaNs sort last, so the first n values are the column's data
+            psi = population_stability_index(sorted_base[i, :n[i]], sorted_current[i, :m[i]], psi_bins)
+            results[j] = {"statistic": float(statistics[i]), "p_value": float(p_values[i]), "psi": psi}
+    return results
+
+
+def detect_drift(base_df: pd.DataFrame, current_df: pd.DataFrame, threshold: float = 0.05,
+                 psi_bins: int = 10, max_rows: Optional[int] = None, n_jobs: Optional[int] = 1,
+                 block_size: int = DEFAULT_BLOCK_SIZE, max_integer_range: int = DEFAULT_MAX_INTEGER_RANGE,
+                 random_state: int = 42) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare the distribution of every shared column of two tables.
+
+    Numeric columns (any int or float width) get a KS test and a PSI, computed
+    in vectorized blocks of `block_size` columns. Integer-valued columns with
+    a small range are counted per value in one `bincount`, which gives exact
+    results without sorting; the other columns are sorted together with
+    `ks_2samp_columns`. Boolean, categorical and
+    string columns get a chi-square test of their category frequencies.
+    With `n_jobs` other than 1 the blocks and categorical columns run on a
+    thread pool; the sorts and reductions release the GIL.
+
+    :param base_df: reference table, e.g. the training split
+    :param current_df: compared table
+    :param threshold: p-value below which a column counts as drifted
+    :param psi_bins: quantile bins of the PSI
+    :param max_rows: compare uniform samples of at most this many rows per table
+    :param n_jobs: threads, -1 uses every core
+    :param block_size: numeric columns per vectorized block
+    :param max_integer_range: widest value range of an integer column compared through counts
+    :param random_state: seed of the row sampling
+    :return: {column: {"test", "statistic", "p_value", "drift_detected"[, "psi"]}}
+    """
+    if max_rows is not None:
+        if len(base_df) > max_rows:
+            base_df = base_df.sample(n=max_rows, random_state=random_state)
+        if len(current_df) > max_rows:
+            current_df = current_df.sample(n=max_rows, random_state=random_state)
+
+    columns = [column for column in base_df.columns if column in current_df.columns]
+    numeric = [column for column in columns
+               if pd.api.types.is_numeric_dtype(base_df[column]) and not pd.api.types.is_bool_dtype(base_df[column])
+               and pd.api.types.is_numeric_dtype(current_df[column])]
+    categorical = [column for column in columns if column not in numeric]
+
+    blocks = [numeric[i:i + block_size] for i in range(0, len(numeric), block_size)]
+    tasks = [delayed(_numeric_block)(base_df[block].to_numpy(dtype=np.float64, na_value=np.nan),
+                                     current_df[block].to_numpy(dtype=np.float64, na_value=np.nan),
+                                     psi_bins, max_integer_range)
+             for block in blocks]
+    tasks += [delayed(chi2_column)(base_df[column], current_df[column]) for column in categorical]
+    results = Parallel(n_jobs=n_jobs, prefer="threads")(tasks) if tasks else []
+
+    report = {}
+    for block, block_results in zip(blocks, results[:len(blocks)]):
+        for column, result in zip(block, block_results):
+            report[column] = {"test": "ks", **result}
+    for column, (statistic, p_value) in zip(categorical, results[len(blocks):]):
+        report[column] = {"test": "chi2", "statistic": statistic, "p_value": p_value}
+    for result in report.values():
+        result["drift_detected"] = bool(result["p_value"] < threshold)
+    return {column: report[column] for column in columns}
@@ -0,0 +1,394 @@
+## NETWORKSECURITY/networksecurity/utils/ml_utils/model/compiled_forest.py
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+import sklearn
+from functools import partial
+from typing import Any, Callable, Optional
+
+# Directory of .npy files saved next to model.pkl by the trainers
+COMPILED_MODEL_FILE_NAME = "model.compiled"
+_META_FILE_NAME = "meta.json"
+
+# Before scikit-learn 1.4 classifier leaves stored class counts, which
+# DecisionTreeClassifier.predict_proba normalized on every call
+_LEAVES_HOLD_FRACTIONS = tuple(int(p) for p in sklearn.__version__.split(".")[:2]) >= (1, 4)
+
+_ARRAY_FIELDS = ("feature", "threshold", "children", "missing_go_left", "value", "roots", "classes")
+
+# Finished (row, tree) pairs are dropped from the walk every this many levels
+_COMPACT_EVERY = 3
+
+# Largest batch served by CompiledForest; larger ones go to the sklearn estimator,
+# whose Cython traversal wins from about 700 rows on a 100-tree forest
+COMPILED_MAX_ROWS = 512
+
+
+class CompiledForest:
+    """
+    A fitted random forest flattened into contiguous node arrays.
+
+    Every tree's nodes are concatenated into one set of arrays (split feature,
+    threshold, children, missing-value direction and leaf class fractions)
+    with global child offsets; leaves point to themselves. Prediction walks
+    all (row, tree) pairs one level at a time with vectorized NumPy
+    operations, so a call costs a few array passes per tree level instead of
+    scikit-learn's per-call validation and per-tree dispatch.
+
+    predict_proba is bit-identical to the source forest's: inputs are cast to
+    float32 and compared against the float64 thresholds like the Cython tree,
+    and the per-tree leaf values are summed in tree order before dividing by
+    the number of trees.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray,
+                 missing_go_left: np.ndarray, value: np.ndarray, roots: np.ndarray,
+                 classes: np.ndarray, n_features_in: int, max_depth: int, allow_nan: bool):
+        """
+        :param feature: split feature of every node (0 for leaves)
+        :param threshold: split threshold of every node
+        :param children: global indices of the (right, left) children of every node,
+            the node itself for leaves, so that a boolean "go left" selects the column
+        :param missing_go_left: whether NaN goes to the left child at every node
+        :param value: class fractions of every node, shape (n_nodes, n_classes)
+        :param roots: global index of the root of every tree, in estimator order
+        :param classes: class labels in predict_proba column order
+        :param n_features_in: number of features seen during fit
+        :param max_depth: depth of the deepest tree
+        :param allow_nan: whether the source forest accepts missing values
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.missing_go_left = missing_go_left
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features_in)
+        self.max_depth = int(max_depth)
+        self.allow_nan = bool(allow_nan)
+        self._flat_children = children.reshape(-1)
+        self._is_leaf = children[:, 0] == np.arange(len(children))
+        self._has_missing_splits = bool(self.allow_nan and missing_go_left.any())
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_estimator(cls, forest: Any) -> "CompiledForest":
+        """
+        Compile a fitted single-output RandomForestClassifier or ExtraTreesClassifier.
+
+        :param forest: fitted forest classifier
+        :return: CompiledForest with the same predictions
+        """
+        # Wrappers such as OneVsRestClassifier also have estimators_, but not of trees
+        estimators = getattr(forest, "estimators_", None)
+        if (estimators is None or not hasattr(forest, "classes_")
+                or not all(hasattr(estimator, "tree_") for estimator in estimators)):
+            raise TypeError(f"Cannot compile {type(forest).__name__}, expected a fitted forest classifier")
+        if getattr(forest, "n_outputs_", 1) != 1:
+            raise TypeError("Multi-output forests are not supported")
+
+        n_classes = len(forest.classes_)
+        features, thresholds, children, missing, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            node_ids = np.arange(tree.node_count)
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            children.append(np.column_stack([
+                np.where(is_leaf, node_ids, tree.children_right),
+                np.where(is_leaf, node_ids, tree.children_left)
+            ]) + offset)
+            go_left = getattr(tree, "missing_go_to_left", None)
+            missing.append(np.zeros(tree.node_count, dtype=bool) if go_left is None
+                           else np.asarray(go_left, dtype=bool))
+            values.append(_leaf_fractions(tree.value[:, 0, :n_classes]))
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += tree.node_count
+
+        if offset > np.iinfo(np.int32).max // 2:
+            raise TypeError(f"Forest has too many nodes ({offset}) to compile")
+
+        tags = getattr(forest, "__sklearn_tags__", None)
+        allow_nan = bool(tags().input_tags.allow_nan) if tags is not None else False
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children=np.concatenate(children).astype(np.int32),
+            missing_go_left=np.concatenate(missing),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=np.asarray(forest.classes_),
+            n_features_in=forest.n_features_in_,
+            max_depth=max_depth,
+            allow_nan=allow_nan
+        )
+
+    def _validate(self, X: Any) -> np.ndarray:
+        X = np.asarray(X)
+        if X.ndim != 2:
+            raise ValueError(f"Expected a 2-D array, got shape {X.shape}")
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but the model is expecting {self.n_features_in_} features as input."
+            )
+        # The trees compare float32 inputs, exactly like scikit-learn's validation
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if np.isinf(X).any():
+            raise ValueError("Input X contains infinity or a value too large for dtype('float32').")
+        if not self.allow_nan and np.isnan(X).any():
+            raise ValueError("Input X contains NaN.")
+        return X
+
+    def apply(self, X: Any) -> np.ndarray:
+        """
+        Return the global leaf index reached by every row in every tree.
+
+        :param X: array of shape (n_rows, n_features)
+        :return: int32 array of shape (n_rows, n_estimators)
+        """
+        X = self._validate(X)
+        n_rows, n_trees = X.shape[0], self.n_estimators
+        flat_x = X.reshape(-1)
+        check_missing = self._has_missing_splits and np.isnan(flat_x).any()
+
+        # One entry per (row, tree) pair, row-major like the output
+        nodes = np.tile(self.roots, n_rows)
+        row_offsets = np.repeat(np.arange(n_rows, dtype=np.int32) * self.n_features_in_, n_trees)
+        leaves = None
+        positions = None
+
+        for depth in range(self.max_depth):
+            x = np.take(flat_x, np.take(self.feature, nodes) + row_offsets)
+            go_left = x <= np.take(self.threshold, nodes)
+            if check_missing:
+                go_left |= np.isnan(x) & np.take(self.missing_go_left, nodes)
+            nodes = np.take(self._flat_children, 2 * nodes + go_left)
+
+            if depth % _COMPACT_EVERY == _COMPACT_EVERY - 1:
+                done = np.take(self._is_leaf, nodes)
+                if done.any():
+                    if leaves is None:
+                        leaves = np.empty(n_rows * n_trees, dtype=np.int32)
+                        positions = np.arange(n_rows * n_trees)
+                    leaves[positions[done]] = nodes[done]
+                    active = ~done
+                    nodes, row_offsets, positions = nodes[active], row_offsets[active], positions[active]
+                    if len(nodes) == 0:
+                        break
+
+        if leaves is None:
+            return nodes.reshape(n_rows, n_trees)
+        leaves[positions] = nodes
+        return leaves.reshape(n_rows, n_trees)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        :param X: array of shape (n_rows, n_features)
+        :return: float64 class probabilities of shape (n_rows, n_classes)
+        """
+        leaves = self.apply(X)
+        # Reducing over the leading tree axis adds the trees one after another,
+        # in estimator order, like ForestClassifier.predict_proba
+        proba = np.add.reduce(self.value[leaves.T], axis=0)
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        :param X: array of shape (n_rows, n_features)
+        :return: predicted class labels
+        """
+        return np.take(self.classes_, np.argmax(self.predict_proba(X), axis=1))
+
+    def save(self, file_path: str):
+        """
+        Save the node arrays as a directory of raw .npy files.
+
+        The directory is written next to its final location and renamed into
+        place, so processes that memory-mapped a previous export keep reading
+        consistent (unlinked) files.
+        """
+        parent = os.path.dirname(os.path.abspath(file_path))
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".compiled-", dir=parent)
+        try:
+            for name in _ARRAY_FIELDS:
+                array = self.classes_ if name == "classes" else getattr(self, name)
+                np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+            with open(os.path.join(staging, _META_FILE_NAME), "w") as f:
+                json.dump({
+                    "n_features_in": self.n_features_in_,
+                    "max_depth": self.max_depth,
+                    "allow_nan": self.allow_nan
+                }, f)
+            if os.path.isdir(file_path):
+                retired = staging + ".old"
+                os.replace(file_path, retired)
+                os.replace(staging, file_path)
+                shutil.rmtree(retired, ignore_errors=True)
+            else:
+                os.replace(staging, file_path)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    @classmethod
+    def load(cls, file_path: str, mmap_mode: Optional[str] = None) -> "CompiledForest":
+        """
+        :param file_path: directory written by `save`
+        :param mmap_mode: "r" to memory-map the arrays read-only, so that every
+            process serving the model shares one copy through the page cache
+        """
+        with open(os.path.join(file_path, _META_FILE_NAME)) as f:
+            meta = json.load(f)
+        arrays = {
+            # asarray drops the np.memmap subclass, keeping the mapped buffer
+            name: np.asarray(np.load(os.path.join(file_path, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False))
+            for name in _ARRAY_FIELDS
+        }
+        return cls(**arrays, n_features_in=meta["n_features_in"], max_depth=meta["max_depth"],
+                   allow_nan=meta["allow_nan"])
+
+
+class RoutedForest:
+    """
+    A forest served by CompiledForest for small batches and by its sklearn
+    estimator for batches above `max_compiled_rows`.
+
+    Both return bit-identical probabilities, so the route never changes a
+    prediction: the compiled walk removes sklearn's per-call overhead on
+    micro-batches, sklearn's Cython traversal is faster on bulk requests.
+    The sklearn forest can be loaded on the first large batch: unpickling
+    copies its trees into private memory, which a process serving only
+    small batches never pays for.
+    """
+
+    def __init__(self, compiled: CompiledForest, estimator: Any = None, max_compiled_rows: int = COMPILED_MAX_ROWS,
+                 load_estimator: Optional[Callable[[], Any]] = None):
+        """
+        :param compiled: forest serving batches of up to `max_compiled_rows` rows
+        :param estimator: fitted sklearn forest, None to load it when first needed
+        :param load_estimator: returns the sklearn forest when `estimator` is None
+        """
+        if estimator is None and load_estimator is None:
+            raise ValueError("RoutedForest needs an estimator or a way to load it")
+        self.compiled = compiled
+        self.max_compiled_rows = max_compiled_rows
+        self.classes_ = compiled.classes_
+        self.n_features_in_ = compiled.n_features_in_
+        self._estimator = estimator
+        self._load_estimator = load_estimator
+        self._n_jobs: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def estimator(self) -> Any:
+        if self._estimator is None:
+            with self._lock:
+                if self._estimator is None:
+                    estimator = self._load_estimator()
+                    if self._n_jobs is not None:
+                        estimator.n_jobs = self._n_jobs
+                    self._estimator = estimator
+        return self._estimator
+
+    @property
+    def n_jobs(self) -> Optional[int]:
+        return self._estimator.n_jobs if self._estimator is not None else self._n_jobs
+
+    @n_jobs.setter
+    def n_jobs(self, value: Optional[int]):
+        self._n_jobs = value
+        if self._estimator is not None:
+            self._estimator.n_jobs = value
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        if len(X) > self.max_compiled_rows:
+            return self.estimator.predict_proba(X)
+        return self.compiled.predict_proba(X)
+
+    def predict(self, X: Any) -> np.ndarray:
+        return np.take(self.classes_, np.argmax(self.predict_proba(X), axis=1))
+
+
+def _leaf_fractions(value: np.ndarray) -> np.ndarray:
+    value = np.asarray(value, dtype=np.float64)
+    if _LEAVES_HOLD_FRACTIONS:
+        return value
+    normalizer = value.sum(axis=1)[:, np.newaxis]
+    normalizer[normalizer == 0.0] = 1.0
+    return value / normalizer
+
+
+def compiled_model_path(model_path: str) -> str:
+    """Location of the compiled forest saved next to a model file."""
+    return os.path.join(os.path.dirname(model_path), COMPILED_MODEL_FILE_NAME)
+
+
+def export_compiled_forest(model: Any, model_path: str) -> Optional[str]:
+    """
+    Compile a trained forest and save it next to its model file.
+
+    :param model: trained estimator, skipped unless it is a forest classifier
+    :param model_path: path the model itself was saved to
+    :return: path of the compiled model, or None when the model is not a forest
+    """
+    try:
+        compiled = CompiledForest.from_estimator(model)
+    except TypeError:
+        return None
+    file_path = compiled_model_path(model_path)
+    compiled.save(file_path)
+    return file_path
+
+
+def load_serving_model(model_path: str, compiled: bool = True, mmap_mode: Optional[str] = None,
+                       max_compiled_rows: Optional[int] = COMPILED_MAX_ROWS) -> Any:
+    """
+    Load the model to serve from `model_path`.
+
+    With `compiled` set, forests are served through a RoutedForest. The
+    compiled forest saved next to the model is used when it is at least as
+    new as the model, and the pickle is then only unpickled on the first
+    batch above `max_compiled_rows`. Without a fresh export the pickled
+    forest is compiled in memory. Other estimators are returned unchanged.
+
+    :param model_path: path of the pickled model
+    :param compiled: serve forests through CompiledForest
+    :param mmap_mode: memory-map the saved arrays (e.g. "r") instead of reading them
+    :param max_compiled_rows: largest batch served by the compiled forest,
+        None serves every batch through it
+    """
+    from ...main_utils import load_object
+
+    if compiled:
+        file_path = compiled_model_path(model_path)
+        meta_path = os.path.join(file_path, _META_FILE_NAME)
+        if os.path.exists(meta_path) and os.path.getmtime(meta_path) >= os.path.getmtime(model_path):
+            forest = CompiledForest.load(file_path, mmap_mode=mmap_mode)
+            if max_compiled_rows is None:
+                return forest
+            return RoutedForest(forest, max_compiled_rows=max_compiled_rows,
+                                load_estimator=partial(load_object, model_path, mmap_mode=mmap_mode))
+    model = load_object(model_path, mmap_mode=mmap_mode)
+    if not compiled:
+        return model
+    try:
+        forest = CompiledForest.from_estimator(model)
+    except TypeError:
+        return model
+    return forest if max_compiled_rows is None else RoutedForest(forest, model, max_compiled_rows)
@@ -0,0 +1,113 @@
+## NETWORKSECURITY/networksecurity/utils/ml_utils/model/incremental.py
+
+import logging
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import numpy as np
+import yaml
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+
+from networksecurity.constants.Training_pipeline import MODEL_FILE_NAME, PREPROCESSOR_FILE_NAME, TRAINING_STATE_FILE_NAME
+
+logger = logging.getLogger("networksecurity")
+
+# Forests that can grow more trees with warm_start
+EXTENDABLE_MODELS = (RandomForestClassifier, ExtraTreesClassifier)
+
+
+def read_training_state(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Training state published with the saved model.
+
+    :param file_path: training_state.yaml
+    :return: {"watermark", "updated_at"}, None before the first publish
+    """
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path) as f:
+        return yaml.safe_load(f) or None
+
+
+def check_extendable(model: Any, x_new: np.ndarray, y_new: np.ndarray):
+    """
+    Raise ValueError when `model` cannot be extended with trees fitted on (x_new, y_new).
+
+    New trees must be of the same forest type, see the same features and
+    predict the same classes, or their votes could not be averaged with the
+    existing trees.
+    """
+    if not isinstance(model, EXTENDABLE_MODELS) or not hasattr(model, "estimators_"):
+        raise ValueError(f"Incremental training needs a fitted random forest or extra trees, got {type(model).__name__}")
+    if x_new.shape[1] != model.n_features_in_:
+        raise ValueError(f"New data has {x_new.shape[1]} features, the saved model {model.n_features_in_}")
+    classes = np.unique(y_new)
+    if not np.array_equal(classes, model.classes_):
+        raise ValueError(f"New data has classes {classes.tolist()}, the saved model {model.classes_.tolist()}")
+
+
+def extend_forest(model: Any, x_new: np.ndarray, y_new: np.ndarray, n_new_estimators: int,
+                  max_estimators: Optional[int] = None) -> Any:
+    """
+    Add `n_new_estimators` trees fitted on new rows only to a fitted forest.
+
+    The existing trees are kept as they are (warm start), so the cost is
+    proportional to the new rows. When the forest then holds more than
+    `max_estimators` trees the oldest ones are dropped, so the model tracks
+    recent data with a constant size.
+
+    :param model: fitted RandomForestClassifier or ExtraTreesClassifier, updated in place
+    :param x_new: features of the rows newer than the model
+    :param y_new: their labels
+    :return: the extended model
+    """
+    check_extendable(model, x_new, y_new)
+    n_before = len(model.estimators_)
+    model.set_params(warm_start=True, n_estimators=n_before + n_new_estimators)
+    model.fit(x_new, y_new)
+    model.set_params(warm_start=False)
+
+    if max_estimators is not None and len(model.estimators_) > max_estimators:
+        retired = len(model.estimators_) - max_estimators
+        # warm start appends, so the oldest trees come first
+        del model.estimators_[:retired]
+        model.set_params(n_estimators=len(model.estimators_))
+        logger.info(f"Retired the {retired} oldest trees")
+    logger.info(f"Forest extended from {n_before} to {len(model.estimators_)} trees on {len(y_new)} new rows")
+    return model
+
+
+def _copy_atomic(source: str, destination: str):
+    tmp_path = f"{destination}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+
+def publish_model(model_file_path: str, preprocessor_file_path: str, saved_model_dir: str,
+                  watermark: Optional[str]):
+    """
+    Copy a trained model and its preprocessor to the saved model directory and
+    record the watermark of the newest document it was trained on.
+
+    The state file is written last, so an interrupted publish leaves the old
+    watermark and the next incremental run retrains on the same documents.
+
+    :param watermark: newest MongoDB _id seen by the run; None keeps the previous one
+    """
+    training_state_file_path = os.path.join(saved_model_dir, TRAINING_STATE_FILE_NAME)
+    previous = read_training_state(training_state_file_path) or {}
+    os.makedirs(saved_model_dir, exist_ok=True)
+    _copy_atomic(model_file_path, os.path.join(saved_model_dir, MODEL_FILE_NAME))
+    _copy_atomic(preprocessor_file_path, os.path.join(saved_model_dir, PREPROCESSOR_FILE_NAME))
+
+    state = {
+        "watermark": watermark if watermark is not None else previous.get("watermark"),
+        "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+    }
+    tmp_path = f"{training_state_file_path}.tmp"
+    with open(tmp_path, "w") as f:
+        yaml.safe_dump(state, f, sort_keys=False)
+    os.replace(tmp_path, training_state_file_path)
+    logger.info(f"Published model with watermark {state['watermark']} to {saved_model_dir}")
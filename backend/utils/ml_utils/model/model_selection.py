@@ -0,0 +1,139 @@
+## NETWORKSECURITY/networksecurity/utils/ml_utils/model/model_selection.py
+
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sklearn.base import clone
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold
+from sklearn.multiclass import OneVsRestClassifier
+from sklearn.pipeline import Pipeline
+from xgboost import XGBClassifier
+
+
+def default_search_space(random_state: int = 42) -> Dict[str, Any]:
+    """
+    Candidate models and hyperparameter grids searched by ModelTrainer.
+
+    Every candidate runs single-threaded: parallelism comes from the search,
+    which evaluates configurations and folds on separate worker processes.
+
+    XGBoost only accepts labels 0..n-1, while the dataset's Result column is
+    {-1, 1}. It is therefore wrapped in OneVsRestClassifier, which fits it on
+    binarized labels and predicts the original ones. For a binary target this
+    is a single booster, and the model stays a plain scikit-learn object that
+    the API can unpickle.
+
+    :return: {"models": {name: estimator}, "params": {name: grid}}
+    """
+    return {
+        "models": {
+            "RandomForest": RandomForestClassifier(n_estimators=100, random_state=random_state, n_jobs=1),
+            "ExtraTrees": ExtraTreesClassifier(n_estimators=100, random_state=random_state, n_jobs=1),
+            "XGBoost": OneVsRestClassifier(XGBClassifier(random_state=random_state, n_jobs=1,
+                                                         eval_metric="logloss")),
+        },
+        "params": {
+            "RandomForest": {
+                "max_depth": [None, 16, 32],
+                "min_samples_leaf": [1, 2, 4],
+                "max_features": ["sqrt", 0.5],
+            },
+            "ExtraTrees": {
+                "max_depth": [None, 16],
+                "min_samples_leaf": [1, 2],
+            },
+            "XGBoost": {
+                "estimator__n_estimators": [100, 300],
+                "estimator__max_depth": [4, 6],
+                "estimator__learning_rate": [0.05, 0.1],
+            },
+        },
+    }
+
+
+@dataclass
+class ModelSearchResult:
+    best_model_name: str
+    best_params: Dict[str, Any]
+    best_score: float
+    best_estimator: Any
+    # One entry per evaluated configuration, best first
+    report: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def search_models(x_train: np.ndarray, y_train: np.ndarray, models: Dict[str, Any],
+                  params: Optional[Dict[str, Dict[str, List[Any]]]] = None, scoring: str = "f1",
+                  cv: int = 3, factor: int = 3, n_jobs: Optional[int] = -1,
+                  random_state: int = 42) -> ModelSearchResult:
+    """
+    Successive-halving search over several candidate models and their grids.
+
+    All configurations of all models form one HalvingGridSearchCV: every
+    configuration starts on a small share of the training rows and only the
+    best 1/`factor` of them move on to `factor` times more rows, so weak
+    configurations are dropped early and models are compared on equal
+    budgets. Each round's configurations and folds run on a process pool
+    (joblib's loky backend), which memory-maps the training arrays once for
+    all workers instead of pickling a copy per task.
+
+    :param x_train: training features
+    :param y_train: training labels
+    :param models: {name: unfitted estimator}
+    :param params: {name: parameter grid}, models without a grid are scored as they are
+    :param scoring: scikit-learn scorer name used for ranking
+    :param cv: number of stratified folds
+    :param factor: halving factor between rounds
+    :param n_jobs: worker processes, -1 uses every core
+    :param random_state: seed of the folds and of the row subsampling
+    :return: ModelSearchResult with the best model refitted on all rows
+    """
+    params = params or {}
+    names = {}
+    param_grid = []
+    for name, model in models.items():
+        candidate = clone(model)
+        names[id(candidate)] = name
+        grid = {f"model__{key}": values for key, values in (params.get(name) or {}).items()}
+        param_grid.append({"model": [candidate], **grid})
+
+    search = HalvingGridSearchCV(
+        Pipeline([("model", next(iter(models.values())))]),
+        param_grid=param_grid,
+        factor=factor,
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state),
+        scoring=scoring,
+        n_jobs=n_jobs,
+        random_state=random_state,
+        refit=True,
+        # A candidate that cannot fit is a bug in the search space, not a low score
+        error_score="raise"
+    )
+    search.fit(x_train, y_train)
+
+    results = search.cv_results_
+    report = []
+    for i, candidate_params in enumerate(results["params"]):
+        report.append({
+            "model": names[id(candidate_params["model"])],
+            "params": {key[len("model__"):]: value for key, value in candidate_params.items() if key != "model"},
+            "iteration": int(results["iter"][i]),
+            "n_resources": int(results["n_resources"][i]),
+            "mean_test_score": float(results["mean_test_score"][i]),
+            "std_test_score": float(results["std_test_score"][i]),
+        })
+    # Latest round first: scores are only comparable within a round
+    report.sort(key=lambda r: (-r["iteration"], -np.nan_to_num(r["mean_test_score"], nan=-np.inf)))
+    for rank, row in enumerate(report, start=1):
+        row["rank"] = rank
+
+    best_params = search.best_params_
+    return ModelSearchResult(
+        best_model_name=names[id(best_params["model"])],
+        best_params={key[len("model__"):]: value for key, value in best_params.items() if key != "model"},
+        best_score=float(search.best_score_),
+        best_estimator=search.best_estimator_.named_steps["model"],
+        report=report
+    )
@@ -0,0 +1,308 @@
+## NETWORKSECURITY/networksecurity/utils/ml_utils/tracking.py
+
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("networksecurity")
+
+# MLflow's log_batch limits per request
+_MAX_PARAMS_PER_BATCH = 100
+_MAX_METRICS_PER_BATCH = 1000
+
+_META_FILE = "meta.json"
+_EVENTS_FILE = "events.jsonl"
+_ARTIFACTS_DIR = "artifacts"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _read_meta(run_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(run_dir, _META_FILE)) as f:
+        return json.load(f)
+
+
+def _write_meta(run_dir: str, meta: Dict[str, Any]):
+    # Progress markers are replaced atomically so a crash never leaves half a file
+    tmp_path = os.path.join(run_dir, f"{_META_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(run_dir, _META_FILE))
+
+
+def _read_events(run_dir: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(os.path.join(run_dir, _EVENTS_FILE)):
+        return []
+    with open(os.path.join(run_dir, _EVENTS_FILE)) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ExperimentTracker:
+    """
+    MLflow logging that never waits on the tracking server.
+
+    Logging calls only put events on a bounded queue. A spooler thread
+    journals every run under `spool_dir` (params, metrics and copies of the
+    artifacts), and an uploader thread replays closed runs to the tracking
+    server and deletes them once uploaded. Upload progress is recorded in the
+    spool, so a run interrupted by an unreachable server or a restart resumes
+    where it stopped instead of being logged twice. Runs left in the spool by
+    earlier processes are replayed when a tracker starts.
+
+    One tracker process should own a spool directory at a time.
+    """
+
+    def __init__(self, tracking_uri: str, experiment_name: str, spool_dir: str,
+                 max_queue_size: int = 1000, retry_interval: float = 60.0):
+        """
+        :param tracking_uri: MLflow tracking server, e.g. https://... or file:///...
+        :param experiment_name: experiment the runs are created in
+        :param spool_dir: local directory holding runs until they are uploaded
+        :param max_queue_size: events held in memory before logging calls wait for the spooler
+        :param retry_interval: seconds between upload attempts while the server is unreachable
+        """
+        self.tracking_uri = tracking_uri
+        self.experiment_name = experiment_name
+        self.spool_dir = spool_dir
+        self.retry_interval = retry_interval
+        os.makedirs(spool_dir, exist_ok=True)
+
+        self._events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue_size)
+        self._upload_requested = threading.Event()
+        self._stopping = threading.Event()
+        # Upload requests issued, and the latest one covered by a finished upload pass
+        self._progress = threading.Condition()
+        self._requested = 0
+        self._completed = 0
+        self._run_dir: Optional[str] = None
+
+        self._spooler = threading.Thread(target=self._spool_events, name="tracker-spooler", daemon=True)
+        self._uploader = threading.Thread(target=self._upload_runs, name="tracker-uploader", daemon=True)
+        self._spooler.start()
+        self._uploader.start()
+        # Ship runs that earlier processes could not upload
+        self._request_upload()
+
+    # Logging API, called from the training thread
+
+    def start_run(self, run_name: Optional[str] = None) -> "ExperimentTracker":
+        """Open a new spooled run; usable as a context manager that ends it."""
+        run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._run_dir = os.path.join(self.spool_dir, run_id)
+        self._put({"type": "start", "run_name": run_name, "time": _now_ms()})
+        return self
+
+    def log_params(self, params: Dict[str, Any]):
+        self._put({"type": "params", "values": {key: str(value) for key, value in params.items()}})
+
+    def log_metrics(self, metrics: Dict[str, float], step: int = 0):
+        self._put({"type": "metrics", "values": {key: float(value) for key, value in metrics.items()},
+                   "step": step, "time": _now_ms()})
+
+    def log_artifact(self, local_path: str, artifact_path: Optional[str] = None):
+        """Log a file or directory; it is copied into the spool in the background."""
+        self._put({"type": "artifact", "source": os.path.abspath(local_path), "artifact_path": artifact_path})
+
+    def log_model(self, model_file_path: str, artifact_path: str = "model",
+                  registered_model_name: Optional[str] = None):
+        """
+        Log a scikit-learn model already saved by a trainer.
+
+        The saved file is loaded and converted to the MLflow model format in
+        the background, so the model is never fitted again just to be logged.
+        """
+        self._put({"type": "model", "source": os.path.abspath(model_file_path),
+                   "artifact_path": artifact_path, "registered_model_name": registered_model_name})
+
+    def end_run(self, status: str = "FINISHED"):
+        if self._run_dir is None:
+            return
+        self._put({"type": "end", "status": status, "time": _now_ms()})
+        self._run_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_run("FINISHED" if exc_type is None else "FAILED")
+
+    def close(self, timeout: Optional[float] = 30.0) -> bool:
+        """
+        Finish spooling and wait up to `timeout` seconds for the uploads.
+
+        Spooling is local and always completes. Runs that are not uploaded
+        within the timeout stay in the spool for the next tracker.
+
+        :return: True when nothing is left to upload
+        """
+        self.end_run()
+        self._events.put(None)
+        self._spooler.join()
+        request = self._request_upload()
+        with self._progress:
+            self._progress.wait_for(lambda: self._completed >= request, timeout)
+        self._stopping.set()
+        self._upload_requested.set()
+        return not self.pending_runs()
+
+    def pending_runs(self) -> List[str]:
+        """Spooled runs not uploaded yet."""
+        return sorted(name for name in os.listdir(self.spool_dir)
+                      if os.path.isfile(os.path.join(self.spool_dir, name, _META_FILE)))
+
+    def _request_upload(self) -> int:
+        with self._progress:
+            self._requested += 1
+            request = self._requested
+        self._upload_requested.set()
+        return request
+
+    def _put(self, event: Dict[str, Any]):
+        if self._run_dir is None:
+            raise RuntimeError("No active run, call start_run() first")
+        event["run_dir"] = self._run_dir
+        # Waits only while the spooler writes to local disk, never on the network
+        self._events.put(event)
+
+    # Spooler thread
+
+    def _spool_events(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            try:
+                self._spool(event)
+            except Exception as e:
+                logger.warning(f"Could not spool tracking event {event['type']}: {e}")
+
+    def _spool(self, event: Dict[str, Any]):
+        run_dir = event.pop("run_dir")
+        if event["type"] == "start":
+            os.makedirs(os.path.join(run_dir, _ARTIFACTS_DIR), exist_ok=True)
+            _write_meta(run_dir, {
+                "experiment_name": self.experiment_name,
+                "run_name": event["run_name"],
+                "start_time": event["time"],
+                "closed": False,
+                "run_id": None,
+                "batch_logged": False,
+                "uploaded": []
+            })
+        elif event["type"] in ("artifact", "model"):
+            name = f"{len(os.listdir(os.path.join(run_dir, _ARTIFACTS_DIR))):03d}"
+            local_path = os.path.join(run_dir, _ARTIFACTS_DIR, name)
+            if event["type"] == "model":
+                import mlflow.sklearn
+                from networksecurity.utils.main_utils import load_object
+
+                mlflow.sklearn.save_model(load_object(event["source"]), local_path,
+                                          serialization_format=mlflow.sklearn.SERIALIZATION_FORMAT_CLOUDPICKLE)
+            elif os.path.isdir(event["source"]):
+                shutil.copytree(event["source"], os.path.join(local_path, os.path.basename(event["source"])))
+            else:
+                os.makedirs(local_path)
+                shutil.copy2(event["source"], local_path)
+            event["local_path"] = name
+        elif event["type"] == "end":
+            meta = _read_meta(run_dir)
+            meta.update(closed=True, status=event["status"], end_time=event["time"])
+            _write_meta(run_dir, meta)
+            self._request_upload()
+            return
+
+        with open(os.path.join(run_dir, _EVENTS_FILE), "a") as f:
+            f.write(json.dumps(event) + "\n")
+
+    # Uploader thread
+
+    def _upload_runs(self):
+        while not self._stopping.is_set():
+            self._upload_requested.wait(self.retry_interval)
+            self._upload_requested.clear()
+            if self._stopping.is_set():
+                return
+            with self._progress:
+                covered = self._requested
+            for name in self.pending_runs():
+                run_dir = os.path.join(self.spool_dir, name)
+                try:
+                    if _read_meta(run_dir)["closed"]:
+                        self._upload(run_dir)
+                except Exception as e:
+                    logger.warning(f"Tracking server unreachable, {name} stays spooled: {e}")
+                    break
+            with self._progress:
+                self._completed = covered
+                self._progress.notify_all()
+
+    def _client(self):
+        from mlflow.tracking import MlflowClient
+
+        return MlflowClient(tracking_uri=self.tracking_uri)
+
+    def _upload(self, run_dir: str):
+        from mlflow.entities import Metric, Param
+
+        client = self._client()
+        meta = _read_meta(run_dir)
+        events = _read_events(run_dir)
+
+        if meta["run_id"] is None:
+            experiment = client.get_experiment_by_name(meta["experiment_name"])
+            experiment_id = (experiment.experiment_id if experiment is not None
+                             else client.create_experiment(meta["experiment_name"]))
+            run = client.create_run(experiment_id, start_time=meta["start_time"], run_name=meta["run_name"])
+            meta["run_id"] = run.info.run_id
+            _write_meta(run_dir, meta)
+        run_id = meta["run_id"]
+
+        if not meta["batch_logged"]:
+            params = {}
+            metrics = []
+            for event in events:
+                if event["type"] == "params":
+                    params.update(event["values"])
+                elif event["type"] == "metrics":
+                    metrics += [Metric(key, value, event["time"], event["step"])
+                                for key, value in event["values"].items()]
+            params = [Param(key, value) for key, value in params.items()]
+            for i in range(0, len(params), _MAX_PARAMS_PER_BATCH):
+                client.log_batch(run_id, params=params[i:i + _MAX_PARAMS_PER_BATCH])
+            for i in range(0, len(metrics), _MAX_METRICS_PER_BATCH):
+                client.log_batch(run_id, metrics=metrics[i:i + _MAX_METRICS_PER_BATCH])
+            meta["batch_logged"] = True
+            _write_meta(run_dir, meta)
+
+        for event in events:
+            if event["type"] not in ("artifact", "model") or event["local_path"] in meta["uploaded"]:
+                continue
+            client.log_artifacts(run_id, os.path.join(run_dir, _ARTIFACTS_DIR, event["local_path"]),
+                                 event["artifact_path"])
+            if event["type"] == "model" and event["registered_model_name"]:
+                self._register(client, event["registered_model_name"], run_id, event["artifact_path"])
+            meta["uploaded"].append(event["local_path"])
+            _write_meta(run_dir, meta)
+
+        client.set_terminated(run_id, meta["status"], meta["end_time"])
+        shutil.rmtree(run_dir)
+        logger.info(f"Uploaded tracking run {run_id} to {self.tracking_uri}")
+
+    @staticmethod
+    def _register(client, name: str, run_id: str, artifact_path: str):
+        from mlflow.exceptions import MlflowException
+
+        try:
+            client.create_registered_model(name)
+        except MlflowException:
+            pass  # already registered
+        source = f"{client.get_run(run_id).info.artifact_uri}/{artifact_path}"
+        client.create_model_version(name, source, run_id=run_id)
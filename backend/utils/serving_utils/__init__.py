@@ -0,0 +1,51 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/__init__.py
+
+from .batcher import MicroBatcher
+from .cache import PredictionCache, normalize_text
+from .model_manager import ModelManager, LoadedModel, warm_up_features
+from .executor import InferenceExecutor
+from .model_info import ModelInfoCache, fetch_registry_model_info, read_local_model_info
+from .codecs import (
+    PayloadError,
+    parse_media_type,
+    decompress_body,
+    decode_features,
+    as_feature_matrix,
+    negotiate_response_type,
+    encode_predictions,
+    compress_body
+)
+from .inference import predict_with_model, build_prediction_response, configure_n_jobs, model_version
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry, ServingMetrics, MetricsMiddleware
+from .profiling import ProfilingMiddleware, request_profile
+
+__all__ = [
+    "MicroBatcher",
+    "PredictionCache",
+    "normalize_text",
+    "ModelManager",
+    "LoadedModel",
+    "warm_up_features",
+    "InferenceExecutor",
+    "ModelInfoCache",
+    "fetch_registry_model_info",
+    "read_local_model_info",
+    "predict_with_model",
+    "build_prediction_response",
+    "configure_n_jobs",
+    "model_version",
+    "PayloadError",
+    "parse_media_type",
+    "decompress_body",
+    "decode_features",
+    "as_feature_matrix",
+    "negotiate_response_type",
+    "encode_predictions",
+    "compress_body",
+    "METRICS_CONTENT_TYPE",
+    "MetricsRegistry",
+    "ServingMetrics",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "request_profile"
+]
@@ -0,0 +1,205 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/batcher.py
+
+import asyncio
+import logging
+import time
+import numpy as np
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("networksecurity")
+
+
+class _PendingRequest:
+    __slots__ = ("features", "future")
+
+    def __init__(self, features: np.ndarray, future: asyncio.Future):
+        self.features = features
+        self.future = future
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent inference requests into one vectorized model call.
+
+    Requests are queued until either `max_batch_size` rows are pending or the
+    oldest request has waited `max_wait_us` microseconds. The queued feature
+    matrices are stacked, `predict_fn` runs once on the stacked rows, and each
+    caller receives the slice of every output array that belongs to it.
+    At most `max_concurrency` batches are in flight; while they run, new
+    requests keep queueing and form the next, larger batch.
+    """
+
+    def __init__(self, predict_fn: Callable[[np.ndarray], Awaitable[Tuple[Optional[np.ndarray], ...]]],
+                 max_batch_size: int = 256, max_wait_us: int = 2000, max_concurrency: int = 1,
+                 on_batch: Optional[Callable[[int, float], None]] = None):
+        """
+        :param predict_fn: coroutine function mapping a 2-D feature array to a
+            tuple of arrays (or None entries) aligned on the first axis
+        :param max_batch_size: maximum number of rows per model call
+        :param max_wait_us: maximum time the first queued request waits for company
+        :param max_concurrency: maximum number of batches predicted at once
+        :param on_batch: called on the event loop with the rows and the seconds
+            of every successful model call, e.g. to record metrics
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0, int(max_wait_us)) / 1_000_000
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.on_batch = on_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting to be picked into a batch."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def batches_in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def start(self):
+        """Start the background batching task on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """
+        Stop the batching task. Requests already picked into a batch are still
+        predicted; requests still queued fail.
+        """
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        while not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if not pending.future.done():
+                pending.future.set_exception(RuntimeError("Batcher stopped"))
+
+    async def submit(self, features: np.ndarray) -> Tuple[Optional[np.ndarray], ...]:
+        """
+        Queue a feature matrix and wait for its share of the batched outputs.
+
+        :param features: 2-D array of shape (n_rows, n_features)
+        :return: tuple of per-request output arrays
+        """
+        if not self.running:
+            raise RuntimeError("Batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(np.asarray(features), future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._slots.acquire()
+            batch = []
+            try:
+                first = await self._queue.get()
+                batch.append(first)
+                n_rows = len(first.features)
+                deadline = loop.time() + self.max_wait
+
+                while n_rows < self.max_batch_size:
+                    if not self._queue.empty():
+                        pending = self._queue.get_nowait()
+                    else:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            pending = await asyncio.wait_for(self._queue.get(), timeout)
+                        except asyncio.TimeoutError:
+                            break
+                    batch.append(pending)
+                    n_rows += len(pending.features)
+            except asyncio.CancelledError:
+                # Requests already taken off the queue are still predicted; stop() waits for them
+                if batch:
+                    self._dispatch(batch)
+                raise
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[_PendingRequest]):
+        task = asyncio.get_running_loop().create_task(self._process(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: asyncio.Task):
+        self._in_flight.discard(task)
+        self._slots.release()
+
+    async def _process(self, batch: List[_PendingRequest]):
+        try:
+            await self._process_groups(batch)
+        finally:
+            # No caller may wait forever, whatever happened to the batch
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(RuntimeError("Batch was not predicted"))
+
+    async def _process_groups(self, batch: List[_PendingRequest]):
+        # Requests with different feature widths cannot be stacked together
+        groups = {}
+        for pending in batch:
+            if pending.future.done():
+                continue
+            key = pending.features.shape[1:] if pending.features.ndim == 2 else None
+            groups.setdefault(key, []).append(pending)
+
+        for key, group in groups.items():
+            if key is None or len(group) == 1:
+                await self._predict_each(group)
+                continue
+            try:
+                outputs = await self._predict(np.concatenate([p.features for p in group]))
+            except Exception as e:
+                # One malformed request must not fail the requests batched with it
+                logger.warning(f"Batched prediction failed, retrying {len(group)} requests individually: {e}")
+                await self._predict_each(group)
+                continue
+            self._scatter(group, outputs)
+
+    async def _predict(self, features: np.ndarray):
+        started = time.perf_counter()
+        outputs = await self.predict_fn(features)
+        if self.on_batch is not None:
+            self.on_batch(len(features), time.perf_counter() - started)
+        return outputs
+
+    async def _predict_each(self, group: List[_PendingRequest]):
+        for pending in group:
+            try:
+                outputs = await self._predict(pending.features)
+            except Exception as e:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+                continue
+            self._scatter([pending], outputs)
+
+    @staticmethod
+    def _scatter(group: List[_PendingRequest], outputs: Tuple[Any, ...]):
+        start = 0
+        for pending in group:
+            stop = start + len(pending.features)
+            if not pending.future.done():
+                pending.future.set_result(tuple(
+                    None if output is None else output[start:stop] for output in outputs
+                ))
+            start = stop
@@ -0,0 +1,111 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/cache.py
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Union
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a text for use as a cache key without changing its features.
+
+    Case is folded because keywords are matched on the lower-cased text; it is
+    kept when lower-casing changes the length (e.g. "İ"), since the length
+    feature is computed on the original text. Whitespace is left alone because
+    it feeds the length and word-count features. The prefix keeps folded and
+    unfolded keys apart.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return "l:" + lowered
+    return "r:" + text
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache with a per-entry TTL for prediction results.
+
+    Keys are digests of the model version plus the cached input, so results of
+    a previous model can never be served after a swap; `clear()` additionally
+    drops them eagerly. The cache is meant to be used from the event loop and
+    does no locking.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param max_entries: maximum number of cached results, 0 disables the cache
+        :param ttl_seconds: lifetime of an entry, 0 or less means no expiry
+        :param clock: monotonic time source, injectable for tests
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._clock = clock
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(model_version: str, data: Union[str, bytes]) -> bytes:
+        """Digest of the model version and a text or raw bytes input."""
+        if isinstance(data, str):
+            data = normalize_text(data).encode("utf-8", "surrogatepass")
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(model_version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(data)
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached value or None, counting a hit or a miss."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: bytes, value: Any):
+        """Store a value, evicting the least recently used entries beyond the bound."""
+        if not self.enabled:
+            return
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry, e.g. when the served model changes."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
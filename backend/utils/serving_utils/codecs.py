@@ -0,0 +1,269 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/codecs.py
+
+import gzip
+import io
+import json
+import zlib
+import numpy as np
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pa_ipc = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from .inference import build_prediction_response, normalize_labels
+
+JSON = "application/json"
+NPY = "application/x-npy"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_FILE = "application/vnd.apache.arrow.file"
+MSGPACK = "application/msgpack"
+
+_ALIASES = {
+    "application/npy": NPY,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+REQUEST_MEDIA_TYPES = (JSON, NPY, ARROW_STREAM, ARROW_FILE, MSGPACK)
+RESPONSE_MEDIA_TYPES = (JSON, NPY, ARROW_STREAM, MSGPACK)
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+
+class PayloadError(ValueError):
+    """Request body that cannot be decoded into a feature matrix."""
+    status_code = 400
+
+
+class UnsupportedMediaTypeError(PayloadError):
+    status_code = 415
+
+
+class PayloadTooLargeError(PayloadError):
+    status_code = 413
+
+
+def parse_media_type(header: Optional[str]) -> str:
+    """Return the bare, lower-cased media type of a Content-Type/Accept entry."""
+    if not header:
+        return JSON
+    media_type = header.split(";", 1)[0].strip().lower()
+    return _ALIASES.get(media_type, media_type)
+
+
+async def read_body(chunks: AsyncIterator[bytes], max_bytes: int, content_length: Optional[str] = None) -> bytes:
+    """
+    Read a request body, rejecting it before more than `max_bytes` are held in memory.
+
+    :param chunks: the body as it arrives, e.g. Starlette's request.stream()
+    :param max_bytes: upper bound for the body size
+    :param content_length: value of the Content-Length header, checked before reading
+    """
+    if content_length is not None:
+        try:
+            declared = int(content_length)
+        except ValueError:
+            raise PayloadError(f"Invalid Content-Length: {content_length}")
+        if declared > max_bytes:
+            raise PayloadTooLargeError(f"Request body exceeds {max_bytes} bytes")
+    body = bytearray()
+    async for chunk in chunks:
+        if len(body) + len(chunk) > max_bytes:
+            raise PayloadTooLargeError(f"Request body exceeds {max_bytes} bytes")
+        body += chunk
+    return bytes(body)
+
+
+def decompress_body(body: bytes, content_encoding: Optional[str], max_bytes: int) -> bytes:
+    """
+    Undo the request Content-Encoding without inflating more than `max_bytes`.
+
+    :param body: raw request body
+    :param content_encoding: value of the Content-Encoding header
+    :param max_bytes: upper bound for the decompressed size
+    """
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding == "identity":
+        data = body
+    elif encoding in ("gzip", "x-gzip"):
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            data = inflater.decompress(body, max_bytes + 1)
+        except zlib.error as e:
+            raise PayloadError(f"Invalid gzip body: {e}")
+    elif encoding == "zstd":
+        if zstandard is None:
+            raise UnsupportedMediaTypeError("zstd Content-Encoding requires the 'zstandard' package")
+        try:
+            with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body)) as reader:
+                data = reader.read(max_bytes + 1)
+        except zstandard.ZstdError as e:
+            raise PayloadError(f"Invalid zstd body: {e}")
+    else:
+        raise UnsupportedMediaTypeError(f"Unsupported Content-Encoding: {content_encoding}")
+
+    if len(data) > max_bytes:
+        raise PayloadTooLargeError(f"Decoded request body exceeds {max_bytes} bytes")
+    return data
+
+
+def as_feature_matrix(array: Any) -> np.ndarray:
+    """Convert decoded rows into a 2-D float64 feature matrix."""
+    try:
+        features = np.asarray(array, dtype=np.float64)
+    except (TypeError, ValueError) as e:
+        raise PayloadError(f"Features must be numeric: {e}")
+    if features.ndim != 2:
+        raise PayloadError(f"Features must be a 2-D array, got shape {features.shape}")
+    return features
+
+
+def decode_features(body: bytes, media_type: str) -> np.ndarray:
+    """
+    Decode a binary request body into a 2-D float64 feature matrix.
+
+    Supported media types are raw `.npy` (application/x-npy), Arrow IPC stream
+    or file (one column per feature) and msgpack (either a bare 2-D list or a
+    map with a "features" key, like the JSON schema).
+    """
+    if media_type == NPY:
+        try:
+            array = np.load(io.BytesIO(body), allow_pickle=False)
+        except (ValueError, OSError, EOFError) as e:
+            raise PayloadError(f"Invalid .npy body: {e}")
+        return as_feature_matrix(array)
+
+    if media_type in (ARROW_STREAM, ARROW_FILE):
+        if pa is None:
+            raise UnsupportedMediaTypeError("Arrow bodies require the 'pyarrow' package")
+        try:
+            reader = pa_ipc.open_stream(body) if media_type == ARROW_STREAM else pa_ipc.open_file(body)
+            table = reader.read_all()
+        except pa.ArrowInvalid as e:
+            raise PayloadError(f"Invalid Arrow body: {e}")
+        if table.num_columns == 0:
+            raise PayloadError("Arrow body has no columns")
+        return as_feature_matrix(np.column_stack([
+            column.to_numpy(zero_copy_only=False) for column in table.columns
+        ]))
+
+    if media_type == MSGPACK:
+        if msgpack is None:
+            raise UnsupportedMediaTypeError("msgpack bodies require the 'msgpack' package")
+        try:
+            payload = msgpack.unpackb(body, raw=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            raise PayloadError(f"Invalid msgpack body: {e}")
+        if isinstance(payload, dict):
+            if "features" not in payload:
+                raise PayloadError("msgpack map must contain a 'features' key")
+            payload = payload["features"]
+        return as_feature_matrix(payload)
+
+    raise UnsupportedMediaTypeError(
+        f"Unsupported Content-Type {media_type!r}, expected one of {', '.join(REQUEST_MEDIA_TYPES)}"
+    )
+
+
+def _accepted(header: Optional[str]) -> List[Tuple[float, int, str]]:
+    entries = []
+    for position, entry in enumerate((header or "").split(",")):
+        parts = [p.strip() for p in entry.split(";")]
+        if not parts[0]:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        entries.append((quality, position, _ALIASES.get(parts[0].lower(), parts[0].lower())))
+    # Highest quality first, header order breaks ties
+    entries.sort(key=lambda e: (-e[0], e[1]))
+    return entries
+
+
+def negotiate_response_type(accept: Optional[str]) -> str:
+    """Pick the response media type from the Accept header (JSON by default)."""
+    for quality, _, media_type in _accepted(accept):
+        if quality <= 0:
+            continue
+        if media_type in ("*/*", "application/*"):
+            return JSON
+        if media_type in RESPONSE_MEDIA_TYPES:
+            if media_type == ARROW_STREAM and pa is None:
+                continue
+            if media_type == MSGPACK and msgpack is None:
+                continue
+            return media_type
+    return JSON
+
+
+def encode_predictions(predictions: np.ndarray, probabilities: Optional[np.ndarray],
+                       media_type: str) -> bytes:
+    """
+    Serialize the prediction outputs in the negotiated media type.
+
+    JSON and msgpack carry the PredictionResponse payload. The `.npy` body is
+    a float64 matrix whose first column is the predicted label followed by one
+    column per class probability; Arrow carries the same data as columns named
+    "prediction", "prob_0", "prob_1", ...
+    """
+    if media_type == JSON:
+        payload = build_prediction_response(predictions, probabilities)
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+    if media_type == MSGPACK:
+        return msgpack.packb(build_prediction_response(predictions, probabilities), use_bin_type=True)
+
+    labels = normalize_labels(predictions)
+    if media_type == NPY:
+        columns = [labels.astype(np.float64)]
+        if probabilities is not None:
+            columns.append(np.asarray(probabilities, dtype=np.float64))
+        buffer = io.BytesIO()
+        np.save(buffer, np.column_stack(columns), allow_pickle=False)
+        return buffer.getvalue()
+
+    if media_type == ARROW_STREAM:
+        arrays = [pa.array(labels)]
+        names = ["prediction"]
+        if probabilities is not None:
+            for i in range(probabilities.shape[1]):
+                arrays.append(pa.array(np.ascontiguousarray(probabilities[:, i], dtype=np.float64)))
+                names.append(f"prob_{i}")
+        batch = pa.RecordBatch.from_arrays(arrays, names=names)
+        sink = pa.BufferOutputStream()
+        with pa_ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+    raise UnsupportedMediaTypeError(f"Cannot encode predictions as {media_type!r}")
+
+
+def compress_body(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compress a response body with zstd or gzip when the client accepts it."""
+    if len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    accepted = {media_type for quality, _, media_type in _accepted(accept_encoding) if quality > 0}
+    if "zstd" in accepted and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(body), "zstd"
+    if "gzip" in accepted:
+        return gzip.compress(body, compresslevel=5), "gzip"
+    return body, None
@@ -0,0 +1,118 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/executor.py
+
+import asyncio
+import logging
+import os
+import numpy as np
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .inference import configure_n_jobs
+
+logger = logging.getLogger("networksecurity")
+
+EXECUTOR_KINDS = ("thread", "process")
+
+# Model held by each inference worker process
+_worker_model = None
+
+
+def _init_worker(model_path: str, n_jobs: Optional[int], loader: Optional[Callable[[str], Any]]):
+    global _worker_model
+    if loader is None:
+        from ..main_utils import load_object as loader
+    _worker_model = configure_n_jobs(loader(model_path), n_jobs)
+
+
+def _predict_in_worker(predict_fn: Callable, features: np.ndarray):
+    return predict_fn(_worker_model, features)
+
+
+class InferenceExecutor:
+    """
+    Run model inference on a bounded worker pool instead of the event loop.
+
+    In "thread" mode the workers share the model loaded by the API process;
+    scikit-learn releases the GIL while walking the trees, so threads scale
+    well. In "process" mode every worker loads its own copy of the model from
+    `model_path` and only the feature matrix and outputs are pickled.
+    """
+
+    def __init__(self, predict_fn: Callable[[Any, np.ndarray], Any], kind: str = "thread",
+                 max_workers: Optional[int] = None, n_jobs: Optional[int] = None,
+                 loader: Optional[Callable[[str], Any]] = None):
+        """
+        :param predict_fn: module-level function (model, features) -> outputs
+        :param kind: "thread" or "process"
+        :param max_workers: worker count, defaults to min(4, cpu_count)
+        :param n_jobs: value for the model's own n_jobs, None keeps the saved value
+        :param loader: picklable function loading the model in process workers,
+            defaults to load_object
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind {kind!r}, expected one of {EXECUTOR_KINDS}")
+        self.predict_fn = predict_fn
+        self.kind = kind
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.n_jobs = n_jobs
+        self.loader = loader
+        self.model = None
+        self._pool: Optional[Executor] = None
+
+    async def swap(self, model: Any, model_path: Optional[str] = None,
+                   warm_up_features: Optional[np.ndarray] = None):
+        """
+        Make `model` the one used for inference.
+
+        The new model (and, in process mode, a new pool whose workers load it)
+        is warmed up before the switch; requests submitted earlier finish on
+        the previous model and pool.
+
+        :param model: fitted estimator already loaded in this process
+        :param model_path: file the model was loaded from, required in process mode
+        :param warm_up_features: rows to run through the new model before the switch
+        """
+        model = configure_n_jobs(model, self.n_jobs)
+        loop = asyncio.get_running_loop()
+
+        if self.kind == "thread":
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="inference")
+            if warm_up_features is not None:
+                await loop.run_in_executor(self._pool, self.predict_fn, model, warm_up_features)
+            self.model = model
+            return
+
+        if model_path is None:
+            raise ValueError("model_path is required for the process executor")
+        pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                   initargs=(model_path, self.n_jobs, self.loader))
+        try:
+            if warm_up_features is not None:
+                # One task per worker, so the workers are started and hold the model
+                await asyncio.gather(*(
+                    loop.run_in_executor(pool, _predict_in_worker, self.predict_fn, warm_up_features)
+                    for _ in range(self.max_workers)
+                ))
+        except Exception:
+            pool.shutdown(wait=False)
+            raise
+        old_pool, self._pool, self.model = self._pool, pool, model
+        if old_pool is not None:
+            # Requests already submitted keep running on the old workers
+            old_pool.shutdown(wait=False)
+
+    async def run(self, features: np.ndarray):
+        """Run `predict_fn` on the pool and await its result."""
+        if self._pool is None or self.model is None:
+            raise RuntimeError("No model loaded in the inference executor")
+        loop = asyncio.get_running_loop()
+        if self.kind == "thread":
+            return await loop.run_in_executor(self._pool, self.predict_fn, self.model, features)
+        return await loop.run_in_executor(self._pool, _predict_in_worker, self.predict_fn, features)
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
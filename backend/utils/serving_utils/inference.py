@@ -0,0 +1,71 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/inference.py
+
+import hashlib
+import os
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+
+def predict_with_model(model: Any, features: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Run a fitted classifier on a feature matrix in a single pass.
+
+    Labels are derived from predict_proba with an argmax over the classes,
+    which is exactly what a forest's own predict() does, so the trees are only
+    walked once.
+
+    :param model: fitted estimator
+    :param features: 2-D array of shape (n_rows, n_features)
+    :return: (predictions, probabilities); probabilities is None when the
+        model has no predict_proba
+    """
+    if hasattr(model, "predict_proba") and hasattr(model, "classes_"):
+        probabilities = model.predict_proba(features)
+        predictions = np.take(model.classes_, np.argmax(probabilities, axis=1))
+        return predictions, probabilities
+    return model.predict(features), None
+
+
+def normalize_labels(predictions: np.ndarray) -> np.ndarray:
+    """Return labels as integers when the model was fitted on float-encoded targets."""
+    predictions = np.asarray(predictions)
+    if predictions.dtype.kind == "f" and np.array_equal(predictions, np.round(predictions)):
+        # Targets are stored as floats in the transformed arrays
+        predictions = predictions.astype(np.int64)
+    return predictions
+
+
+def build_prediction_response(predictions: np.ndarray,
+                              probabilities: Optional[np.ndarray]) -> Dict[str, Any]:
+    """
+    Build the PredictionResponse payload from the model outputs.
+
+    :param predictions: 1-D array of class labels
+    :param probabilities: 2-D array of class probabilities or None
+    :return: dict with "predictions" and "prediction_probabilities"
+    """
+    predictions = normalize_labels(predictions)
+
+    prediction_probs = None
+    if probabilities is not None:
+        keys = [str(i) for i in range(probabilities.shape[1])]
+        prediction_probs = [dict(zip(keys, row)) for row in np.asarray(probabilities, dtype=np.float64).tolist()]
+
+    return {
+        "predictions": predictions.tolist(),
+        "prediction_probabilities": prediction_probs
+    }
+
+
+def configure_n_jobs(model: Any, n_jobs: Optional[int]) -> Any:
+    """Set the estimator's own inference parallelism when it supports one."""
+    if n_jobs is not None and hasattr(model, "n_jobs"):
+        model.n_jobs = n_jobs
+    return model
+
+
+def model_version(model_path: str) -> str:
+    """Identify a model artifact by its path, size and modification time."""
+    stat = os.stat(model_path)
+    fingerprint = f"{os.path.abspath(model_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:12]
@@ -0,0 +1,325 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/metrics.py
+
+import math
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Prometheus text exposition format, version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from sub-millisecond stages to slow bulk requests
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Rows per request or per model call
+ROW_BUCKETS = tuple(4 ** i for i in range(10))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        """Child metric for one combination of label values; keep it to skip the lookup on hot paths."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    @property
+    def family(self) -> str:
+        """Name of the HELP and TYPE lines, which must match the sample names."""
+        return self.name
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.family} {_escape(self.documentation)}", f"# TYPE {self.family} {self.kind}"]
+        lines += [f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples()]
+        return lines
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    """Counter whose samples, HELP and TYPE lines are all named `<name>_total`, like prometheus_client's."""
+    kind = "counter"
+
+    @property
+    def family(self) -> str:
+        return f"{self.name}_total"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for values, child in self._children.items():
+            yield f"{self.name}_total", _format_labels(self.labelnames, values), child.value
+
+
+class Gauge(_Metric):
+    """Gauge set by the application, or computed at scrape time by `set_function`."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], Dict[Tuple[str, ...], float]]):
+        """
+        Compute the gauge when it is scraped instead of on every change.
+
+        :param function: returns {label values: value}
+        """
+        self._function = function
+
+    def _samples(self):
+        values = self._function() if self._function is not None else {
+            labels: child.value for labels, child in self._children.items()
+        }
+        for labels, value in values.items():
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        # Per-bucket counts, made cumulative only when scraped
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.upper_bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _samples(self):
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, values, le), cumulative
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """
+    Minimal Prometheus registry rendering the text exposition format.
+
+    Metrics are updated without locks: in the API they are only touched from
+    the event loop thread, where updates cannot interleave. Each worker
+    process keeps its own registry.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if any(existing.name == metric.name for existing in self._metrics):
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+class StageTimer:
+    """
+    Lap timer splitting one request into consecutive stages.
+
+    `lap(stage)` records the time since the previous lap (or the timer's
+    creation) as the duration of `stage`. When the request is profiled the
+    laps are also recorded in its profile, whose first stage, "receive",
+    covers routing and body parsing up to the timer's creation.
+    """
+
+    __slots__ = ("_stages", "_endpoint", "_last", "_profile")
+
+    def __init__(self, stages: Histogram, endpoint: str, profile=None):
+        self._stages = stages
+        self._endpoint = endpoint
+        self._profile = profile
+        if profile is not None:
+            profile.lap("receive")
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self._stages.labels(self._endpoint, stage).observe(now - self._last)
+        self._last = now
+        if self._profile is not None:
+            self._profile.lap(stage)
+
+
+class ServingMetrics:
+    """Metrics of the prediction API, exposed on /metrics."""
+
+    def __init__(self, namespace: str = "networksecurity"):
+        self.registry = MetricsRegistry()
+        self.requests = self.registry.counter(
+            f"{namespace}_requests", "HTTP requests by route and status code", ("endpoint", "status"))
+        self.request_seconds = self.registry.histogram(
+            f"{namespace}_request_duration_seconds", "HTTP request latency by route", ("endpoint",))
+        self.stage_seconds = self.registry.histogram(
+            f"{namespace}_stage_duration_seconds",
+            "Time spent in each stage of a prediction request: parse, cache, featurize, inference, serialize",
+            ("endpoint", "stage"))
+        self.request_rows = self.registry.histogram(
+            f"{namespace}_request_rows", "Feature rows per prediction request", ("endpoint",), ROW_BUCKETS)
+        self.batch_rows = self.registry.histogram(
+            f"{namespace}_batch_rows", "Feature rows per micro-batched model call", buckets=ROW_BUCKETS)
+        self.model_seconds = self.registry.histogram(
+            f"{namespace}_model_call_duration_seconds",
+            "Duration of one micro-batched predict_proba call, predictions included")
+        self.in_flight = self.registry.gauge(
+            f"{namespace}_requests_in_flight", "HTTP requests being processed")
+        self.in_flight.set(0)
+        self.batcher_queued = self.registry.gauge(
+            f"{namespace}_batcher_queued_requests", "Prediction requests waiting for a micro-batch")
+        self.batches_in_flight = self.registry.gauge(
+            f"{namespace}_batches_in_flight", "Micro-batches being predicted")
+        self.model_info = self.registry.gauge(
+            f"{namespace}_model_info", "Served model, always 1", ("version", "path"))
+
+    def timer(self, endpoint: str, profile=None) -> StageTimer:
+        """
+        :param profile: Profile of the request when ProfilingMiddleware selected it
+        """
+        return StageTimer(self.stage_seconds, endpoint, profile)
+
+    def observe_batch(self, rows: int, seconds: float):
+        """MicroBatcher callback for every model call."""
+        self.batch_rows.labels().observe(rows)
+        self.model_seconds.labels().observe(seconds)
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting requests and their latency per route.
+
+    Routes are labelled with their path template, so label cardinality stays
+    bounded; requests matching no route are labelled "unmatched".
+    """
+
+    def __init__(self, app, metrics: ServingMetrics):
+        self.app = app
+        self.metrics = metrics
+        self._in_flight = metrics.in_flight.labels()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self._in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._in_flight.dec()
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or (scope["path"] if "endpoint" in scope else "unmatched")
+            self.metrics.requests.labels(endpoint, str(status)).inc()
+            self.metrics.request_seconds.labels(endpoint).observe(elapsed)
@@ -0,0 +1,147 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/model_info.py
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("networksecurity")
+
+
+def fetch_registry_model_info(tracking_uri: str, model_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up the latest registered version of a model in MLflow (blocking).
+
+    :param tracking_uri: MLflow tracking server
+    :param model_name: registered model name
+    :return: model info payload, or None when the model is not registered
+    """
+    from mlflow.tracking import MlflowClient
+
+    client = MlflowClient(tracking_uri=tracking_uri)
+    models = client.search_registered_models(filter_string=f"name='{model_name}'")
+    if not models or not models[0].latest_versions:
+        return None
+
+    latest_version = models[0].latest_versions[0]
+    metrics = {}
+    if latest_version.run_id:
+        metrics = client.get_run(latest_version.run_id).data.metrics
+    return {
+        "model_name": model_name,
+        "version": latest_version.version,
+        "status": latest_version.status,
+        "creation_timestamp": latest_version.creation_timestamp,
+        "last_updated_timestamp": latest_version.last_updated_timestamp,
+        # The training runs log F1, precision and recall on the test split, no accuracy
+        "metrics": {
+            "f1_score": metrics.get("test_f1", None),
+            "precision": metrics.get("test_precision", None),
+            "recall": metrics.get("test_recall", None)
+        }
+    }
+
+
+def read_local_model_info(metrics_path: str, model_name: str) -> Optional[Dict[str, Any]]:
+    """Model info built from the metrics file written by the training pipeline."""
+    try:
+        with open(metrics_path, "r") as f:
+            metrics = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Local metrics file error: {e}")
+        return None
+    return {
+        "model_name": f"{model_name} (Local)",
+        "version": "1.0.0",
+        "status": "READY",
+        "metrics": metrics
+    }
+
+
+class ModelInfoCache:
+    """
+    Model metadata kept in memory and refreshed off the request path.
+
+    `get()` only reads the cached payload. A refresh resolves the local
+    metrics (until the registry has answered once) and queries the registry
+    on a worker thread. Whenever that query completes, its answer replaces the
+    cached payload; failures keep whatever was cached. At most one query runs
+    at a time, and `refresh()` waits for it no longer than `timeout` seconds.
+    """
+
+    def __init__(self, fetch_remote: Callable[[], Optional[Dict[str, Any]]],
+                 fetch_local: Callable[[], Optional[Dict[str, Any]]],
+                 refresh_interval: float = 300.0, timeout: float = 5.0):
+        """
+        :param fetch_remote: blocking function returning the registry payload or None
+        :param fetch_local: fast function returning the local payload or None
+        :param refresh_interval: seconds between background refreshes, 0 disables them
+        :param timeout: maximum seconds `refresh()` waits for the registry
+        """
+        self.fetch_remote = fetch_remote
+        self.fetch_local = fetch_local
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.info: Dict[str, Any] = {"message": "No model information available from MLflow or local files"}
+        self.source: Optional[str] = None
+        self.updated_at: Optional[float] = None
+        self._remote: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self) -> Dict[str, Any]:
+        return self.info
+
+    def refresh_nowait(self) -> asyncio.Future:
+        """Update from the local metrics and start a registry query unless one is running."""
+        if self.source != "registry":
+            local = self.fetch_local()
+            if local is not None:
+                self.info, self.source = local, "local"
+                self.updated_at = time.time()
+
+        if self._remote is None or self._remote.done():
+            self._remote = asyncio.ensure_future(asyncio.to_thread(self.fetch_remote))
+            self._remote.add_done_callback(self._store_remote)
+        return self._remote
+
+    async def refresh(self):
+        """Refresh, waiting at most `timeout` seconds for the registry to answer."""
+        try:
+            # shield: on timeout the query keeps running and stores its answer later
+            await asyncio.wait_for(asyncio.shield(self.refresh_nowait()), self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"MLflow model info lookup timed out after {self.timeout}s")
+        except Exception:
+            pass  # logged by _store_remote
+
+    def _store_remote(self, future: asyncio.Future):
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.warning(f"MLflow connection error: {future.exception()}")
+            return
+        remote = future.result()
+        if remote is not None:
+            self.info, self.source = remote, "registry"
+            self.updated_at = time.time()
+
+    def start(self):
+        """Resolve the model info now and, with a refresh interval, periodically."""
+        self.refresh_nowait()
+        if self.refresh_interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
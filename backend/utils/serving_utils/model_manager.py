@@ -0,0 +1,110 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/model_manager.py
+
+import asyncio
+import logging
+import os
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from .inference import model_version, predict_with_model
+
+logger = logging.getLogger("networksecurity")
+
+
+@dataclass
+class LoadedModel:
+    model: Any
+    path: str
+    version: str
+    loaded_at: float
+
+
+def warm_up_features(model: Any, n_rows: int = 8) -> Optional[np.ndarray]:
+    """Feature rows used to exercise a freshly loaded model before it serves traffic."""
+    n_features = getattr(model, "n_features_in_", None)
+    if n_features is None:
+        return None
+    rng = np.random.default_rng(0)
+    return rng.random((n_rows, int(n_features)))
+
+
+class ModelManager:
+    """
+    Load, warm up and atomically swap the served model without a restart.
+
+    A reload loads the artifact on a worker thread, runs warm-up predictions on
+    it and only then hands it to `install`, which switches every reference the
+    API holds. Requests already in flight finish on the model they started
+    with. Reloads are serialized, and a model that fails to load or to predict
+    never replaces the current one.
+    """
+
+    def __init__(self, loader: Callable[[str], Any], resolve_path: Callable[[], str],
+                 install: Callable[[LoadedModel, Optional[np.ndarray]], Awaitable[None]],
+                 poll_interval: float = 0.0):
+        """
+        :param loader: function loading a model object from a path
+        :param resolve_path: function returning the path of the newest model artifact
+        :param install: coroutine making a loaded, warmed-up model the served one
+        :param poll_interval: seconds between checks for a new artifact, 0 disables watching
+        """
+        self.loader = loader
+        self.resolve_path = resolve_path
+        self.install = install
+        self.poll_interval = poll_interval
+        self.current: Optional[LoadedModel] = None
+        self._lock = asyncio.Lock()
+        self._watcher: Optional[asyncio.Task] = None
+
+    async def reload(self, path: Optional[str] = None, force: bool = False) -> bool:
+        """
+        Load the model at `path` (default: the newest artifact) and swap it in.
+
+        :param path: model file to load
+        :param force: reload even if the artifact is unchanged
+        :return: True when a new model was installed
+        """
+        async with self._lock:
+            path = path or self.resolve_path()
+            version = model_version(path)
+            if not force and self.current is not None and self.current.version == version:
+                return False
+
+            started = time.perf_counter()
+            model = await asyncio.to_thread(self.loader, path)
+            features = warm_up_features(model)
+            if features is not None:
+                # Fails the reload, rather than live traffic, if the model is broken
+                await asyncio.to_thread(predict_with_model, model, features)
+
+            loaded = LoadedModel(model=model, path=path, version=version, loaded_at=time.time())
+            await self.install(loaded, features)
+            self.current = loaded
+            logger.info(f"Model {version} loaded from {path} in {time.perf_counter() - started:.2f}s")
+            return True
+
+    def start_watching(self):
+        """Poll `resolve_path` in the background and reload when the artifact changes."""
+        if self.poll_interval > 0 and self._watcher is None:
+            self._watcher = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                path = self.resolve_path()
+                if os.path.exists(path):
+                    await self.reload(path)
+            except Exception as e:
+                logger.error(f"Model reload failed, keeping the current model: {e}")
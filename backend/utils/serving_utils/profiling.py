@@ -0,0 +1,117 @@
+## NETWORKSECURITY/networksecurity/utils/serving_utils/profiling.py
+
+import hmac
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from ..main_utils.profiling import Profile
+
+logger = logging.getLogger("networksecurity")
+
+PROFILE_HEADER = "x-profile"
+
+
+def request_profile(request) -> Optional[Profile]:
+    """Profile of a request selected by ProfilingMiddleware, None for all other requests."""
+    return request.scope.get("state", {}).get("profile")
+
+
+def server_timing(report: Dict[str, Any]) -> str:
+    """Server-Timing header value listing the wall time of every stage in milliseconds."""
+    return ", ".join(f"{stage['stage']};dur={stage['wall_ms']:.3f}" for stage in report["stages"])
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling the requests that ask for it with an X-Profile header.
+
+    Only add it on deployments where profiling is allowed. With a token the
+    header must carry it, otherwise "1" is enough. A profiled request gets
+    a Profile in `request.state.profile`, which the handler's StageTimer
+    laps; the response carries the stage wall times in a Server-Timing
+    header and the report id in X-Profile-Id, and the full report (stages
+    with CPU time and peak memory, plus sampled hot functions) is written
+    to `<report_dir>/<id>.json`.
+
+    Memory tracing and stack sampling are process-wide, so one request is
+    profiled at a time and concurrent requests show up in the samples.
+    """
+
+    def __init__(self, app, token: Optional[str] = None, report_dir: Optional[str] = "profiles",
+                 sample_interval: Optional[float] = 0.001):
+        self.app = app
+        self.token = token
+        self.report_dir = report_dir
+        self.sample_interval = sample_interval
+        self._active = False
+
+    def _requested(self, scope) -> bool:
+        for name, value in scope.get("headers", ()):
+            if name.decode("latin-1").lower() == PROFILE_HEADER:
+                value = value.decode("latin-1")
+                if self.token:
+                    return hmac.compare_digest(value, self.token)
+                return value.lower() in ("1", "true", "yes")
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if self._active:
+            logger.warning(f"Not profiling {scope['path']}: another request is being profiled")
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        profile = Profile(self.sample_interval)
+        scope.setdefault("state", {})["profile"] = profile
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                if profile.stages:
+                    headers.append((b"server-timing", server_timing({"stages": profile.stages}).encode("latin-1")))
+                headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        self._active = True
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            profile.lap("respond")
+            report = profile.stop()
+            self._active = False
+            route = scope.get("route")
+            report = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "endpoint": getattr(route, "path", None),
+                "status": status,
+                **report
+            }
+            self._save(report)
+
+    def _save(self, report: Dict[str, Any]):
+        total = report["total"]
+        logger.info(f"Profiled {report['method']} {report['path']} ({report['id']}): "
+                    f"{total['wall_ms']:.1f} ms wall, {total['cpu_ms']:.1f} ms CPU, "
+                    f"{total['peak_memory_kb']:.0f} KiB peak")
+        if not self.report_dir:
+            return
+        try:
+            os.makedirs(self.report_dir, exist_ok=True)
+            with open(os.path.join(self.report_dir, f"{report['id']}.json"), "w") as f:
+                json.dump(report, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not save profile {report['id']}: {e}")
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from networksecurity.utils.main_utils import load_numpy_array_data, save_numpy_array_data
+
+
+class TestArrayStore:
+    def test_npy_arrays_are_memory_mapped(self, tmp_path):
+        """Test that .npy arrays are stored raw and loaded as read-only memory maps"""
+        array = np.arange(60, dtype=np.float64).reshape(10, 6)
+        path = str(tmp_path / "train.npy")
+
+        save_numpy_array_data(path, array)
+        loaded = load_numpy_array_data(path, mmap_mode="r")
+
+        assert isinstance(loaded, np.memmap)
+        assert not loaded.flags.writeable
+        np.testing.assert_array_equal(loaded[:, :-1], array[:, :-1])
+        np.testing.assert_array_equal(loaded[:, -1], array[:, -1])
+
+    def test_npy_without_mmap_is_read_into_memory(self, tmp_path):
+        """Test that .npy arrays load as plain arrays without mmap_mode"""
+        path = str(tmp_path / "train.npy")
+        save_numpy_array_data(path, np.ones((3, 2)))
+
+        loaded = load_numpy_array_data(path)
+
+        assert type(loaded) is np.ndarray
+
+    def test_npz_arrays_still_load(self, tmp_path):
+        """Test that compressed .npz arrays keep working, with mmap_mode ignored"""
+        array = np.random.default_rng(0).random((5, 4))
+        path = str(tmp_path / "train.npz")
+
+        save_numpy_array_data(path, array)
+
+        np.testing.assert_array_equal(load_numpy_array_data(path, mmap_mode="r"), array)
+
+    def test_object_arrays_are_refused_in_npy(self, tmp_path):
+        """Test that raw .npy files never contain pickled objects"""
+        with pytest.raises(ValueError):
+            save_numpy_array_data(str(tmp_path / "train.npy"), np.array([{"a": 1}], dtype=object))
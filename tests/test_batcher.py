@@ -0,0 +1,93 @@
+import asyncio
+import numpy as np
+from networksecurity.utils.serving_utils import MicroBatcher
+
+
+def run_concurrently(batcher, requests):
+    async def main():
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                *(batcher.submit(r) for r in requests), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(main())
+
+
+class TestMicroBatcher:
+    def test_concurrent_requests_share_one_model_call(self):
+        """Test that queued requests are stacked and each caller gets its own rows"""
+        calls = []
+
+        async def predict_fn(x):
+            calls.append(len(x))
+            return x.sum(axis=1), None
+
+        requests = [np.full((i + 1, 3), float(i)) for i in range(5)]
+        results = run_concurrently(MicroBatcher(predict_fn, max_batch_size=64, max_wait_us=50_000), requests)
+
+        assert calls == [15]
+        for i, (sums, probs) in enumerate(results):
+            assert probs is None
+            assert np.array_equal(sums, np.full(i + 1, 3.0 * i))
+
+    def test_failing_request_does_not_fail_its_batch(self):
+        """Test that a bad request is isolated from the requests batched with it"""
+        async def predict_fn(x):
+            if np.isnan(x).any():
+                raise ValueError("Input contains NaN")
+            return (x[:, 0],)
+
+        requests = [np.ones((1, 2)), np.full((1, 2), np.nan), np.zeros((1, 2))]
+        results = run_concurrently(MicroBatcher(predict_fn, max_wait_us=50_000), requests)
+
+        assert np.array_equal(results[0][0], [1.0])
+        assert isinstance(results[1], ValueError)
+        assert np.array_equal(results[2][0], [0.0])
+
+    def test_stop_answers_every_pending_request(self):
+        """Test that stopping mid-batch predicts the collected requests and fails the queued ones"""
+        release = None
+
+        async def predict_fn(x):
+            await release.wait()
+            return (x[:, 0],)
+
+        async def main():
+            nonlocal release
+            release = asyncio.Event()
+            batcher = MicroBatcher(predict_fn, max_batch_size=64, max_wait_us=10_000_000, max_concurrency=1)
+            batcher.start()
+            # Taken off the queue; the worker waits up to 10 s for company
+            collected = asyncio.ensure_future(batcher.submit(np.ones((1, 2))))
+            await asyncio.sleep(0.05)
+            stopping = asyncio.ensure_future(batcher.stop())
+            await asyncio.sleep(0.05)
+            release.set()
+            await asyncio.wait_for(stopping, timeout=5)
+            return await asyncio.wait_for(asyncio.gather(collected, return_exceptions=True), timeout=5)
+
+        (result,) = asyncio.run(main())
+        assert np.array_equal(result[0], [1.0])
+
+    def test_stop_fails_requests_left_in_the_queue(self):
+        """Test that requests queued behind a running batch fail instead of hanging"""
+        async def predict_fn(x):
+            await asyncio.sleep(0.1)
+            return (x[:, 0],)
+
+        async def main():
+            batcher = MicroBatcher(predict_fn, max_batch_size=1, max_wait_us=0, max_concurrency=1)
+            batcher.start()
+            first = asyncio.ensure_future(batcher.submit(np.ones((1, 2))))
+            await asyncio.sleep(0.02)
+            queued = asyncio.ensure_future(batcher.submit(np.zeros((1, 2))))
+            await asyncio.sleep(0.02)
+            await asyncio.wait_for(batcher.stop(), timeout=5)
+            return await asyncio.wait_for(asyncio.gather(first, queued, return_exceptions=True), timeout=5)
+
+        first, queued = asyncio.run(main())
+        assert np.array_equal(first[0], [1.0])
+        assert isinstance(queued, RuntimeError)
@@ -0,0 +1,63 @@
+import importlib.util
+import json
+import os
+
+BENCHMARKS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "backend", "benchmarks", "run_benchmarks.py")
+
+
+def load_suite():
+    spec = importlib.util.spec_from_file_location("run_benchmarks", BENCHMARKS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBenchmarkSuite:
+    def test_changes_are_relative_to_matching_baselines(self):
+        """Test that medians are compared only with baselines recorded at the same sizes"""
+        suite = load_suite()
+        params = {"rows": 100, "texts": 10, "batch_sizes": [1], "model_search": True}
+        baseline = {"params": params, "results": {"fast": {"median_ms": 10.0}, "slow": {"median_ms": 10.0}}}
+        results = {"fast": {"median_ms": 9.0}, "slow": {"median_ms": 15.0}, "new": {"median_ms": 1.0}}
+
+        changes = suite.compare(results, baseline, params)
+        assert round(changes["fast"], 6) == -0.1
+        assert round(changes["slow"], 6) == 0.5
+        assert changes["new"] is None
+        assert set(suite.compare(results, baseline, {**params, "rows": 200}).values()) == {None}
+
+    def test_suite_runs_and_fails_on_regression(self, tmp_path):
+        """Test that every benchmark runs on tiny data and a slower run than the baseline exits with 1"""
+        suite = load_suite()
+        baseline_path = str(tmp_path / "baselines.json")
+        sizes = ["--rows", "300", "--texts", "40", "--batch-sizes", "1", "--min-seconds", "0",
+                 "--no-model-search", "--baseline", baseline_path]
+
+        assert suite.main(sizes + ["--update-baseline"]) == 0
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        assert set(baseline["results"]) == {
+            "featurize_texts", "load_object", "predict[batch=1]", "predict_text",
+            "data_transformation", "detect_data_drift", "model_trainer"
+        }
+
+        assert suite.main(sizes + ["--only", "featurize", "--threshold", "1000"]) == 0
+        baseline["results"]["featurize_texts"]["median_ms"] = 1e-6
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f)
+        assert suite.main(sizes + ["--only", "featurize"]) == 1
+
+    def test_unselected_serving_setup_is_skipped(self, tmp_path, monkeypatch):
+        """Test that --only without serving benchmarks neither trains the served forest nor imports the app"""
+        suite = load_suite()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("served forest was trained")
+
+        monkeypatch.setattr(suite, "RandomForestClassifier", fail)
+        output = str(tmp_path / "results.json")
+        assert suite.main(["--rows", "300", "--min-seconds", "0", "--no-model-search", "--only", "drift",
+                           "--baseline", str(tmp_path / "baselines.json"), "--output", output]) == 0
+        with open(output) as f:
+            assert set(json.load(f)["results"]) == {"detect_data_drift"}
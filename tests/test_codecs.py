@@ -0,0 +1,53 @@
+import asyncio
+import gzip
+import io
+import numpy as np
+import pytest
+from networksecurity.utils.serving_utils import codecs
+
+
+class TestCodecs:
+    def test_npy_body_round_trip(self):
+        """Test that a gzip-compressed .npy body decodes to the original matrix"""
+        features = np.arange(12, dtype=np.float32).reshape(3, 4)
+        buffer = io.BytesIO()
+        np.save(buffer, features)
+
+        body = codecs.decompress_body(gzip.compress(buffer.getvalue()), "gzip", max_bytes=1 << 20)
+        decoded = codecs.decode_features(body, codecs.parse_media_type("application/x-npy"))
+
+        assert decoded.dtype == np.float64
+        assert np.array_equal(decoded, features)
+
+    def test_rejects_oversized_and_unknown_bodies(self):
+        """Test the limits applied before a body reaches the model"""
+        with pytest.raises(codecs.PayloadTooLargeError):
+            codecs.decompress_body(gzip.compress(b"0" * 4096), "gzip", max_bytes=1024)
+        with pytest.raises(codecs.UnsupportedMediaTypeError):
+            codecs.decode_features(b"1,2,3", "text/csv")
+
+    def test_body_is_rejected_while_streaming(self):
+        """Test that an oversized body fails on its Content-Length or as soon as the chunks pass the limit"""
+        received = []
+
+        async def chunks():
+            for _ in range(10):
+                received.append(1)
+                yield b"0" * 512
+
+        with pytest.raises(codecs.PayloadTooLargeError):
+            asyncio.run(codecs.read_body(chunks(), max_bytes=1024, content_length="5120"))
+        assert received == []
+        with pytest.raises(codecs.PayloadTooLargeError):
+            asyncio.run(codecs.read_body(chunks(), max_bytes=1024))
+        assert len(received) == 3
+        assert asyncio.run(codecs.read_body(chunks(), max_bytes=5120, content_length="5120")) == b"0" * 5120
+
+    def test_negotiate_and_encode_npy_response(self):
+        """Test Accept negotiation and the label-plus-probabilities .npy layout"""
+        media_type = codecs.negotiate_response_type("application/json;q=0.5, application/x-npy")
+        body = codecs.encode_predictions(np.array([1.0, 0.0]), np.array([[0.2, 0.8], [0.9, 0.1]]), media_type)
+
+        assert media_type == codecs.NPY
+        assert np.array_equal(np.load(io.BytesIO(body)), [[1.0, 0.2, 0.8], [0.0, 0.9, 0.1]])
+        assert codecs.negotiate_response_type(None) == codecs.JSON
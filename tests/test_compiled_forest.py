@@ -0,0 +1,137 @@
+import os
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.multiclass import OneVsRestClassifier
+from networksecurity.utils import main_utils
+from networksecurity.utils.main_utils import save_object
+from networksecurity.utils.ml_utils.model.compiled_forest import (
+    CompiledForest,
+    RoutedForest,
+    export_compiled_forest,
+    load_serving_model
+)
+
+
+@pytest.fixture(scope="module")
+def forest_and_data():
+    rng = np.random.default_rng(0)
+    x = rng.random((2000, 11))
+    y = (x[:, 0] + x[:, 3] * rng.random(2000) > 0.8).astype(float)
+    model = RandomForestClassifier(n_estimators=25, random_state=42).fit(x, y)
+    return model, rng.random((500, 11))
+
+
+class TestCompiledForest:
+    def test_probabilities_are_bit_identical(self, forest_and_data):
+        """Test that the compiled forest reproduces predict_proba exactly at every batch size"""
+        model, x = forest_and_data
+        compiled = CompiledForest.from_estimator(model)
+
+        for rows in (x[:1], x[:64], x):
+            assert np.array_equal(compiled.predict_proba(rows), model.predict_proba(rows))
+        assert np.array_equal(compiled.predict(x), model.predict(x))
+
+    def test_missing_values_and_multiclass(self):
+        """Test NaN routing and more than two classes"""
+        rng = np.random.default_rng(1)
+        x = rng.random((1500, 6))
+        x[rng.random(x.shape) < 0.1] = np.nan
+        y = rng.integers(0, 3, 1500)
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(x, y)
+
+        assert np.array_equal(CompiledForest.from_estimator(model).predict_proba(x), model.predict_proba(x))
+
+    def test_rejects_wrong_feature_count(self, forest_and_data):
+        """Test that inputs are validated like scikit-learn does"""
+        model, x = forest_and_data
+        with pytest.raises(ValueError):
+            CompiledForest.from_estimator(model).predict_proba(x[:, :5])
+
+    def test_export_and_load_for_serving(self, forest_and_data, tmp_path):
+        """Test that the exported arrays are served in place of the pickle"""
+        model, x = forest_and_data
+        model_path = os.path.join(tmp_path, "model.pkl")
+        save_object(model_path, model)
+        compiled_path = export_compiled_forest(model, model_path)
+
+        served = load_serving_model(model_path, mmap_mode="r", max_compiled_rows=None)
+
+        assert os.path.isdir(compiled_path)
+        assert isinstance(served, CompiledForest)
+        assert isinstance(served.threshold.base, np.memmap)
+        assert np.array_equal(served.predict_proba(x), model.predict_proba(x))
+        assert isinstance(load_serving_model(model_path, compiled=False), RandomForestClassifier)
+
+    def test_large_batches_are_routed_to_sklearn(self, forest_and_data, tmp_path, monkeypatch):
+        """Test that batches above max_compiled_rows skip the compiled forest with identical results"""
+        model, x = forest_and_data
+        model_path = os.path.join(tmp_path, "model.pkl")
+        save_object(model_path, model)
+        export_compiled_forest(model, model_path)
+
+        served = load_serving_model(model_path, max_compiled_rows=10)
+        assert isinstance(served, RoutedForest)
+        assert isinstance(served.compiled, CompiledForest)
+        assert np.array_equal(served.predict_proba(x[:10]), model.predict_proba(x[:10]))
+
+        def fail(rows):
+            raise AssertionError("large batch reached the compiled forest")
+
+        monkeypatch.setattr(served.compiled, "predict_proba", fail)
+        assert np.array_equal(served.predict_proba(x[:11]), model.predict_proba(x[:11]))
+        assert np.array_equal(served.predict(x), model.predict(x))
+        served.n_jobs = 1
+        assert served.estimator.n_jobs == 1
+
+    def test_default_serving_path_does_not_unpickle_a_fresh_export(self, forest_and_data, tmp_path, monkeypatch):
+        """Test that the sklearn pickle is only loaded on the first batch above max_compiled_rows"""
+        model, x = forest_and_data
+        model_path = os.path.join(tmp_path, "model.pkl")
+        save_object(model_path, model)
+        export_compiled_forest(model, model_path)
+        loads = []
+        load_object = main_utils.load_object
+
+        def counting_load_object(*args, **kwargs):
+            loads.append(args[0])
+            return load_object(*args, **kwargs)
+
+        monkeypatch.setattr(main_utils, "load_object", counting_load_object)
+        served = load_serving_model(model_path, mmap_mode="r")
+        served.n_jobs = 1
+        assert np.array_equal(served.predict_proba(x[:served.max_compiled_rows]),
+                              model.predict_proba(x[:served.max_compiled_rows]))
+        assert loads == []
+
+        big = np.tile(x, (2, 1))[:served.max_compiled_rows + 1]
+        assert np.array_equal(served.predict_proba(big), model.predict_proba(big))
+        assert np.array_equal(served.predict_proba(big), model.predict_proba(big))
+        assert loads == [model_path]
+        assert served.estimator.n_jobs == 1
+
+    def test_export_replaces_a_mapped_export(self, forest_and_data, tmp_path):
+        """Test that re-exporting leaves readers of the previous export intact"""
+        model, x = forest_and_data
+        model_path = os.path.join(tmp_path, "model.pkl")
+        save_object(model_path, model)
+        compiled_path = export_compiled_forest(model, model_path)
+        mapped = CompiledForest.load(compiled_path, mmap_mode="r")
+
+        export_compiled_forest(model, model_path)
+
+        assert sorted(os.listdir(tmp_path)) == ["model.compiled", "model.pkl"]
+        assert np.array_equal(mapped.predict_proba(x), model.predict_proba(x))
+
+    def test_other_estimators_are_served_unchanged(self, tmp_path):
+        """Test that non-forest models are neither exported nor compiled"""
+        model = LogisticRegression().fit([[0.0], [1.0]], [0, 1])
+        model_path = os.path.join(tmp_path, "model.pkl")
+        save_object(model_path, model)
+
+        assert export_compiled_forest(model, model_path) is None
+        assert isinstance(load_serving_model(model_path), LogisticRegression)
+
+        wrapped = OneVsRestClassifier(LogisticRegression()).fit([[0.0], [1.0]], [-1, 1])
+        assert export_compiled_forest(wrapped, model_path) is None
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from networksecurity.utils.ml_utils.feature.cti_corpus import (
+    has_entity_label,
+    iter_corpus_chunks,
+    sample_balanced_corpus
+)
+
+ENTITIES = pd.Series([
+    "[{'id': 1, 'label': 'malware', 'start_offset': 2, 'end_offset': 9}\n"
+    " {'id': 2, 'label': 'identity', 'start_offset': 12, 'end_offset': 20}]",
+    "[{'id': 3, 'label': 'attack-pattern', 'start_offset': 0, 'end_offset': 5}]",
+    "[]",
+    None,
+])
+
+
+class TestCtiCorpus:
+    def test_entity_label_without_eval(self):
+        """Test that newline-separated entity lists are matched, which eval() rejects"""
+        assert has_entity_label(ENTITIES, "malware").tolist() == [True, False, False, False]
+
+    def test_balanced_sample_is_bounded_and_chunk_independent(self, tmp_path):
+        """Test that each class is capped and the sample does not depend on the chunk size"""
+        rows = 500
+        labels = np.where(np.arange(rows) % 5 == 0, "malware", "location")
+        pd.DataFrame({
+            "id": np.arange(rows),
+            "text": [f"report {i}" for i in range(rows)],
+            "entities": [f"[{{'id': {i}, 'label': '{label}', 'start_offset': 0, 'end_offset': 6}}]"
+                         for i, label in enumerate(labels)]
+        }).to_csv(tmp_path / "part1.csv", index=False)
+
+        small = sample_balanced_corpus(iter_corpus_chunks(str(tmp_path / "*.csv"), chunksize=37), max_per_class=60)
+        large = sample_balanced_corpus(iter_corpus_chunks(str(tmp_path / "*.csv"), chunksize=10_000), max_per_class=60)
+
+        assert small.equals(large)
+        assert small["label"].value_counts().to_dict() == {0: 60, 1: 60}
+        malware_ids = small.loc[small["label"] == 1, "text"].str.split().str[1].astype(int)
+        assert (malware_ids % 5 == 0).all()
@@ -0,0 +1,143 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from networksecurity.entity.artifact_entity import DataTransformationArtifact, DataValidationArtifact
+from networksecurity.entity.config_entity import TrainingPipelineConfig
+from networksecurity.pipeline.training_pipeline import build_pipeline_dag, emit_stage_manifest, load_stage_manifest
+from networksecurity.utils.main_utils import DagExecutor, load_numpy_array_data
+
+
+class TestDagExecutor:
+    def test_tasks_receive_dependency_results(self):
+        """Test that every task runs after its dependencies and gets their results in order"""
+        results = (
+            DagExecutor(max_workers=4)
+            .add("a", lambda: 2)
+            .add("b", lambda: 3)
+            .add("product", lambda a, b: a * b, deps=["a", "b"])
+            .add("difference", lambda b, a: b - a, deps=["b", "a"])
+            .run()
+        )
+        assert results == {"a": 2, "b": 3, "product": 6, "difference": 1}
+
+    def test_independent_tasks_run_concurrently(self):
+        """Test that two independent tasks are in flight at the same time"""
+        barrier = threading.Barrier(2, timeout=10)
+        results = (
+            DagExecutor(max_workers=2)
+            .add("train", lambda: barrier.wait() >= 0)
+            .add("test", lambda: barrier.wait() >= 0)
+            .run()
+        )
+        assert results == {"train": True, "test": True}
+
+    def test_dependents_start_before_unrelated_tasks_finish(self):
+        """Test that a task starts as soon as its own dependencies are done, while a slow sibling still runs"""
+        released = threading.Event()
+
+        def after_fast(fast):
+            released.set()
+            return fast
+
+        results = (
+            DagExecutor(max_workers=3)
+            .add("fast", lambda: "fast")
+            .add("slow", lambda: released.wait(timeout=10))
+            .add("after_fast", after_fast, deps=["fast"])
+            .run()
+        )
+        # "slow" only returns True when "after_fast" ran while it was waiting
+        assert results == {"fast": "fast", "slow": True, "after_fast": "fast"}
+
+    def test_known_results_skip_their_dependencies(self):
+        """Test that given results are not recomputed and only the targets' missing dependencies run"""
+        calls = []
+
+        def task(name, value):
+            def run(*args):
+                calls.append(name)
+                return value
+            return run
+
+        dag = (
+            DagExecutor()
+            .add("ingestion", task("ingestion", "fresh"))
+            .add("validation", task("validation", "validated"), deps=["ingestion"])
+            .add("transformation", task("transformation", "transformed"), deps=["validation"])
+            .add("report", task("report", "unused"))
+        )
+        results = dag.run(["transformation"], results={"validation": "loaded"})
+
+        assert calls == ["transformation"]
+        assert results == {"validation": "loaded", "transformation": "transformed"}
+
+    def test_failure_is_raised_and_stops_dependents(self):
+        """Test that the first failing task's exception is raised and its dependents never run"""
+        ran = []
+
+        def fail():
+            raise ValueError("broken stage")
+
+        dag = DagExecutor().add("source", fail).add("sink", lambda source: ran.append(source), deps=["source"])
+        with pytest.raises(ValueError, match="broken stage"):
+            dag.run()
+        assert ran == []
+
+    def test_invalid_graphs_are_rejected(self):
+        """Test that unknown dependencies and cycles are reported before anything runs"""
+        with pytest.raises(ValueError, match="Unknown task"):
+            DagExecutor().add("a", lambda missing: None, deps=["missing"]).run()
+        with pytest.raises(ValueError, match="cycle"):
+            DagExecutor().add("a", lambda b: None, deps=["b"]).add("b", lambda a: None, deps=["a"]).run()
+
+
+class TestStageManifests:
+    def test_stage_runs_alone_on_upstream_manifest(self, tmp_path):
+        """Test that data_transformation runs from the data_validation manifest without rerunning ingestion"""
+        config = TrainingPipelineConfig()
+        config.artifact_dir = str(tmp_path / "run")
+        config.manifest_dir = str(tmp_path / "manifests")
+
+        rng = np.random.default_rng(0)
+        tables = {}
+        for split, rows in (("train", 40), ("test", 10)):
+            df = pd.DataFrame(rng.integers(-1, 2, size=(rows, 3)), columns=["SFH", "URL_Length", "Result"])
+            tables[split] = str(tmp_path / f"{split}.parquet")
+            df.to_parquet(tables[split], index=False)
+        emit_stage_manifest("data_validation", DataValidationArtifact(
+            validation_status=True,
+            valid_train_file_path=tables["train"],
+            valid_test_file_path=tables["test"],
+            invalid_train_file_path=str(tmp_path / "invalid_train.parquet"),
+            invalid_test_file_path=str(tmp_path / "invalid_test.parquet"),
+            drift_report_file_path=str(tmp_path / "report.yaml")
+        ), config)
+
+        upstream = load_stage_manifest("data_validation", config)
+        results = build_pipeline_dag(config).run(["data_transformation"], results={"data_validation": upstream})
+
+        assert set(results) == {"data_validation", "data_transformation"}
+        artifact = load_stage_manifest("data_transformation", config)
+        assert artifact == results["data_transformation"]
+        assert isinstance(artifact, DataTransformationArtifact)
+        assert load_numpy_array_data(artifact.transformed_train_file_path).shape == (40, 3)
+        assert load_numpy_array_data(artifact.transformed_test_file_path).shape == (10, 3)
+        assert os.path.exists(artifact.transformed_object_file_path)
+
+    def test_changed_outputs_invalidate_manifest(self, tmp_path):
+        """Test that a manifest whose files were rewritten is not loaded"""
+        config = TrainingPipelineConfig()
+        config.manifest_dir = str(tmp_path / "manifests")
+        train_path = tmp_path / "train.npy"
+        np.save(train_path, np.zeros((4, 3)))
+        emit_stage_manifest("data_transformation", DataTransformationArtifact(
+            transformed_object_file_path=str(tmp_path / "preprocessing.pkl"),
+            transformed_train_file_path=str(train_path),
+            transformed_test_file_path=str(tmp_path / "test.npy")
+        ), config)
+        assert load_stage_manifest("data_transformation", config) is not None
+
+        np.save(train_path, np.zeros((8, 3)))
+        assert load_stage_manifest("data_transformation", config) is None
@@ -0,0 +1,70 @@
+import os
+import mongomock
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+import yaml
+from unittest import mock
+from networksecurity.components import data_ingestion
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.entity.config_entity import DataIngestionConfig, TrainingPipelineConfig
+
+COLUMNS = {"URL_Length": "int64", "SFH": "int64", "Result": "int64"}
+
+
+@pytest.fixture
+def ingestion(tmp_path):
+    client = mongomock.MongoClient()
+    config = DataIngestionConfig(TrainingPipelineConfig())
+    config.feature_store_file_path = str(tmp_path / "feature_store" / "network_data.parquet")
+    config.training_file_path = str(tmp_path / "ingested" / "train.parquet")
+    config.test_file_path = str(tmp_path / "ingested" / "test.parquet")
+    config.schema_file_path = str(tmp_path / "schema.yaml")
+    config.batch_size = 40
+    with open(config.schema_file_path, "w") as f:
+        yaml.safe_dump({"columns": COLUMNS}, f, sort_keys=False)
+
+    with mock.patch.object(data_ingestion.pymongo, "MongoClient", return_value=client):
+        yield DataIngestion(config), client[config.database_name][config.collection_name]
+
+
+class TestDataIngestion:
+    def test_collection_is_streamed_into_row_groups(self, ingestion):
+        """Test that every cursor batch becomes one row group of the typed feature store"""
+        component, collection = ingestion
+        collection.insert_many([
+            {"URL_Length": i % 3, "SFH": "" if i % 10 == 0 else 1, "Result": i % 2, "unused": "x"}
+            for i in range(100)
+        ])
+
+        rows = component.export_collection_to_feature_store()
+
+        parquet_file = pq.ParquetFile(component.data_ingestion_config.feature_store_file_path)
+        assert rows == 100
+        assert parquet_file.num_row_groups == 3
+        assert parquet_file.schema_arrow.names == list(COLUMNS)
+        df = parquet_file.read().to_pandas()
+        assert df["SFH"].isna().sum() == 10
+        assert df["URL_Length"].dtype == "int64"
+
+    def test_split_covers_every_row_once(self, ingestion):
+        """Test that the streamed split has train_test_split sizes, no overlap and the schema types"""
+        component, collection = ingestion
+        collection.insert_many([{"URL_Length": i, "SFH": 1, "Result": i % 2} for i in range(101)])
+
+        artifact = component.initiate_data_ingestion()
+
+        train = pd.read_parquet(artifact.train_file_path)
+        test = pd.read_parquet(artifact.test_file_path)
+        assert os.path.exists(artifact.feature_store_file_path)
+        assert (len(train), len(test)) == (80, 21)
+        assert sorted(train["URL_Length"].tolist() + test["URL_Length"].tolist()) == list(range(101))
+        assert list(train.dtypes.astype(str)) == list(COLUMNS.values())
+
+    def test_empty_collection_writes_empty_store(self, ingestion):
+        """Test that an empty collection still yields a feature store with the schema columns"""
+        component, _ = ingestion
+
+        assert component.export_collection_to_feature_store() == 0
+        df = pd.read_parquet(component.data_ingestion_config.feature_store_file_path)
+        assert list(df.columns) == list(COLUMNS)
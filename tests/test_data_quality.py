@@ -0,0 +1,117 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from networksecurity.utils.main_utils import read_yaml_file
+from networksecurity.utils.main_utils.data_quality import DataQualityValidator, schema_rules, validate_table
+
+REPO_SCHEMA = os.path.join(os.path.dirname(__file__), "..", "backend", "data_schema", "schema.yaml")
+
+SCHEMA = {
+    "columns": {"URL_Length": "int64", "SFH": "int64", "protocol": "object", "Result": "int64"},
+    "quality": {
+        "max_null_ratio": {"SFH": 0.1},
+        "ranges": {"URL_Length": [-1, 1], "SFH": [-1, 1]},
+        "allowed_values": {"protocol": ["tcp", "udp"], "Result": [-1, 1]},
+    },
+}
+
+
+def make_frame(rows):
+    return pd.DataFrame({
+        "URL_Length": np.arange(rows) % 3 - 1,
+        "SFH": np.where(np.arange(rows) % 20 == 0, np.nan, 1.0),
+        "protocol": np.where(np.arange(rows) % 2 == 0, "tcp", "udp"),
+        "Result": np.where(np.arange(rows) % 2 == 0, -1, 1),
+    })
+
+
+class TestDataQuality:
+    @pytest.mark.parametrize("extension", [".parquet", ".feather", ".csv"])
+    def test_chunked_report_matches_single_pass(self, tmp_path, extension):
+        """Test that validating a file in small chunks gives the report of the whole table"""
+        df = make_frame(1000)
+        df.loc[[17, 503, 998], "URL_Length"] = 7
+        df.loc[640, "protocol"] = "icmp"
+        path = str(tmp_path / f"train{extension}")
+        if extension == ".feather":
+            df.to_feather(path)
+        else:
+            getattr(df, f"to_{extension[1:]}")(path, index=False)
+
+        whole = DataQualityValidator(SCHEMA)
+        whole.update(df)
+        report = validate_table(path, SCHEMA, chunk_size=128)
+
+        assert report == whole.report()
+        assert not report["valid"]
+        assert report["rows"] == 1000
+        url_length = report["columns"]["URL_Length"]
+        assert url_length["range_violations"] == 3
+        assert [f["row"] for f in url_length["failures"]] == [17, 503, 998]
+        assert report["columns"]["protocol"]["failures"] == [{"row": 640, "check": "allowed_values", "value": "icmp"}]
+
+    def test_nullable_integers_pass(self):
+        """Test that integer columns read back as floats because of nulls keep matching the schema"""
+        validator = DataQualityValidator(SCHEMA)
+        validator.update(make_frame(200))
+
+        report = validator.report()
+
+        assert report["valid"]
+        assert report["columns"]["SFH"]["observed_dtypes"] == ["float64"]
+        assert report["columns"]["SFH"]["null_ratio"] == pytest.approx(0.05)
+
+    def test_bad_values_are_sampled(self):
+        """Test that dtype and null-ratio failures are reported with a bounded sample of rows"""
+        df = make_frame(100)
+        df["URL_Length"] = df["URL_Length"].astype(object)
+        df.loc[[3, 4, 5], "URL_Length"] = "long"
+        df.loc[:30, "SFH"] = np.nan
+        validator = DataQualityValidator(SCHEMA, failure_samples=2)
+
+        validator.update(df)
+        report = validator.report()
+
+        assert not report["dtype_match"]
+        assert report["columns"]["URL_Length"]["failures"] == [
+            {"row": 3, "check": "dtype", "value": "long"}, {"row": 4, "check": "dtype", "value": "long"}
+        ]
+        assert not report["columns"]["SFH"]["valid"]
+
+    def test_missing_and_extra_columns(self):
+        """Test that column mismatches keep the layout of the former schema report"""
+        validator = DataQualityValidator(SCHEMA)
+        validator.update(make_frame(10).drop(columns=["SFH"]).assign(extra=1))
+
+        report = validator.report()
+
+        assert not report["columns_match"]
+        assert (report["missing_columns"], report["extra_columns"]) == (["SFH"], ["extra"])
+        assert "SFH" not in report["columns"]
+
+    def test_rules_for_unknown_columns_are_rejected(self):
+        """Test that quality rules naming columns outside the schema are rejected"""
+        with pytest.raises(ValueError):
+            schema_rules({"columns": {"a": "int64"}, "quality": {"ranges": {"b": [0, 1]}}})
+
+    def test_missing_target_fails_the_repository_schema(self):
+        """Test that a missing Result fails validation while a missing feature within the limit passes"""
+        schema = read_yaml_file(REPO_SCHEMA)
+        df = pd.DataFrame({name: np.where(np.arange(100) % 2 == 0, -1, 1) for name in schema["columns"]})
+        df["SFH"] = df["SFH"].astype(float)
+        df.loc[7, "SFH"] = np.nan
+
+        validator = DataQualityValidator(schema)
+        validator.update(df)
+        assert validator.report()["valid"]
+
+        df["Result"] = df["Result"].astype(float)
+        df.loc[42, "Result"] = np.nan
+        validator = DataQualityValidator(schema)
+        validator.update(df)
+        report = validator.report()
+
+        assert not report["valid"]
+        assert not report["columns"]["Result"]["valid"]
+        assert report["columns"]["SFH"]["valid"]
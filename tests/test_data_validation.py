@@ -0,0 +1,125 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from networksecurity.components.data_validation import DataValidation
+from networksecurity.entity.artifact_entity import DataIngestionArtifact
+from networksecurity.entity.config_entity import DataValidationConfig, TrainingPipelineConfig
+from networksecurity.utils.main_utils import feature_store
+from networksecurity.utils.main_utils.feature_store import sample_table
+
+COLUMNS = {"URL_Length": "int64", "SFH": "int64", "Result": "int64"}
+
+
+def make_validation(tmp_path, train_df, test_df, quality=None):
+    ingested = tmp_path / "ingested"
+    ingested.mkdir()
+    train_df.to_parquet(ingested / "train.parquet", index=False)
+    test_df.to_parquet(ingested / "test.parquet", index=False)
+    ingestion_artifact = DataIngestionArtifact(
+        feature_store_file_path=str(tmp_path / "feature_store.parquet"),
+        train_file_path=str(ingested / "train.parquet"),
+        test_file_path=str(ingested / "test.parquet")
+    )
+
+    schema_path = tmp_path / "schema.yaml"
+    schema_path.write_text(yaml.safe_dump({"columns": COLUMNS, "quality": quality or {}}, sort_keys=False))
+    config = DataValidationConfig(TrainingPipelineConfig())
+    config.schema_file_path = str(schema_path)
+    config.valid_train_file_path = str(tmp_path / "validated" / "train.parquet")
+    config.valid_test_file_path = str(tmp_path / "validated" / "test.parquet")
+    config.invalid_train_file_path = str(tmp_path / "invalid" / "train.parquet")
+    config.invalid_test_file_path = str(tmp_path / "invalid" / "test.parquet")
+    config.drift_report_file_path = str(tmp_path / "drift_report" / "report.yaml")
+    config.quality_report_file_path = str(tmp_path / "quality_report.yaml")
+    config.chunk_size = 7
+    return DataValidation(ingestion_artifact, config)
+
+
+def make_frame(rows, offset=0):
+    return pd.DataFrame({
+        "URL_Length": [(i + offset) % 3 for i in range(rows)],
+        "SFH": [1] * rows,
+        "Result": [i % 2 for i in range(rows)],
+    })
+
+
+class TestDataValidation:
+    def test_valid_datasets_are_passed_by_reference(self, tmp_path):
+        """Test that validated datasets point at the ingested files instead of copies"""
+        validation = make_validation(tmp_path, make_frame(80), make_frame(20, offset=1))
+
+        artifact = validation.initiate_data_validation()
+
+        assert artifact.validation_status
+        assert artifact.valid_train_file_path == validation.data_ingestion_artifact.train_file_path
+        assert artifact.valid_test_file_path == validation.data_ingestion_artifact.test_file_path
+        assert not os.path.exists(tmp_path / "validated")
+        assert os.path.exists(artifact.drift_report_file_path)
+
+    def test_invalid_datasets_are_kept(self, tmp_path):
+        """Test that a schema mismatch fails and keeps copies of the offending files"""
+        validation = make_validation(tmp_path, make_frame(10).drop(columns=["SFH"]), make_frame(5))
+
+        with pytest.raises(Exception):
+            validation.initiate_data_validation()
+
+        assert os.path.exists(validation.data_validation_config.invalid_train_file_path)
+        assert os.path.exists(validation.data_validation_config.invalid_test_file_path)
+
+    def test_quality_report_samples_failing_rows(self, tmp_path):
+        """Test that out-of-range values fail validation and the streamed report names their rows"""
+        train_df = make_frame(80)
+        train_df.loc[[9, 61], "URL_Length"] = 40
+        test_df = make_frame(20).astype({"SFH": float})
+        test_df.loc[3, "SFH"] = np.nan
+        validation = make_validation(tmp_path, train_df, test_df,
+                                     quality={"ranges": {"URL_Length": [0, 2]}, "max_null_ratio": 0.1})
+
+        with pytest.raises(Exception):
+            validation.initiate_data_validation()
+
+        with open(validation.data_validation_config.quality_report_file_path) as f:
+            report = yaml.safe_load(f)
+        assert not report["train"]["valid"]
+        assert [f["row"] for f in report["train"]["columns"]["URL_Length"]["failures"]] == [9, 61]
+        assert report["test"]["valid"]
+        assert report["test"]["columns"]["SFH"]["null_count"] == 1
+
+    def test_drift_runs_on_streamed_samples(self, tmp_path, monkeypatch):
+        """Test that drift detection gets at most drift_max_rows rows per table without reading a whole table"""
+        validation = make_validation(tmp_path, make_frame(80), make_frame(20, offset=1))
+        validation.data_validation_config.drift_max_rows = 30
+        sizes = {}
+
+        def fake_detect_drift(base_df, current_df, **kwargs):
+            sizes["train"], sizes["test"] = len(base_df), len(current_df)
+            return {}
+
+        def fail(*args, **kwargs):
+            raise AssertionError("a whole table was read")
+
+        monkeypatch.setattr("networksecurity.components.data_validation.detect_drift", fake_detect_drift)
+        monkeypatch.setattr(feature_store, "read_table", fail)
+        validation.initiate_data_validation()
+
+        assert sizes == {"train": 30, "test": 20}
+
+
+class TestSampleTable:
+    def test_sample_is_bounded_uniform_and_ordered(self, tmp_path):
+        """Test that streaming keeps max_rows distinct rows spread over the whole file, in file order"""
+        path = str(tmp_path / "table.parquet")
+        pd.DataFrame({"row": np.arange(10000)}).to_parquet(path, index=False)
+
+        sample = sample_table(path, max_rows=500, chunk_size=64)
+
+        rows = sample["row"].to_numpy()
+        assert len(rows) == 500
+        assert np.all(np.diff(rows) > 0)
+        # Every tenth of the file holds about a tenth of the sample
+        assert np.bincount(rows // 1000, minlength=10).min() > 25
+        assert sample.equals(sample_table(path, max_rows=500, chunk_size=64))
+        assert len(sample_table(path, max_rows=20000, chunk_size=64)) == 10000
+        assert len(sample_table(path, max_rows=None, chunk_size=64)) == 10000
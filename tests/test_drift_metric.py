@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import ks_2samp
+from networksecurity.utils.ml_utils.metric.drift_metric import detect_drift, ks_2samp_columns
+
+
+def make_tables(seed=0):
+    rng = np.random.default_rng(seed)
+    base = pd.DataFrame({
+        "continuous": rng.normal(size=3000),
+        "shifted": rng.normal(size=3000),
+        "float32": rng.normal(size=3000).astype(np.float32),
+        "int32": rng.integers(-1, 2, 3000).astype(np.int32),
+        "category": rng.choice(["tcp", "udp"], 3000),
+    })
+    current = pd.DataFrame({
+        "continuous": rng.normal(size=1000),
+        "shifted": rng.normal(loc=0.5, size=1000),
+        "float32": rng.normal(size=1000).astype(np.float32),
+        "int32": rng.integers(-1, 2, 1000).astype(np.int32),
+        "category": rng.choice(["tcp", "udp", "icmp"], 1000, p=[0.4, 0.3, 0.3]),
+    })
+    return base, current
+
+
+class TestDriftMetric:
+    def test_ks_matches_scipy(self):
+        """Test that the vectorized KS statistics and p-values match ks_2samp column by column"""
+        rng = np.random.default_rng(1)
+        base = rng.normal(size=(2000, 4))
+        current = rng.normal(loc=0.1, size=(700, 4))
+        base[::7, 1] = np.nan
+        current[:, 2] = np.round(current[:, 2])
+        base[:, 2] = np.round(base[:, 2])
+
+        statistics, p_values = ks_2samp_columns(base, current)
+
+        for j in range(4):
+            expected = ks_2samp(base[~np.isnan(base[:, j]), j], current[:, j], method="asymp")
+            assert np.isclose(statistics[j], expected.statistic)
+            assert np.isclose(p_values[j], expected.pvalue)
+
+    def test_integer_columns_match_sorted_path(self):
+        """Test that counting integer columns gives the same result as sorting them"""
+        base, current = make_tables()
+        base.loc[::5, "int32"] = np.nan
+
+        counted = detect_drift(base, current)["int32"]
+        sorted_ = detect_drift(base, current, max_integer_range=0)["int32"]
+
+        assert np.isclose(counted["statistic"], sorted_["statistic"])
+        assert np.isclose(counted["p_value"], sorted_["p_value"])
+        assert np.isclose(counted["psi"], sorted_["psi"])
+
+    def test_every_column_is_tested(self):
+        """Test that narrow numeric dtypes are no longer skipped and categories get a chi-square test"""
+        base, current = make_tables()
+
+        report = detect_drift(base, current)
+
+        assert list(report) == list(base.columns)
+        assert report["float32"]["test"] == "ks"
+        assert report["int32"]["test"] == "ks"
+        assert report["category"]["test"] == "chi2"
+        assert report["shifted"]["drift_detected"]
+        assert report["category"]["drift_detected"]
+        assert not report["continuous"]["drift_detected"]
+        assert report["shifted"]["psi"] > 0.1 > report["continuous"]["psi"]
+
+    def test_parallel_and_blocked_runs_agree(self):
+        """Test that thread parallelism and block size do not change the report"""
+        base, current = make_tables()
+
+        assert detect_drift(base, current, n_jobs=2, block_size=1) == detect_drift(base, current)
+
+    def test_sampling_bounds_rows(self):
+        """Test that max_rows compares samples and still finds strong drift"""
+        base, current = make_tables()
+
+        report = detect_drift(base, current, max_rows=500)
+
+        assert report["shifted"]["drift_detected"]
+        assert report["shifted"]["p_value"] > detect_drift(base, current)["shifted"]["p_value"]
@@ -0,0 +1,110 @@
+import os
+import mongomock
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+from unittest import mock
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+from networksecurity.components import data_ingestion
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.components.model_trainer import ModelTrainer
+from networksecurity.entity.artifact_entity import DataTransformationArtifact
+from networksecurity.entity.config_entity import DataIngestionConfig, ModelTrainerConfig, TrainingPipelineConfig
+from networksecurity.utils.main_utils import load_object, save_numpy_array_data, save_object
+from networksecurity.utils.ml_utils.model.incremental import extend_forest, publish_model, read_training_state
+
+
+def make_data(rows, seed):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(rows, 4))
+    y = np.where(x[:, 0] + x[:, 1] > 0, 1.0, -1.0)
+    return x, y
+
+
+class TestIncrementalTraining:
+    def test_extend_forest_adds_and_retires_trees(self):
+        """Test that new trees are appended to the fitted ones and the oldest are retired first"""
+        x, y = make_data(300, 0)
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(x, y)
+        kept = model.estimators_[4:]
+        x_new, y_new = make_data(100, 1)
+
+        extend_forest(model, x_new, y_new, n_new_estimators=4, max_estimators=10)
+
+        assert len(model.estimators_) == model.n_estimators == 10
+        assert model.estimators_[:6] == kept
+        assert not model.warm_start
+        assert (model.predict(x_new) == y_new).mean() > 0.9
+
+    def test_extension_needs_matching_forest(self):
+        """Test that models the new trees could not be averaged with are rejected"""
+        x, y = make_data(200, 0)
+        model = RandomForestClassifier(n_estimators=5, random_state=0).fit(x, y)
+
+        with pytest.raises(ValueError, match="classes"):
+            extend_forest(model, x[y > 0], y[y > 0], n_new_estimators=2)
+        with pytest.raises(ValueError, match="features"):
+            extend_forest(model, x[:, :3], y, n_new_estimators=2)
+        with pytest.raises(ValueError, match="XGBClassifier"):
+            extend_forest(XGBClassifier(n_estimators=2).fit(x, y > 0), x, y > 0, n_new_estimators=2)
+
+    def test_ingestion_reads_after_the_watermark(self, tmp_path):
+        """Test that incremental ingestion exports only documents newer than the published watermark"""
+        client = mongomock.MongoClient()
+        config = DataIngestionConfig(TrainingPipelineConfig())
+        config.feature_store_file_path = str(tmp_path / "feature_store" / "network_data.parquet")
+        config.training_file_path = str(tmp_path / "ingested" / "train.parquet")
+        config.test_file_path = str(tmp_path / "ingested" / "test.parquet")
+        config.schema_file_path = str(tmp_path / "schema.yaml")
+        config.training_state_file_path = str(tmp_path / "saved_models" / "training_state.yaml")
+        config.incremental = True
+        with open(config.schema_file_path, "w") as f:
+            yaml.safe_dump({"columns": {"URL_Length": "int64", "Result": "int64"}}, f)
+        collection = client[config.database_name][config.collection_name]
+        ids = collection.insert_many([{"URL_Length": i, "Result": i % 2} for i in range(30)]).inserted_ids
+        os.makedirs(tmp_path / "saved_models")
+        with open(config.training_state_file_path, "w") as f:
+            yaml.safe_dump({"watermark": str(ids[19])}, f)
+
+        with mock.patch.object(data_ingestion.pymongo, "MongoClient", return_value=client):
+            artifact = DataIngestion(config).initiate_data_ingestion()
+
+        exported = pd.read_parquet(artifact.feature_store_file_path)
+        assert sorted(exported["URL_Length"]) == list(range(20, 30))
+        assert artifact.watermark == str(ids[-1])
+
+    def test_trainer_extends_the_saved_model(self, tmp_path):
+        """Test that an incremental ModelTrainer run grows the saved forest on the new rows"""
+        x, y = make_data(400, 0)
+        save_object(str(tmp_path / "saved_models" / "model.pkl"),
+                    RandomForestClassifier(n_estimators=10, random_state=0).fit(x, y))
+        x_new, y_new = make_data(200, 1)
+        save_numpy_array_data(str(tmp_path / "train.npy"), np.c_[x_new[:150], y_new[:150]])
+        save_numpy_array_data(str(tmp_path / "test.npy"), np.c_[x_new[150:], y_new[150:]])
+        config = ModelTrainerConfig(TrainingPipelineConfig())
+        config.trained_model_file_path = str(tmp_path / "trained_model" / "model.pkl")
+        config.saved_model_file_path = str(tmp_path / "saved_models" / "model.pkl")
+        config.incremental = True
+        config.incremental_estimators = 5
+        config.max_estimators = 12
+        artifact = DataTransformationArtifact(str(tmp_path / "train.npy"), str(tmp_path / "test.npy"),
+                                              str(tmp_path / "preprocessor.pkl"))
+
+        ModelTrainer(config, artifact).initiate_model_trainer()
+
+        model = load_object(config.trained_model_file_path)
+        assert len(model.estimators_) == 12
+
+    def test_publish_keeps_the_last_watermark(self, tmp_path):
+        """Test that publishing a run without new documents keeps the previous watermark"""
+        (tmp_path / "model.pkl").write_bytes(b"model")
+        (tmp_path / "preprocessor.pkl").write_bytes(b"preprocessor")
+        saved = str(tmp_path / "saved_models")
+
+        publish_model(str(tmp_path / "model.pkl"), str(tmp_path / "preprocessor.pkl"), saved, watermark="abc")
+        publish_model(str(tmp_path / "model.pkl"), str(tmp_path / "preprocessor.pkl"), saved, watermark=None)
+
+        assert read_training_state(os.path.join(saved, "training_state.yaml"))["watermark"] == "abc"
+        assert sorted(os.listdir(saved)) == ["model.pkl", "preprocessor.pkl", "training_state.yaml"]
@@ -0,0 +1,26 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from networksecurity.utils.serving_utils import predict_with_model, build_prediction_response
+
+
+class TestInference:
+    def test_single_pass_matches_predict(self):
+        """Test that labels derived from predict_proba equal model.predict"""
+        rng = np.random.default_rng(0)
+        x = rng.random((300, 5))
+        y = (x[:, 0] > 0.5).astype(float)
+        model = RandomForestClassifier(n_estimators=10, random_state=42).fit(x, y)
+
+        predictions, probabilities = predict_with_model(model, x)
+
+        assert np.array_equal(predictions, model.predict(x))
+        assert np.array_equal(probabilities, model.predict_proba(x))
+
+    def test_build_prediction_response(self):
+        """Test the response payload built from the model outputs"""
+        response = build_prediction_response(np.array([0.0, 1.0]), np.array([[0.75, 0.25], [0.1, 0.9]]))
+
+        assert response == {
+            "predictions": [0, 1],
+            "prediction_probabilities": [{"0": 0.75, "1": 0.25}, {"0": 0.1, "1": 0.9}]
+        }
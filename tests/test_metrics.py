@@ -0,0 +1,106 @@
+import asyncio
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from networksecurity.utils.serving_utils import MetricsMiddleware, MetricsRegistry, MicroBatcher, ServingMetrics
+
+
+def sample(text, line_start):
+    """Value of the exposition line starting with `line_start`."""
+    for line in text.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_start} not found in\n{text}")
+
+
+class TestMetricsRegistry:
+    def test_exposition_format(self):
+        """Test that counters, gauges and histograms render in the Prometheus text format"""
+        registry = MetricsRegistry()
+        requests = registry.counter("app_requests", "Requests", ("endpoint",))
+        in_flight = registry.gauge("app_in_flight", "In flight")
+        latency = registry.histogram("app_latency_seconds", "Latency", ("endpoint",), buckets=(0.1, 1.0))
+
+        requests.labels('/say "hi"\n').inc()
+        requests.labels("/predict").inc(2)
+        in_flight.inc()
+        in_flight.inc()
+        in_flight.dec()
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.labels("/predict").observe(value)
+        text = registry.render()
+
+        assert "# HELP app_requests_total Requests" in text
+        assert "# TYPE app_requests_total counter" in text
+        assert "# TYPE app_latency_seconds histogram" in text
+        assert sample(text, 'app_requests_total{endpoint="/say \\"hi\\"\\n"}') == 1
+        assert sample(text, 'app_requests_total{endpoint="/predict"}') == 2
+        assert sample(text, "app_in_flight") == 1
+        # Buckets are cumulative and inclusive of their upper bound
+        assert sample(text, 'app_latency_seconds_bucket{endpoint="/predict",le="0.1"}') == 2
+        assert sample(text, 'app_latency_seconds_bucket{endpoint="/predict",le="1"}') == 3
+        assert sample(text, 'app_latency_seconds_bucket{endpoint="/predict",le="+Inf"}') == 4
+        assert sample(text, 'app_latency_seconds_count{endpoint="/predict"}') == 4
+        assert abs(sample(text, 'app_latency_seconds_sum{endpoint="/predict"}') - 3.65) < 1e-9
+
+    def test_gauge_function_is_read_at_scrape_time(self):
+        """Test that a function gauge reports the current value on every render"""
+        registry = MetricsRegistry()
+        queue = []
+        registry.gauge("app_queued", "Queued").set_function(lambda: {(): len(queue)})
+        assert sample(registry.render(), "app_queued") == 0
+        queue.extend([1, 2])
+        assert sample(registry.render(), "app_queued") == 2
+
+
+class TestServingMetrics:
+    def test_middleware_and_stages_by_route(self):
+        """Test that requests are counted per route template and stages per endpoint"""
+        metrics = ServingMetrics()
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            timer = metrics.timer("/items/{item_id}")
+            if item_id < 0:
+                raise HTTPException(status_code=400, detail="negative")
+            timer.lap("parse")
+            timer.lap("serialize")
+            return {"item": item_id}
+
+        with TestClient(app) as client:
+            for item_id in (1, 2, -1):
+                client.get(f"/items/{item_id}")
+            client.get("/missing")
+        text = metrics.render()
+
+        assert sample(text, 'networksecurity_requests_total{endpoint="/items/{item_id}",status="200"}') == 2
+        assert sample(text, 'networksecurity_requests_total{endpoint="/items/{item_id}",status="400"}') == 1
+        assert sample(text, 'networksecurity_requests_total{endpoint="unmatched",status="404"}') == 1
+        assert sample(text, 'networksecurity_request_duration_seconds_count{endpoint="/items/{item_id}"}') == 3
+        assert sample(text, 'networksecurity_stage_duration_seconds_count'
+                            '{endpoint="/items/{item_id}",stage="parse"}') == 2
+        assert sample(text, "networksecurity_requests_in_flight") == 0
+
+    def test_batcher_reports_every_model_call(self):
+        """Test that the micro-batcher reports the rows of each model call"""
+        metrics = ServingMetrics()
+
+        async def predict_fn(x):
+            return x.sum(axis=1), None
+
+        batcher = MicroBatcher(predict_fn, max_batch_size=64, max_wait_us=50_000, on_batch=metrics.observe_batch)
+
+        async def main():
+            batcher.start()
+            try:
+                await asyncio.gather(*(batcher.submit(np.ones((rows, 2))) for rows in (1, 2, 3)))
+            finally:
+                await batcher.stop()
+
+        asyncio.run(main())
+        text = metrics.render()
+        assert sample(text, "networksecurity_batch_rows_count") == 1
+        assert sample(text, "networksecurity_batch_rows_sum") == 6
+        assert sample(text, "networksecurity_model_call_duration_seconds_count") == 1
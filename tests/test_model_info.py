@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from networksecurity.utils.serving_utils import ModelInfoCache, fetch_registry_model_info
+
+LOCAL_INFO = {"model_name": "NetworkSecurityModel (Local)", "metrics": {"test_f1": 0.5}}
+REGISTRY_INFO = {"model_name": "NetworkSecurityModel", "version": "3"}
+
+
+class TestModelInfoCache:
+    def test_slow_registry_does_not_block_refresh(self):
+        """Test that a refresh gives up on a slow registry and the answer is stored when it arrives"""
+        release = threading.Event()
+        calls = []
+
+        def fetch_remote():
+            calls.append(1)
+            release.wait(5)
+            return REGISTRY_INFO
+
+        async def main():
+            cache = ModelInfoCache(fetch_remote, lambda: LOCAL_INFO, refresh_interval=0, timeout=0.05)
+            await cache.refresh()
+            after_timeout = cache.get()
+            # The query still running is reused rather than started again
+            await cache.refresh()
+            release.set()
+            await asyncio.sleep(0.2)
+            return after_timeout, cache.get()
+
+        after_timeout, final = asyncio.run(main())
+
+        assert after_timeout == LOCAL_INFO
+        assert final == REGISTRY_INFO
+        assert len(calls) == 1
+
+    def test_registry_failure_keeps_cached_info(self):
+        """Test that a failing registry leaves the cached payload in place"""
+        def fetch_remote():
+            raise ConnectionError("registry unreachable")
+
+        async def main():
+            cache = ModelInfoCache(fetch_remote, lambda: LOCAL_INFO, refresh_interval=0, timeout=1)
+            await cache.refresh()
+            return cache
+
+        cache = asyncio.run(main())
+
+        assert cache.get() == LOCAL_INFO
+        assert cache.source == "local"
+
+
+class TestRegistryModelInfo:
+    def test_reports_the_metrics_training_logs(self, monkeypatch):
+        """Test that the registry payload carries the test F1, precision and recall of the model's run"""
+        version = SimpleNamespace(version="3", status="READY", run_id="run", creation_timestamp=1,
+                                  last_updated_timestamp=2)
+        logged = {"test_f1": 0.9, "test_precision": 0.8, "test_recall": 0.95, "train_f1": 1.0}
+
+        class FakeClient:
+            def __init__(self, tracking_uri):
+                pass
+
+            def search_registered_models(self, filter_string):
+                return [SimpleNamespace(latest_versions=[version])]
+
+            def get_run(self, run_id):
+                return SimpleNamespace(data=SimpleNamespace(metrics=logged))
+
+        monkeypatch.setattr("mlflow.tracking.MlflowClient", FakeClient)
+        info = fetch_registry_model_info("http://mlflow", "NetworkSecurityModel")
+
+        assert info["version"] == "3"
+        assert info["metrics"] == {"f1_score": 0.9, "precision": 0.8, "recall": 0.95}
+
@@ -0,0 +1,41 @@
+import asyncio
+import numpy as np
+from sklearn.dummy import DummyClassifier
+from networksecurity.utils.serving_utils import ModelManager
+
+
+class BrokenModel(DummyClassifier):
+    def predict_proba(self, x):
+        raise ValueError("corrupt artifact")
+
+
+def fitted(model_class):
+    return model_class(strategy="most_frequent").fit(np.zeros((4, 3)), [0, 1, 1, 1])
+
+
+class TestModelManager:
+    def test_reload_swaps_only_healthy_models(self, tmp_path):
+        """Test that a warm-up failure keeps the model that is currently served"""
+        good_path, bad_path = tmp_path / "good.pkl", tmp_path / "bad.pkl"
+        good_path.write_bytes(b"good")
+        bad_path.write_bytes(b"bad")
+        models = {str(good_path): fitted(DummyClassifier), str(bad_path): fitted(BrokenModel)}
+        installed = []
+
+        async def install(loaded, warm_up_features):
+            installed.append(loaded.model)
+
+        manager = ModelManager(loader=models.__getitem__, resolve_path=lambda: str(good_path), install=install)
+
+        async def scenario():
+            assert await manager.reload()
+            assert not await manager.reload()  # unchanged artifact
+            try:
+                await manager.reload(str(bad_path))
+            except ValueError:
+                pass
+
+        asyncio.run(scenario())
+
+        assert installed == [models[str(good_path)]]
+        assert manager.current.path == str(good_path)
@@ -0,0 +1,60 @@
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from networksecurity.utils.main_utils import evaluate_models
+from networksecurity.utils.ml_utils.model.model_selection import default_search_space, search_models
+
+
+def make_data(rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.random((rows, 6))
+    y = (x[:, 0] + 0.3 * x[:, 1] > 0.7).astype(float)
+    return x, y
+
+
+class TestModelSelection:
+    def test_search_ranks_all_configurations(self):
+        """Test that every configuration is reported and the best one is refitted"""
+        x, y = make_data()
+        models = {
+            "RandomForest": RandomForestClassifier(n_estimators=10, random_state=0),
+            "LogisticRegression": LogisticRegression(),
+        }
+        params = {"RandomForest": {"max_depth": [1, 8]}, "LogisticRegression": {"C": [0.01, 1.0]}}
+
+        result = search_models(x, y, models, params, cv=3, n_jobs=1)
+
+        assert len(result.report) >= 4
+        assert [row["rank"] for row in result.report] == list(range(1, len(result.report) + 1))
+        assert result.report[0]["model"] == result.best_model_name
+        assert result.report[0]["params"] == result.best_params
+        assert isinstance(result.best_estimator, type(models[result.best_model_name]))
+        assert result.best_estimator.predict(x).shape == (len(x),)
+
+    def test_evaluate_models_uses_params(self):
+        """Test that evaluate_models searches the given grids and scores each model"""
+        x, y = make_data()
+        models = {"RandomForest": RandomForestClassifier(n_estimators=10, random_state=0)}
+        report = evaluate_models(x[:450], y[:450], x[450:], y[450:], models,
+                                 {"RandomForest": {"max_depth": [1, None]}}, n_jobs=1)
+
+        assert set(report) == {"RandomForest"}
+        assert report["RandomForest"] > 0.8
+
+    def test_default_search_space_fits_signed_labels(self):
+        """Test that every default candidate, XGBoost included, fits the dataset's {-1, 1} labels"""
+        x, y = make_data(rows=300)
+        y = np.where(y > 0, 1.0, -1.0)
+        space = default_search_space()
+
+        result = search_models(x, y, space["models"], space["params"], cv=3, n_jobs=1)
+
+        scores = [row["mean_test_score"] for row in result.report]
+        assert not np.isnan(scores).any()
+        assert {row["model"] for row in result.report} == {"RandomForest", "ExtraTrees", "XGBoost"}
+        assert set(result.best_estimator.predict(x)) <= {-1.0, 1.0}
+
+        xgboost = clone(space["models"]["XGBoost"]).fit(x, y)
+        assert list(xgboost.classes_) == [-1.0, 1.0]
+        assert set(xgboost.predict(x)) == {-1.0, 1.0}
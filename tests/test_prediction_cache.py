@@ -0,0 +1,35 @@
+from networksecurity.utils.serving_utils import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPredictionCache:
+    def test_lru_eviction_and_ttl(self):
+        """Test the size bound, expiry and the hit/miss/eviction counters"""
+        clock = FakeClock()
+        cache = PredictionCache(max_entries=2, ttl_seconds=10, clock=clock)
+        cache.put(b"a", 1)
+        cache.put(b"b", 2)
+        assert cache.get(b"a") == 1
+        cache.put(b"c", 3)  # evicts b, the least recently used
+
+        assert cache.get(b"b") is None
+        clock.now = 11
+        assert cache.get(b"a") is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (1, 2, 1, 1)
+
+    def test_keys_depend_on_model_version_and_normalized_text(self):
+        """Test that keys fold case but never collide across model versions"""
+        key = PredictionCache.make_key
+
+        assert key("v1", "New RANSOMWARE sample") == key("v1", "new ransomware sample")
+        assert key("v1", "new ransomware sample") != key("v1", "new  ransomware sample")
+        assert key("v1", "new ransomware sample") != key("v2", "new ransomware sample")
@@ -0,0 +1,119 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from networksecurity.entity.artifact_entity import DataValidationArtifact
+from networksecurity.entity.config_entity import TrainingPipelineConfig
+from networksecurity.pipeline.training_pipeline import build_pipeline_dag
+from networksecurity.utils.main_utils import Profile, read_yaml_file
+from networksecurity.utils.serving_utils import ProfilingMiddleware, ServingMetrics, request_profile
+
+
+def spin(seconds):
+    """Busy loop the sampler should catch."""
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+class TestProfile:
+    def test_stages_report_time_memory_and_hot_functions(self):
+        """Test that each lap records its own wall time, CPU time and peak memory, and sampling finds the hot loop"""
+        profile = Profile(sample_interval=0.001).start()
+        spin(0.05)
+        profile.lap("compute")
+        block = bytearray(8 * 1024 * 1024)
+        del block
+        profile.lap("allocate")
+        report = profile.stop()
+
+        compute, allocate = report["stages"]
+        assert [compute["stage"], allocate["stage"]] == ["compute", "allocate"]
+        assert compute["wall_ms"] >= 50
+        assert compute["cpu_ms"] > 0
+        # The freed block still counts towards the peak of the stage that allocated it
+        assert allocate["peak_memory_kb"] >= 8 * 1024
+        assert compute["peak_memory_kb"] < 8 * 1024
+        assert report["total"]["wall_ms"] >= compute["wall_ms"] + allocate["wall_ms"]
+        assert report["samples"] > 0
+        assert any(entry["function"].startswith("spin ") for entry in report["top_functions"])
+
+
+class TestProfilingMiddleware:
+    def make_client(self, report_dir, token=None):
+        metrics = ServingMetrics()
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware, token=token, report_dir=report_dir)
+
+        @app.get("/work")
+        async def work(request: Request):
+            timer = metrics.timer("/work", request_profile(request))
+            timer.lap("parse")
+            spin(0.01)
+            timer.lap("inference")
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_only_requests_with_the_header_are_profiled(self, tmp_path):
+        """Test that a profiled request gets Server-Timing for its stages and a saved report"""
+        with self.make_client(str(tmp_path)) as client:
+            plain = client.get("/work")
+            profiled = client.get("/work", headers={"X-Profile": "1"})
+
+        assert "server-timing" not in plain.headers
+        assert [part.split(";")[0] for part in profiled.headers["server-timing"].split(", ")] == [
+            "receive", "parse", "inference"]
+        with open(tmp_path / f"{profiled.headers['x-profile-id']}.json") as f:
+            report = json.load(f)
+        assert report["endpoint"] == "/work"
+        assert report["status"] == 200
+        assert [stage["stage"] for stage in report["stages"]] == ["receive", "parse", "inference", "respond"]
+        assert report["stages"][2]["wall_ms"] >= 10
+        assert os.listdir(tmp_path) == [f"{report['id']}.json"]
+
+    def test_token_is_required_when_set(self, tmp_path):
+        """Test that with a token the header must carry it"""
+        with self.make_client(str(tmp_path), token="secret") as client:
+            assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "1"}).headers
+            assert "x-profile-id" in client.get("/work", headers={"X-Profile": "secret"}).headers
+        assert len(os.listdir(tmp_path)) == 1
+
+
+class TestPipelineProfile:
+    def test_profiled_stages_are_saved_with_the_run(self, tmp_path):
+        """Test that a profiled pipeline run writes the report of every stage it ran into its artifact dir"""
+        config = TrainingPipelineConfig()
+        config.artifact_dir = str(tmp_path / "run")
+        config.manifest_dir = str(tmp_path / "manifests")
+        config.profile_report_file_path = os.path.join(config.artifact_dir, "profile_report.yaml")
+
+        rng = np.random.default_rng(0)
+        tables = {}
+        for split, rows in (("train", 40), ("test", 10)):
+            df = pd.DataFrame(rng.integers(-1, 2, size=(rows, 3)), columns=["SFH", "URL_Length", "Result"])
+            tables[split] = str(tmp_path / f"{split}.parquet")
+            df.to_parquet(tables[split], index=False)
+        validation = DataValidationArtifact(
+            validation_status=True,
+            valid_train_file_path=tables["train"],
+            valid_test_file_path=tables["test"],
+            invalid_train_file_path=str(tmp_path / "invalid_train.parquet"),
+            invalid_test_file_path=str(tmp_path / "invalid_test.parquet"),
+            drift_report_file_path=str(tmp_path / "report.yaml")
+        )
+
+        build_pipeline_dag(config, profile=True).run(["data_transformation"],
+                                                     results={"data_validation": validation})
+
+        report = read_yaml_file(config.profile_report_file_path)
+        assert set(report) == {"data_transformation"}
+        stage = report["data_transformation"]
+        assert stage["total"]["wall_ms"] > 0
+        assert stage["total"]["peak_memory_kb"] > 0
+        assert stage["stages"][0]["stage"] == "data_transformation"
@@ -0,0 +1,61 @@
+import mongomock
+import numpy as np
+import pandas as pd
+import pytest
+from unittest import mock
+from networksecurity import push_data
+from networksecurity.push_data import NetworkDataExtract, dataframe_to_records
+
+
+@pytest.fixture
+def extract():
+    client = mongomock.MongoClient()
+    with mock.patch.object(push_data.pymongo, "MongoClient", return_value=client):
+        yield NetworkDataExtract(), client
+
+
+def write_csv(path, rows):
+    df = pd.DataFrame({
+        "URL_Length": np.arange(rows) % 3,
+        "SFH": np.where(np.arange(rows) % 7 == 0, np.nan, 1.0),
+        "Result": np.arange(rows) % 2,
+    })
+    df.to_csv(path, index=False)
+    return df
+
+
+class TestPushData:
+    def test_records_use_native_values(self):
+        """Test that rows become plain Python documents with None for missing values"""
+        df = pd.DataFrame({"a": [1, 2], "b": [0.5, np.nan], "c": ["x", None]})
+
+        records = dataframe_to_records(df)
+
+        assert records == [{"a": 1, "b": 0.5, "c": "x"}, {"a": 2, "b": None, "c": None}]
+        assert type(records[0]["a"]) is int
+
+    def test_load_csv_inserts_every_row(self, extract, tmp_path):
+        """Test that chunked concurrent bulk writes insert every CSV row once"""
+        network_data_extract, client = extract
+        df = write_csv(tmp_path / "data.csv", 1050)
+
+        stats = network_data_extract.load_csv(str(tmp_path / "data.csv"), "AUSTINAI", "network_data",
+                                              chunksize=400, batch_size=100, workers=3)
+
+        collection = client["AUSTINAI"]["network_data"]
+        assert (stats.inserted, stats.failed) == (1050, 0)
+        assert collection.count_documents({}) == 1050
+        assert collection.count_documents({"SFH": None}) == int(df["SFH"].isna().sum())
+        assert stats.rows_per_second > 0
+
+    def test_failed_documents_are_counted(self, extract):
+        """Test that unordered writes insert the valid documents of a batch with duplicates"""
+        network_data_extract, client = extract
+        client["AUSTINAI"]["network_data"].insert_one({"_id": 2})
+
+        inserted = network_data_extract.insert_data_mongodb(
+            [{"_id": 1}, {"_id": 2}, {"_id": 3}], "AUSTINAI", "network_data"
+        )
+
+        assert inserted == 2
+        assert client["AUSTINAI"]["network_data"].count_documents({}) == 3
@@ -0,0 +1,102 @@
+import os
+from networksecurity.entity.artifact_entity import (
+    ClassificationMetricArtifact,
+    DataIngestionArtifact,
+    ModelTrainerArtifact
+)
+from networksecurity.utils.main_utils import StageCache
+
+
+class StageConfig:
+    def __init__(self, artifact_dir, split_ratio=0.2):
+        self.train_file_path = os.path.join(artifact_dir, "data_ingestion", "train.csv")
+        self.split_ratio = split_ratio
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+class CountingStage:
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return DataIngestionArtifact(
+            feature_store_file_path=os.path.join(self.output_dir, "never_written.csv"),
+            train_file_path=write(os.path.join(self.output_dir, "train.csv"), "a,b\n1,2\n"),
+            test_file_path=write(os.path.join(self.output_dir, "test.csv"), "a,b\n3,4\n")
+        )
+
+
+class TestStageCache:
+    def test_unchanged_stage_is_reused(self, tmp_path):
+        """Test that a second run with the same fingerprint returns the recorded artifact"""
+        cache = StageCache(str(tmp_path / "cache"))
+        source = write(str(tmp_path / "source.csv"), "a,b\n1,2\n3,4\n")
+        stage = CountingStage(str(tmp_path / "run1"))
+
+        key = cache.fingerprint(StageConfig(str(tmp_path / "run1")), inputs=[source], code=[CountingStage])
+        first = cache.run("data_ingestion", key, stage, DataIngestionArtifact)
+        second = cache.run("data_ingestion", key, stage, DataIngestionArtifact)
+
+        assert stage.calls == 1
+        assert second == first
+
+    def test_fingerprint_tracks_inputs_and_config(self, tmp_path):
+        """Test that input content and config values change the fingerprint, run directories do not"""
+        source = write(str(tmp_path / "source.csv"), "a,b\n1,2\n")
+        run1, run2 = str(tmp_path / "run1"), str(tmp_path / "run2")
+
+        base = StageCache.fingerprint(StageConfig(run1), inputs=[source], root=run1)
+        assert StageCache.fingerprint(StageConfig(run2), inputs=[source], root=run2) == base
+        assert StageCache.fingerprint(StageConfig(run1, split_ratio=0.3), inputs=[source], root=run1) != base
+
+        write(source, "a,b\n1,5\n")
+        assert StageCache.fingerprint(StageConfig(run1), inputs=[source], root=run1) != base
+
+    def test_missing_output_reruns_stage(self, tmp_path):
+        """Test that a recorded artifact whose files are gone is recomputed"""
+        cache = StageCache(str(tmp_path / "cache"))
+        stage = CountingStage(str(tmp_path / "run1"))
+
+        artifact = cache.run("data_ingestion", "abc", stage, DataIngestionArtifact)
+        os.remove(artifact.train_file_path)
+        cache.run("data_ingestion", "abc", stage, DataIngestionArtifact)
+
+        assert stage.calls == 2
+        assert os.path.exists(artifact.train_file_path)
+
+    def test_disabled_cache_always_runs(self, tmp_path):
+        """Test that a disabled cache reruns the stage and a None fingerprint skips the cache"""
+        stage = CountingStage(str(tmp_path / "run1"))
+        cache = StageCache(str(tmp_path / "cache"), enabled=False)
+        cache.run("data_ingestion", "abc", stage, DataIngestionArtifact)
+        cache.run("data_ingestion", "abc", stage, DataIngestionArtifact)
+
+        enabled = StageCache(str(tmp_path / "cache"))
+        enabled.run("data_ingestion", None, stage, DataIngestionArtifact)
+        enabled.run("data_ingestion", "abc", stage, DataIngestionArtifact)
+
+        assert stage.calls == 3
+
+    def test_nested_artifacts_round_trip(self, tmp_path):
+        """Test that nested metric artifacts are rebuilt from the manifest"""
+        cache = StageCache(str(tmp_path / "cache"))
+        model_path = write(str(tmp_path / "model.pkl"), "model")
+        artifact = ModelTrainerArtifact(
+            trained_model_file_path=model_path,
+            train_metric_artifact=ClassificationMetricArtifact(0.9, 0.8, 0.7),
+            test_metric_artifact=ClassificationMetricArtifact(0.85, 0.75, 0.65)
+        )
+        cache.save("model_trainer", "abc", artifact)
+
+        loaded = cache.load("model_trainer", "abc", ModelTrainerArtifact)
+
+        assert loaded == artifact
+        assert isinstance(loaded.test_metric_artifact, ClassificationMetricArtifact)
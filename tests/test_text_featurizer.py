@@ -0,0 +1,36 @@
+import numpy as np
+from networksecurity.utils.ml_utils.feature.text_featurizer import (
+    featurize_texts,
+    KEYWORD_WEIGHTS,
+    TEXT_FEATURE_NAMES,
+)
+
+
+def reference_features(text):
+    """Row-at-a-time reference implementation of the text features"""
+    text_lower = text.lower()
+    return [
+        min(len(text) / 5000.0, 1.0),
+        min(len(text.split()) / 500.0, 1.0),
+    ] + [weight if keyword in text_lower else 0.0 for keyword, weight in KEYWORD_WEIGHTS]
+
+
+class TestTextFeaturizer:
+    def test_matches_reference_features(self):
+        """Test that the batch featurizer reproduces the per-text features exactly"""
+        texts = [
+            "CTB-Locker is a RANSOMWARE Trojan used by crimeware groups",
+            "virusecurity malwarexploit threatrojan",
+            "A benign release note with no keywords",
+            "x " * 3000,
+            "",
+        ]
+        features = featurize_texts(texts)
+
+        assert features.shape == (len(texts), len(TEXT_FEATURE_NAMES))
+        assert np.array_equal(features, np.array([reference_features(t) for t in texts]))
+
+    def test_accepts_single_string_and_empty_batch(self):
+        """Test the degenerate inputs the API and training script can pass"""
+        assert featurize_texts("malware").shape == (1, len(TEXT_FEATURE_NAMES))
+        assert featurize_texts([]).shape == (0, len(TEXT_FEATURE_NAMES))
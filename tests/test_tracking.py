@@ -0,0 +1,82 @@
+import os
+import time
+import numpy as np
+import pytest
+from mlflow.tracking import MlflowClient
+from sklearn.ensemble import RandomForestClassifier
+from networksecurity.utils.main_utils import save_object
+from networksecurity.utils.ml_utils.tracking import ExperimentTracker
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # A local file store stands in for the remote tracking server
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    return f"file://{tmp_path / 'mlruns'}"
+
+
+def log_run(tracker, tmp_path):
+    model_path = str(tmp_path / "model.pkl")
+    save_object(model_path, RandomForestClassifier(n_estimators=2).fit(np.eye(4), [0, 1, 0, 1]))
+    (tmp_path / "notes.txt").write_text("features")
+    with tracker.start_run(run_name="train"):
+        tracker.log_params({"n_estimators": 2})
+        tracker.log_metrics({"test_f1": 0.9})
+        tracker.log_artifact(str(tmp_path / "notes.txt"))
+        tracker.log_model(model_path, registered_model_name="NetworkSecurityModel")
+
+
+def unreachable(self):
+    raise ConnectionError("tracking server down")
+
+
+class TestExperimentTracker:
+    def test_run_is_uploaded_and_unspooled(self, store, tmp_path):
+        """Test that params, metrics, artifacts and the saved model reach the server"""
+        tracker = ExperimentTracker(store, "experiment", str(tmp_path / "spool"))
+        log_run(tracker, tmp_path)
+
+        assert tracker.close(timeout=60)
+
+        client = MlflowClient(store)
+        (run,) = client.search_runs([client.get_experiment_by_name("experiment").experiment_id])
+        assert run.data.params == {"n_estimators": "2"}
+        assert run.data.metrics == {"test_f1": 0.9}
+        assert run.info.status == "FINISHED"
+        assert {a.path for a in client.list_artifacts(run.info.run_id)} == {"notes.txt", "model"}
+        assert client.get_registered_model("NetworkSecurityModel").latest_versions[0].run_id == run.info.run_id
+        assert tracker.pending_runs() == []
+
+    def test_slow_server_does_not_block_training(self, store, tmp_path, monkeypatch):
+        """Test that logging and a bounded close return while the server hangs"""
+        monkeypatch.setattr(ExperimentTracker, "_client", lambda self: time.sleep(60) or unreachable(self))
+        tracker = ExperimentTracker(store, "experiment", str(tmp_path / "spool"))
+
+        start = time.perf_counter()
+        log_run(tracker, tmp_path)
+        logged = time.perf_counter()
+        uploaded = tracker.close(timeout=0.5)
+
+        assert not uploaded
+        assert logged - start < 1
+        assert time.perf_counter() - start < 30
+        assert len(tracker.pending_runs()) == 1
+
+    def test_spooled_run_is_replayed_once(self, store, tmp_path, monkeypatch):
+        """Test that a run whose upload failed halfway is finished by the next tracker without duplicates"""
+        spool_dir = str(tmp_path / "spool")
+        monkeypatch.setattr(MlflowClient, "log_artifacts", lambda *args, **kwargs: unreachable(None))
+        tracker = ExperimentTracker(store, "experiment", spool_dir)
+        log_run(tracker, tmp_path)
+        assert not tracker.close(timeout=60)
+        monkeypatch.undo()
+        monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+
+        replaying = ExperimentTracker(store, "experiment", spool_dir)
+
+        assert replaying.close(timeout=60)
+        client = MlflowClient(store)
+        (run,) = client.search_runs([client.get_experiment_by_name("experiment").experiment_id])
+        assert len(client.get_metric_history(run.info.run_id, "test_f1")) == 1
+        assert {a.path for a in client.list_artifacts(run.info.run_id)} == {"notes.txt", "model"}
+        assert os.listdir(spool_dir) == []